@@ -0,0 +1,247 @@
+"""
+Генератор синтетического корпуса заявок для бенчмарков:
+DOCX нового (3 таблицы) и старого (одна таблица) образца,
+PDF с таблицей, PDF с текстовой формой и PDF старого образца
+с нумерованными пунктами.
+"""
+import os
+import random
+from typing import Dict, List, Tuple
+
+from docx import Document
+
+# Поля заявки нового образца: (поле, подпись в форме)
+NEW_LAYOUT_ROWS = [
+    [
+        ("Event name", "Название мероприятия"),
+        ("Department", "Организатор (подразделение)"),
+        ("Date of event", "Даты проведения мероприятия"),
+        ("Date of installation", "Даты монтажа и подготовки площадки"),
+        ("Order", "Приказ об организации мероприятия"),
+        ("Participants", "Количество участников и контингент"),
+        ("Responsible", "Ответственный за проведение"),
+    ],
+    [
+        ("Event format", "Формат мероприятия"),
+        ("Guests of honor", "Почетные гости, ведущие мероприятия"),
+        ("Event level", "Уровень мероприятия"),
+        ("Schedule", "Расписание (разбивка по времени)"),
+    ],
+    [
+        ("Necessary technical equipment", "Необходимое техническое оснащение"),
+        (
+            "Training on working with audio equipment",
+            "Обучение работе на звуковом оборудовании",
+        ),
+    ],
+]
+
+# Строки таблицы старого образца: (поле, подпись)
+OLD_LAYOUT_ROWS = [
+    ("Department", "Подразделение"),
+    ("Date of event", "Дата и время бронирования"),
+    ("Event format", "Формат проведения мероприятия"),
+    ("Participants", "Контингент (кол-во, состав)"),
+    ("Event name", "Повестка/программа"),
+    ("Sound", "Звуковая аппаратура"),
+    ("Seating", "Требования к посадке участников"),
+    ("Training", "Обучение работе с техникой"),
+    ("Screens", "Телевизоры/проектор"),
+    ("Responsible", "Ответственный организатор (ФИО)"),
+    ("Phone", "Номер телефона"),
+    ("Additional", "Дополнительные требования"),
+]
+
+# Пункты PDF старого образца: (номер, поле, подпись)
+OLD_PDF_ROWS = [
+    ("1", "Responsible", "Заявитель (ФИО)"),
+    ("2", "Date of event", "Дата и время бронирования"),
+    ("3", "Event format", "Формат проведения мероприятия"),
+    ("4", "Participants", "Контингент (кол-во, состав)"),
+    ("5", "Event name", "Повестка/программа"),
+    ("6.1", "Screens", "Телевизоры/проектор"),
+    ("6.2", "Sound", "Звуковая аппаратура"),
+    ("6.3", "Training", "Обучение работе с техникой"),
+    ("8", "Seating", "Требования к посадке участников"),
+    ("9.1", "Responsible", "Ответственный организатор (ФИО)"),
+    ("9.2", "Phone", "Номер телефона"),
+    ("9.3", "Additional", "Дополнительные требования"),
+]
+
+WORDS = (
+    "форум молодежный проект встреча лекция семинар студенческий совет "
+    "хакатон конференция турнир игра клуб кафедра институт научный "
+    "презентация мастер-класс круглый стол выставка"
+).split()
+
+
+def random_value(rng: random.Random, field: str) -> str:
+    """Случайное значение поля заявки"""
+    if field.startswith("Date"):
+        day = rng.randint(1, 28)
+        month = rng.randint(1, 12)
+        hour = rng.randint(9, 18)
+        return f"{day:02d}.{month:02d}.2025 {hour}:00-{hour + 2}:00"
+    if field in ("Participants", "Phone"):
+        return str(rng.randint(5, 300))
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+
+
+def random_fields(rng: random.Random) -> Dict[str, str]:
+    """Значения всех полей одной заявки"""
+    fields = [field for rows in NEW_LAYOUT_ROWS for field, _ in rows]
+    fields += [field for field, _ in OLD_LAYOUT_ROWS]
+    return {field: random_value(rng, field) for field in fields}
+
+
+def write_docx_new(path: str, values: Dict[str, str]) -> None:
+    """DOCX нового образца: три таблицы (подпись, значение)"""
+    doc = Document()
+    doc.add_paragraph("Заявка на бронирование Молодежного коворкинга")
+    for rows in NEW_LAYOUT_ROWS:
+        table = doc.add_table(rows=len(rows), cols=2)
+        for i, (field, label) in enumerate(rows):
+            table.cell(i, 0).text = label
+            table.cell(i, 1).text = values[field]
+        doc.add_paragraph("")
+    doc.save(path)
+
+
+def write_docx_old(path: str, values: Dict[str, str]) -> None:
+    """DOCX старого образца: одна таблица (номер, подпись, значение)"""
+    doc = Document()
+    doc.add_paragraph("Заявка на бронирование помещения")
+    table = doc.add_table(rows=len(OLD_LAYOUT_ROWS), cols=3)
+    for i, (field, label) in enumerate(OLD_LAYOUT_ROWS):
+        table.cell(i, 0).text = str(i + 1)
+        table.cell(i, 1).text = label
+        table.cell(i, 2).text = values[field]
+    doc.save(path)
+
+
+# Однобайтовая кодировка шрифта PDF: байты cp1251 с именами глифов uniXXXX
+_CYRILLIC_CODES = range(0xC0, 0x100)
+_FONT_DIFFERENCES = "192 " + " ".join(
+    f"/uni{ord(bytes([code]).decode('cp1251')):04X}"
+    for code in _CYRILLIC_CODES
+)
+
+
+def _pdf_text(x: float, y: float, text: str, size: int = 8) -> str:
+    encoded = text.encode("cp1251", errors="replace").hex()
+    return f"BT /F1 {size} Tf {x:.1f} {y:.1f} Td <{encoded}> Tj ET"
+
+
+def _write_pdf(path: str, content: List[str]) -> None:
+    """Записывает одностраничный PDF со шрифтом Helvetica"""
+    stream = "\n".join(content).encode("latin-1")
+    widths = " ".join(["500"] * 224)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream)
+        + stream
+        + b"\nendstream",
+        (
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            f"/FirstChar 32 /LastChar 255 /Widths [{widths}] "
+            "/Encoding << /Type /Encoding /BaseEncoding /WinAnsiEncoding "
+            f"/Differences [{_FONT_DIFFERENCES}] >> >>"
+        ).encode("latin-1"),
+    ]
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += (
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_pdf_table(path: str, values: Dict[str, str]) -> None:
+    """
+    PDF с таблицей нового образца: колонки [подпись, пояснение, -, значение]
+    """
+    columns = [40, 190, 260, 300, 555]
+    row_height = 24
+    content = []
+    top = 800
+    for rows in NEW_LAYOUT_ROWS:
+        for field, label in rows:
+            bottom = top - row_height
+            for left, right in zip(columns, columns[1:]):
+                content.append(
+                    f"{left} {bottom} {right - left} {row_height} re S"
+                )
+            content.append(_pdf_text(columns[0] + 3, bottom + 8, label[:35]))
+            content.append(
+                _pdf_text(columns[3] + 3, bottom + 8, values[field][:60])
+            )
+            top = bottom
+        top -= row_height
+    _write_pdf(path, content)
+
+
+def write_pdf_text(path: str, values: Dict[str, str]) -> None:
+    """PDF с текстовой формой: строки «Подпись: значение»"""
+    content = []
+    top = 800
+    for rows in NEW_LAYOUT_ROWS:
+        for field, label in rows:
+            content.append(_pdf_text(40, top, f"{label}: {values[field]}"))
+            top -= 18
+    _write_pdf(path, content)
+
+
+def write_pdf_old(path: str, values: Dict[str, str]) -> None:
+    """PDF старого образца: строки «|номер|подпись|значение|»"""
+    content = []
+    top = 800
+    for number, field, label in OLD_PDF_ROWS:
+        line = f"|{number}|{label}|{values[field][:60]}|"
+        content.append(_pdf_text(40, top, line))
+        top -= 18
+    _write_pdf(path, content)
+
+
+WRITERS = {
+    "docx_new": (write_docx_new, ".docx"),
+    "docx_old": (write_docx_old, ".docx"),
+    "pdf_table": (write_pdf_table, ".pdf"),
+    "pdf_text": (write_pdf_text, ".pdf"),
+    "pdf_old": (write_pdf_old, ".pdf"),
+}
+
+
+def generate_corpus(
+    directory: str,
+    count: int,
+    kinds: Tuple[str, ...] = tuple(WRITERS),
+    seed: int = 0,
+) -> Dict[str, List[str]]:
+    """
+    Генерирует count заявок каждого вида в directory.
+    Возвращает {вид: список путей}.
+    """
+    rng = random.Random(seed)
+    corpus: Dict[str, List[str]] = {}
+    for kind in kinds:
+        writer, extension = WRITERS[kind]
+        kind_dir = os.path.join(directory, kind)
+        os.makedirs(kind_dir, exist_ok=True)
+        corpus[kind] = []
+        for i in range(count):
+            path = os.path.join(kind_dir, f"{kind}_{i:05d}{extension}")
+            writer(path, random_fields(rng))
+            corpus[kind].append(path)
+    return corpus
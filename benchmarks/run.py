@@ -0,0 +1,300 @@
+"""
+Бенчмарк парсеров и полного конвейера на синтетическом корпусе.
+
+Запуск из корня проекта:
+    python -m benchmarks.run --count 100 --output bench.json
+
+Каждый сценарий выполняется в отдельном процессе, чтобы пиковое
+потребление памяти (RSS) измерялось независимо.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+from benchmarks.corpus import WRITERS, generate_corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CASES = (
+    "docx-xml",
+    "docx-python-docx",
+    "pdf-pdfplumber",
+    "pdf-pdfminer",
+    "pipeline",
+)
+
+# Виды корпуса, которые читает парсер PDF
+PDF_KINDS = ("pdf_table", "pdf_text", "pdf_old")
+
+
+def reset_peak_rss() -> None:
+    """
+    Сбрасывает пиковый RSS процесса до текущего (Linux). Процессы,
+    созданные после этого через fork, наследуют сброшенный пик
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _status_kb(field: str) -> Optional[int]:
+    """Значение поля /proc/self/status в килобайтах"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def peak_rss_mb(who: str = "self") -> Optional[float]:
+    """
+    Пиковый RSS процесса (или его дочерних процессов) в МБ.
+    Пик процесса берется из VmHWM: ru_maxrss в Linux сохраняет пик
+    родителя после fork и exec
+    """
+    if who == "self":
+        peak = _status_kb("VmHWM")
+        if peak is not None:
+            return round(peak / 1024, 2)
+    if resource is None:
+        return None
+    usage = resource.getrusage(
+        resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN
+    )
+    # ru_maxrss: килобайты в Linux, байты в macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 2)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Перцентиль по методу ближайшего ранга"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(files: int, seconds: float, latencies: List[float]) -> dict:
+    return {
+        "files": files,
+        "seconds": round(seconds, 4),
+        "files_per_sec": round(files / seconds, 2) if seconds else None,
+        "p50_ms": _ms(percentile(latencies, 0.50)),
+        "p95_ms": _ms(percentile(latencies, 0.95)),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _bench_parser(parser, files: List[str]) -> dict:
+    latencies = []
+    strategies: Counter = Counter()
+    started = time.perf_counter()
+    for file in files:
+        file_started = time.perf_counter()
+        data, _ = parser.parse(file)
+        latencies.append(time.perf_counter() - file_started)
+        if data is not None and data.strategy:
+            strategies[data.strategy] += 1
+    summary = _summary(len(files), time.perf_counter() - started, latencies)
+    if strategies:
+        # Число файлов, разобранных каждой стратегией каскада PDF
+        summary["strategies"] = dict(strategies)
+    return summary
+
+
+def run_case(
+    case: str, corpus: Dict[str, List[str]], workers: Optional[int]
+) -> Dict[str, Any]:
+    """Выполняет один сценарий бенчмарка, подавляя вывод парсеров"""
+    # Пик памяти считается с начала сценария, а не с запуска процесса
+    reset_peak_rss()
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            return _run_case(case, corpus, workers)
+
+
+def _run_case(
+    case: str, corpus: Dict[str, List[str]], workers: Optional[int]
+) -> Dict[str, Any]:
+    docx_files = corpus.get("docx_new", []) + corpus.get("docx_old", [])
+    pdf_files = [f for kind in PDF_KINDS for f in corpus.get(kind, [])]
+
+    if case in ("docx-xml", "docx-python-docx"):
+        from parsers.docx_parser import DocxParser
+
+        engine = case[len("docx-"):]
+        return _bench_parser(DocxParser(engine), docx_files)
+
+    if case.startswith("pdf-"):
+        from parsers.pdf_parser import PDFParser
+
+        # Все файлы читаются одним движком, без выбора по виду файла
+        backend = case[len("pdf-"):]
+        return _bench_parser(PDFParser(backend, {}), pdf_files)
+
+    # Полный конвейер: парсинг в пуле и сохранение результатов
+    from main import process_files, save_results
+    from models.event_model import EventBatch
+    from parsers.docx_parser import DocxParser
+    from parsers.pdf_parser import PDFParser
+
+    from utils.instrumentation import TRACER
+
+    # Задержки по файлам берутся из замеров total инструментации: рабочие
+    # процессы пула возвращают их вместе с результатами
+    TRACER.enabled = True
+    pdf_parser, docx_parser = PDFParser(), DocxParser()
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        results = EventBatch()
+        for files, file_type in ((pdf_files, "pdf"), (docx_files, "docx")):
+            results.extend(
+                process_files(
+                    pdf_parser, docx_parser, files, file_type, workers
+                )
+            )
+        save_results(
+            results,
+            os.path.join(output_dir, "output.xlsx"),
+            os.path.join(output_dir, "output.json"),
+        )
+        seconds = time.perf_counter() - started
+    latencies = [
+        record["wall_ms"] / 1000
+        for record in TRACER.pop_records()
+        if record["stage"] == "total"
+    ]
+    summary = _summary(len(docx_files) + len(pdf_files), seconds, latencies)
+    summary["workers_peak_rss_mb"] = peak_rss_mb("children")
+    return summary
+
+
+def check_docx_engines(files: List[str]) -> Dict[str, Any]:
+    """Сверяет результаты движков DOCX: xml и python-docx"""
+    from parsers.docx_parser import DocxParser
+
+    xml_parser, reference = DocxParser("xml"), DocxParser("python-docx")
+    mismatches = [
+        file
+        for file in files
+        if xml_parser.parse(file) != reference.parse(file)
+    ]
+    return {"equivalent": not mismatches, "mismatches": mismatches}
+
+
+def check_pdf_backends(files: List[str]) -> Dict[str, Any]:
+    """
+    Сверяет результаты движков PDF с эталонным pdfplumber: совпадение
+    записей целиком и доля совпавших полей
+    """
+    from parsers.pdf_backends import PDF_BACKENDS
+    from parsers.pdf_parser import PDFParser
+
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            reference = [PDFParser("pdfplumber", {}).parse(f) for f in files]
+            report = {}
+            for backend in PDF_BACKENDS:
+                if backend == "pdfplumber":
+                    continue
+                parser = PDFParser(backend, {})
+                mismatches, fields, matched = [], 0, 0
+                for file, expected in zip(files, reference):
+                    result = parser.parse(file)
+                    if result != expected:
+                        mismatches.append(file)
+                    if expected[0] is None or result[0] is None:
+                        fields += 1
+                        matched += expected[0] is result[0]
+                        continue
+                    for label, value in expected[0].items():
+                        fields += 1
+                        matched += result[0][label] == value
+                report[backend] = {
+                    "equivalent": not mismatches,
+                    "field_accuracy": round(matched / fields, 4)
+                    if fields
+                    else None,
+                    "mismatches": mismatches,
+                }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк парсера заявок")
+    parser.add_argument(
+        "--count", type=int, default=50, help="заявок каждого вида"
+    )
+    parser.add_argument(
+        "--kinds", nargs="+", choices=list(WRITERS), default=list(WRITERS)
+    )
+    parser.add_argument(
+        "--cases", nargs="+", choices=CASES, default=list(CASES)
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="процессов конвейера"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="файл отчета (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        corpus = generate_corpus(
+            corpus_dir, args.count, tuple(args.kinds), args.seed
+        )
+        report = {
+            "count_per_kind": args.count,
+            "kinds": args.kinds,
+            "workers": args.workers,
+            "cases": {},
+        }
+        for case in args.cases:
+            # Новый процесс на сценарий: независимый пиковый RSS
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as ex:
+                report["cases"][case] = ex.submit(
+                    run_case, case, corpus, args.workers
+                ).result()
+
+        docx_files = corpus.get("docx_new", []) + corpus.get("docx_old", [])
+        if docx_files:
+            report["docx_engines"] = check_docx_engines(docx_files)
+        pdf_files = [f for kind in PDF_KINDS for f in corpus.get(kind, [])]
+        if pdf_files:
+            report["pdf_backends"] = check_pdf_backends(pdf_files)
+
+    output = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Расхождение движков DOCX - ошибка, а не только строка отчета
+    if not report.get("docx_engines", {}).get("equivalent", True):
+        print("Движки DOCX дают разные результаты", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
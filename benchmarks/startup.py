@@ -0,0 +1,85 @@
+"""
+Бенчмарк времени запуска: время импорта main и модулей парсеров.
+
+Запуск из корня проекта:
+    python -m benchmarks.startup
+
+Каждый импорт замеряется в чистом интерпретаторе; при превышении
+бюджета или загрузке тяжелых зависимостей на этапе импорта процесс
+завершается с кодом 1.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Бюджет времени импорта, мс
+IMPORT_BUDGET_MS = {
+    "main": 150,
+    "parsers.docx_parser": 100,
+    "parsers.pdf_parser": 100,
+    "utils.sinks": 50,
+}
+
+# Зависимости, которые должны загружаться только при использовании
+HEAVY_MODULES = ("pandas", "pdfplumber", "pdfminer", "docx", "xlsxwriter")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"ms": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Dict[str, Any]:
+    """Медиана времени импорта модуля в новом интерпретаторе"""
+    timings: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        probe_code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+        output = subprocess.run(
+            [sys.executable, "-c", probe_code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        probe = json.loads(output)
+        timings.append(probe["ms"])
+        heavy = probe["heavy"]
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "budget_ms": IMPORT_BUDGET_MS[module],
+        "heavy_modules": heavy,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {
+        module: measure_import(module, args.repeat)
+        for module in IMPORT_BUDGET_MS
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=4))
+
+    failed = [
+        module
+        for module, result in report.items()
+        if result["heavy_modules"]
+        or result["median_ms"] > result["budget_ms"]
+    ]
+    if failed:
+        print(f"Превышен бюджет запуска: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
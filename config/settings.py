@@ -19,3 +19,96 @@ TABLE_FIELDS_MAPPING = {
         "звуковом оборудовании",
     ],
 }
+
+# Число процессов для параллельного парсинга (None - по числу ядер)
+PARSE_WORKERS = None
+
+# Версия парсеров: увеличивать при изменении формата извлекаемых данных
+PARSER_VERSION = "1"
+
+# Кэш результатов парсинга (None - кэш отключен)
+CACHE_DIR = ".parse_cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Движок чтения DOCX: "xml" (потоковый разбор document.xml) или "python-docx"
+DOCX_ENGINE = "xml"
+
+# Движок чтения PDF: "pdfplumber" (эталонный) или "pdfminer" (облегченный
+# разбор символов pdfminer без анализа разметки). PDF_KIND_BACKENDS задает
+# движок для видов файлов по сниффингу (parsers.sniffer): в PDF с
+# текстовой формой таблицы не ищутся, их читает облегченный движок
+PDF_BACKEND = "pdfplumber"
+PDF_KIND_BACKENDS = {"pdf-text": "pdfminer"}
+
+# Порог уверенности разбора PDF по словам: доля заполненных полей
+# TABLE_FIELDS_MAPPING, ниже которой выполняется поиск таблиц
+PDF_CONFIDENCE_THRESHOLD = 0.5
+
+# Режим наблюдения за папкой: период опроса и время, в течение которого
+# файл не должен меняться, чтобы считаться дописанным (секунды)
+WATCH_INTERVAL = 2.0
+WATCH_SETTLE_SECONDS = 1.0
+
+# Объем начала файла, по которому определяется его формат (байты)
+SNIFF_MAX_BYTES = 128 * 1024
+
+# Локальный HTTP-сервис парсинга (server.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# Сколько задач может ждать свободного процесса сверх числа процессов;
+# при переполнении сервис отвечает 503 с заголовком Retry-After
+SERVER_QUEUE_LIMIT = 32
+SERVER_RETRY_AFTER = 1
+SERVER_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+# Время ожидания результата разбора одного файла (секунды)
+SERVER_TIMEOUT = 60
+
+# Лимиты разбора PDF: размер файла, размер распакованного содержимого
+# первой страницы (байты) и число объектов страницы (символов и фигур,
+# оценка по содержимому до анализа разметки). Файлы сверх лимитов
+# получают тип too_large; на странице, у которой после анализа (вместе с
+# вложенными формами) объектов больше лимита, таблицы не ищутся
+PDF_MAX_FILE_SIZE = 50 * 1024 * 1024
+PDF_MAX_CONTENT_BYTES = 8 * 1024 * 1024
+PDF_MAX_PAGE_OBJECTS = 20000
+
+# Вывод в SQLite: число записей в одной транзакции
+SQLITE_BATCH_SIZE = 500
+
+# Предельное время разбора одного файла в секундах (None - без ограничения
+# и без изоляции при одном процессе). Файл, не уложившийся в него,
+# получает тип timeout, а процесс заменяется новым
+PARSE_TIMEOUT = 60
+
+# Поиск повторных заявок: порог сходства записей (коэффициент Жаккара
+# шинглов полей), длина MinHash-сигнатуры и число полос LSH
+DEDUPE_THRESHOLD = 0.8
+DEDUPE_NUM_PERM = 64
+DEDUPE_BANDS = 16
+
+# Фикстура для загрузки в систему администратора (формат fixture
+# Django: model, pk, fields). FIXTURE_FIELDS сопоставляет полям модели
+# подписи полей заявки, "Filename" и "File Type". FIXTURE_PK - атрибут
+# записи, значение которого становится первичным ключом: с хэшем
+# содержимого ("content_hash", первичный ключ модели - строка из 64
+# символов) повторная загрузка обновляет объекты. None - pk не задается,
+# и каждая загрузка создает объекты заново (дубликаты)
+FIXTURE_MODEL = "bookings.booking"
+FIXTURE_PK = "content_hash"
+FIXTURE_FIELDS = {
+    "name": "Event name",
+    "department": "Department",
+    "date": "Date of event",
+    "installation_date": "Date of installation",
+    "order": "Order",
+    "participants": "Participants",
+    "responsible": "Responsible",
+    "event_format": "Event format",
+    "guests_of_honor": "Guests of honor",
+    "level": "Event level",
+    "schedule": "Schedule",
+    "equipment": "Necessary technical equipment",
+    "audio_training": "Training on working with audio equipment",
+    "source_file": "Filename",
+    "source_type": "File Type",
+}
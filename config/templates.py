@@ -0,0 +1,50 @@
+# Шаблоны разметки заявок DOCX.
+# Шаблоны проверяются по порядку, документ относится к первому подходящему:
+# в нем не меньше min_tables таблиц и выполнены все условия detect
+# (ячейка (таблица, строка, колонка) содержит строку contains).
+# Поле задается координатами ячейки (таблица, строка, колонка) или
+# объединением нескольких ячеек: cells, separator и optional - пропустить
+# поле, если какой-то строки в таблице нет.
+LAYOUT_TEMPLATES = {
+    "new": {
+        "min_tables": 3,
+        "detect": [
+            {"cell": (0, 0, 0), "contains": "Название мероприятия"},
+        ],
+        "fields": {
+            "Event name": (0, 0, 1),
+            "Department": (0, 1, 1),
+            "Date of event": (0, 2, 1),
+            "Date of installation": (0, 3, 1),
+            "Order": (0, 4, 1),
+            "Participants": (0, 5, 1),
+            "Responsible": (0, 6, 1),
+            "Event format": (1, 0, 1),
+            "Guests of honor": (1, 1, 1),
+            "Event level": (1, 2, 1),
+            "Schedule": (1, 3, 1),
+            "Necessary technical equipment": (2, 0, 1),
+            "Training on working with audio equipment": (2, 1, 1),
+        },
+    },
+    "old": {
+        "min_tables": 1,
+        "detect": [],
+        "fields": {
+            "Event name": (0, 4, 2),
+            "Department": (0, 0, 2),
+            "Date of event": (0, 1, 2),
+            "Event format": (0, 2, 2),
+            "Participants": (0, 3, 2),
+            "Schedule": (0, 4, 2),
+            "Necessary technical equipment": {
+                "cells": [(0, 8, 2), (0, 5, 2)],
+                "separator": ", ",
+                "optional": True,
+            },
+        },
+    },
+}
+
+# Тип документа, если ни один шаблон не подошел
+DEFAULT_LAYOUT = "old"
@@ -1,87 +1,489 @@
+import argparse
 import json
 import os
-import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Optional, Sequence
 
+from config.settings import (
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    DEFAULT_OUTPUT_FORMATS,
+    PARSE_WORKERS,
+    WATCH_INTERVAL,
+    WATCH_SETTLE_SECONDS,
+)
+from models.event_model import Event, EventBatch
 from parsers.docx_parser import DocxParser
 from parsers.pdf_parser import PDFParser
-from utils.file_utils import clear_output_files, find_files
+from parsers.pool import TIMEOUT, WatchdogPool, parse_file_async, parse_files
+from parsers.sniffer import (
+    KIND_FILE_TYPES,
+    print_inventory,
+    route_files,
+    sniff,
+    sniff_files,
+)
+from utils.cache import ParseCache
+from utils.file_utils import (
+    clear_output_files,
+    file_hash,
+    find_files,
+    source_name,
+)
+from utils.instrumentation import TRACER, stage
+from utils.sinks import (
+    BaseSink,
+    ConflictSink,
+    DedupeSink,
+    FixtureSink,
+    JsonLinesSink,
+    JsonObjectSink,
+    SqliteSink,
+    XlsxSink,
+)
+from utils.shards import (
+    PartialSink,
+    parse_shard,
+    partial_path,
+    read_partials,
+    shard_files,
+)
+from utils.watcher import FolderWatcher
 
 
 def process_files(
-    pdf_parser: PDFParser, docx_parser: DocxParser, files: list, file_type: str
-) -> Dict[str, Any]:
-    """Обрабатывает файлы указанного типа и возвращает результаты"""
-    results = {}
+    pdf_parser: PDFParser,
+    docx_parser: DocxParser,
+    files: list,
+    file_type: str,
+    workers: Optional[int] = 1,
+    cache: Optional[ParseCache] = None,
+    sinks: Sequence[BaseSink] = (),
+    collect: bool = True,
+    hints: Optional[Dict[str, str]] = None,
+    names: Optional[Dict[str, str]] = None,
+) -> EventBatch:
+    """
+    Обрабатывает файлы указанного типа и возвращает результаты.
+    При workers > 1 файлы парсятся в пуле процессов, результаты
+    упорядочены по пути файла. Файлы, найденные в кэше, не открываются.
+    Каждая запись сразу передается в sinks; при collect=False результаты
+    не накапливаются в памяти. hints - виды файлов по сниффингу.
+    names - имена записей, выданные в этом запуске, {имя: путь}: запись
+    файла с уже занятым именем получает имя по пути к файлу.
+    """
+    results = EventBatch()
+    parsers = {"pdf": pdf_parser, "docx": docx_parser}
+    files = sorted(files)
+
+    # Хэш содержимого - ключ кэша и ключ записи в SQLite; файлы
+    # хэшируются, только если он нужен кэшу или приемникам
+    keys, cached = {}, {}
+    with stage("cache"):
+        for file in files if needs_hash(cache, sinks) else ():
+            try:
+                keys[file] = file_hash(file)
+            except OSError:
+                continue
+            entry = cache.get(keys[file]) if cache is not None else None
+            if entry is not None:
+                cached[file] = entry
+
+    parsed = parse_files(
+        parsers,
+        [f for f in files if f not in cached],
+        file_type,
+        workers,
+        hints,
+    )
     for file in files:
-        try:
-            if file_type == "pdf":
-                data, doc_type = pdf_parser.parse(file)
-            else:
-                data, doc_type = docx_parser.parse(file)
-
-            if data:
-                results[os.path.basename(file)] = data
-                print(f"Обработан {file_type.upper()}: {file} ({doc_type})")
-        except Exception as e:
-            print(f"Ошибка при обработке {file_type.upper()} {file}: {str(e)}")
+        if file in cached:
+            fields, doc_type = cached[file]
+            data = Event.from_dict(fields, source_name(file), doc_type)
+            error = None
+        else:
+            _, data, doc_type, error = next(parsed)
+            # Таймаут не кэшируется: при следующем запуске файл
+            # разбирается заново
+            if (
+                cache is not None
+                and file in keys
+                and data
+                and not error
+                and doc_type != TIMEOUT
+            ):
+                cache.put(keys[file], data.to_dict(), doc_type)
+
+        if error:
+            print(f"Ошибка при обработке {file_type.upper()} {file}: {error}")
+        elif data:
+            data.content_hash = keys.get(file, "")
+            data.path = file
+            if names is not None:
+                unique_name(names, data, file)
+            with stage("save"):
+                for sink in sinks:
+                    sink.write(data.filename, data, doc_type)
+            if collect:
+                results.append(data)
+            strategy = data.strategy_label()
+            details = f"{doc_type}, {strategy}" if strategy else doc_type
+            print(f"Обработан {file_type.upper()}: {file} ({details})")
     return results
 
 
+def needs_hash(
+    cache: Optional[ParseCache], sinks: Sequence[BaseSink]
+) -> bool:
+    """Нужен ли хэш содержимого файлов кэшу или приемникам"""
+    return cache is not None or any(
+        sink.needs_content_hash for sink in sinks
+    )
+
+
+def unique_name(names: Dict[str, str], data: Event, file: str) -> None:
+    """
+    Заменяет имя записи путем к файлу, если имя уже выдано записи
+    другого файла: одноименные файлы из разных папок не перезаписывают
+    друг друга в выходных файлах
+    """
+    if names.setdefault(data.filename, file) != file:
+        print(
+            f"Имя {data.filename} уже занято файлом {names[data.filename]}, "
+            f"запись {file} сохранена под полным путем"
+        )
+        data.filename = os.path.normpath(file)
+        names[data.filename] = file
+
+
+async def watch_files(
+    pdf_parser: PDFParser,
+    docx_parser: DocxParser,
+    input_dir: str,
+    sinks: Sequence[BaseSink],
+    workers: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    interval: float = WATCH_INTERVAL,
+    settle: float = WATCH_SETTLE_SECONDS,
+    state_path: Optional[str] = None,
+) -> None:
+    """
+    Режим демона: опрашивает input_dir и парсит новые и измененные файлы
+    в постоянном пуле процессов. Записи дописываются в sinks сразу после
+    разбора; для измененного файла актуальна последняя запись.
+    state_path - файл подписей разобранных файлов между запусками.
+    """
+    # asyncio нужен только режиму наблюдения и не замедляет запуск
+    import asyncio
+
+    parsers = {"pdf": pdf_parser, "docx": docx_parser}
+    watcher = FolderWatcher(input_dir, settle, state_path)
+    pending = set()
+    names: Dict[str, str] = {}
+
+    async def handle(file: str) -> None:
+        kind = await asyncio.to_thread(sniff, file)
+        file_type = KIND_FILE_TYPES[kind]
+        if file_type is None:
+            print(f"Пропущен файл {file}: {kind}")
+            watcher.done(file)
+            return
+
+        key = None
+        if needs_hash(cache, sinks):
+            try:
+                key = await asyncio.to_thread(file_hash, file)
+            except OSError:
+                pass
+        entry = cache.get(key) if cache is not None and key else None
+        if entry is not None:
+            fields, doc_type = entry
+            data = Event.from_dict(fields, source_name(file), doc_type)
+            error = None
+        else:
+            _, data, doc_type, error = await parse_file_async(
+                pool, file, file_type, kind
+            )
+            if (
+                cache is not None
+                and key
+                and data
+                and not error
+                and doc_type != TIMEOUT
+            ):
+                cache.put(key, data.to_dict(), doc_type)
+
+        if error:
+            print(f"Ошибка при обработке {file_type.upper()} {file}: {error}")
+        elif data:
+            data.content_hash = key or ""
+            data.path = file
+            unique_name(names, data, file)
+            for sink in sinks:
+                sink.write(data.filename, data, doc_type)
+            strategy = data.strategy_label()
+            details = f"{doc_type}, {strategy}" if strategy else doc_type
+            print(f"Обработан {file_type.upper()}: {file} ({details})")
+        watcher.done(file)
+
+    with WatchdogPool(parsers, workers) as pool:
+        print(f"Ожидание новых файлов в {input_dir} (Ctrl+C для выхода)")
+        while True:
+            for file, _ in watcher.poll():
+                task = asyncio.create_task(handle(file))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.sleep(interval)
+
+
 def save_results(
-    results: Dict[str, Any], output_xlsx: str, output_json: str
+    results: EventBatch,
+    output_xlsx: str,
+    output_json: Optional[str] = None,
+    output_sqlite: Optional[str] = None,
 ) -> None:
-    """Сохраняет результаты в файлы"""
+    """
+    Сохраняет результаты в файлы.
+    JSON и SQLite записываются только при заданных путях - в основном
+    режиме они пишутся потоково во время обработки.
+    """
     if not results:
         print("Нет данных для сохранения")
         return
 
-    # Подготовка данных для Excel
-    excel_data = []
-    for filename, fields in results.items():
-        row = {
-            "Filename": filename,
-            "File Type": fields.get("doc_type", "unknown"),
-        }
-        row.update({k: v for k, v in fields.items() if k != "doc_type"})
-        excel_data.append(row)
-
     # Сохранение в Excel
-    df = pd.DataFrame(excel_data)
-    df.to_excel(output_xlsx, index=False, engine="openpyxl")
+    with XlsxSink(output_xlsx) as sink:
+        for event in results:
+            sink.write(event.filename, event, event.doc_type)
 
     # Сохранение в JSON
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=4)
+    if output_json:
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(results.to_dict(), f, ensure_ascii=False, indent=4)
+
+    # Обновление базы SQLite
+    if output_sqlite:
+        with SqliteSink(output_sqlite) as sink:
+            for event in results:
+                sink.write(event.filename, event, event.doc_type)
 
-    print(f"Результаты сохранены в {output_xlsx} и {output_json}")
+    print(f"Результаты сохранены в {output_xlsx}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Парсер заявок")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="число рабочих процессов (по умолчанию - число ядер)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="парсить все файлы заново, не используя кэш",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["xlsx", "json", "jsonl", "sqlite", "conflicts", "fixture"],
+        default=DEFAULT_OUTPUT_FORMATS,
+        help="форматы выходных файлов (conflicts - отчет о пересечениях "
+        "бронирований в conflicts.json, fixture - фикстура для системы "
+        "администратора в fixture.json)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="не выводить повторно поданные заявки (те же файлы и почти "
+        "совпадающие записи); состав групп повторов - в duplicates.json",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="включить замеры стадий и записать их по файлам в PATH "
+        "(.csv для таблиц, .json для chrome://tracing)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="следить за папкой входных файлов и дописывать результаты "
+        "новых заявок в output.jsonl (и в output.sqlite, если указан "
+        "формат sqlite)",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        type=parse_shard,
+        help="обработать только I-ю из N частей входных файлов (по хэшу "
+        "пути) и записать частичный результат output.shard-I-of-N.json",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="PARTIAL",
+        help="не разбирать файлы, а собрать выходные файлы из частичных "
+        "результатов шардов",
+    )
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help="только определить форматы входных файлов и вывести сводку",
+    )
+    args = parser.parse_args()
+    if args.shard and (args.merge or args.watch):
+        parser.error("--shard нельзя использовать с --merge и --watch")
+    return args
 
 
 def main():
+    args = parse_args()
+    TRACER.enabled = bool(args.trace)
+
     # Конфигурация путей
     input_dir = "inputs"
     output_xlsx = "output.xlsx"
     output_json = "output.json"
+    output_jsonl = "output.jsonl"
+    # База SQLite не очищается: записи обновляются по хэшу содержимого
+    output_sqlite = "output.sqlite"
+    output_conflicts = "conflicts.json"
+    output_duplicates = "duplicates.json"
+    # Подписи файлов, разобранных в режиме наблюдения
+    watch_state = "output.watch.json"
+    output_fixture = "fixture.json"
 
-    # Очистка предыдущих результатов
-    clear_output_files(output_xlsx, output_json)
+    if args.inventory:
+        docx_files, pdf_files = find_files(input_dir)
+        print_inventory(sniff_files(pdf_files + docx_files))
+        return
+
+    if args.merge:
+        # Слияние частичных результатов шардов вместо разбора файлов;
+        # несовместимые результаты не затирают прежние выходные файлы
+        merged = read_partials(args.merge)
+        if merged is None:
+            return
+
+    # Очистка предыдущих результатов (режим наблюдения дописывает их,
+    # шард пишет только свой частичный результат)
+    if not args.watch and not args.shard:
+        clear_output_files(
+            output_xlsx, output_json, output_jsonl, output_conflicts,
+            output_duplicates, output_fixture,
+        )
 
     # Инициализация парсеров
     pdf_parser = PDFParser()
     docx_parser = DocxParser()
+    cache = None
+    if CACHE_DIR and not args.no_cache:
+        cache = ParseCache(CACHE_DIR, CACHE_MAX_BYTES)
+
+    if args.watch:
+        import asyncio
+
+        # Дописывать записи можно только в JSONL и SQLite. Записи прежних
+        # запусков сохраняются; без них прежнее состояние не действует
+        if not os.path.exists(output_jsonl):
+            clear_output_files(watch_state)
+        sinks = [JsonLinesSink(output_jsonl, append=True)]
+        if "sqlite" in args.formats:
+            sinks.append(SqliteSink(output_sqlite, batch_size=1))
+        try:
+            asyncio.run(
+                watch_files(
+                    pdf_parser, docx_parser, input_dir, sinks,
+                    workers=args.workers, cache=cache,
+                    state_path=watch_state,
+                )
+            )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for sink in sinks:
+                sink.close()
+        print(f"Результаты сохранены в {', '.join(s.path for s in sinks)}")
+        return
 
-    # Поиск файлов
-    docx_files, pdf_files = find_files(input_dir)
+    if not args.merge:
+        # Поиск файлов и определение их формата: парсер выбирается по
+        # содержимому, поврежденные и неподдерживаемые файлы пропускаются
+        docx_files, pdf_files = find_files(input_dir)
+        files = pdf_files + docx_files
+        if args.shard:
+            files = shard_files(files, input_dir, *args.shard)
+        with stage("sniff"):
+            kinds = sniff_files(files)
+        routes = route_files(kinds)
 
-    # Обработка файлов
-    pdf_results = process_files(pdf_parser, docx_parser, pdf_files, "pdf")
-    docx_results = process_files(pdf_parser, docx_parser, docx_files, "docx")
+    # Потоковые приемники: записи попадают на диск сразу после парсинга
+    sinks = []
+    if args.shard:
+        # Шард пишет только частичный результат для последующего слияния
+        sinks.append(
+            PartialSink(
+                partial_path(output_json, *args.shard),
+                *args.shard,
+                root=input_dir,
+                files=len(files),
+            )
+        )
+    elif "json" in args.formats:
+        sinks.append(JsonObjectSink(output_json))
+    if "jsonl" in args.formats and not args.shard:
+        sinks.append(JsonLinesSink(output_jsonl))
+    if "xlsx" in args.formats and not args.shard:
+        sinks.append(XlsxSink(output_xlsx))
+    if "sqlite" in args.formats and not args.shard:
+        sinks.append(SqliteSink(output_sqlite))
+    if "conflicts" in args.formats and not args.shard:
+        sinks.append(ConflictSink(output_conflicts))
+    if "fixture" in args.formats and not args.shard:
+        sinks.append(FixtureSink(output_fixture))
+    paths = [sink.path for sink in sinks]
+    if args.dedupe and sinks and not args.shard:
+        # Записи выводятся после разбора всех файлов, без повторов
+        sinks = [DedupeSink(sinks, output_duplicates)]
+        paths.append(output_duplicates)
 
-    # Объединение результатов
-    all_results = {**pdf_results, **docx_results}
+    try:
+        if args.merge:
+            # Имена записей проверяются на совпадение во всех шардах
+            names: Dict[str, str] = {}
+            for data in merged:
+                unique_name(names, data, data.path)
+                for sink in sinks:
+                    sink.write(data.filename, data, data.doc_type)
+        else:
+            # Обработка файлов
+            options = dict(
+                workers=args.workers,
+                cache=cache,
+                sinks=sinks,
+                collect=False,
+                hints=kinds,
+                names={},
+            )
+            for file_type in ("pdf", "docx"):
+                process_files(
+                    pdf_parser, docx_parser, routes[file_type], file_type,
+                    **options,
+                )
+    finally:
+        with stage("save"):
+            for sink in sinks:
+                sink.close()
+    if paths:
+        print(f"Результаты сохранены в {', '.join(paths)}")
 
-    # Сохранение результатов
-    save_results(all_results, output_xlsx, output_json)
+    # Отчет инструментации
+    if args.trace:
+        TRACER.print_summary()
+        TRACER.write_trace(args.trace)
+        summary_path = os.path.splitext(args.trace)[0] + ".summary.json"
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(TRACER.summary(), f, ensure_ascii=False, indent=4)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,175 @@
+import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Tuple
 
+# Подписи полей в выходных файлах и соответствующие атрибуты Event
+FIELD_ATTRIBUTES = {
+    "Event name": "name",
+    "Department": "department",
+    "Date of event": "date",
+    "Date of installation": "installation_date",
+    "Order": "order",
+    "Participants": "participants",
+    "Responsible": "responsible",
+    "Event format": "event_format",
+    "Guests of honor": "guests_of_honor",
+    "Event level": "level",
+    "Schedule": "schedule",
+    "Necessary technical equipment": "equipment",
+    "Training on working with audio equipment": "audio_training",
+}
+FIELD_LABELS = tuple(FIELD_ATTRIBUTES)
 
-@dataclass
+# Значения полей, которые парсеры подставляют, не найдя их в файле
+DEFAULT_DEPARTMENT = "Молодежный коворкинг А11"
+DEFAULT_VALUES = {"Department": DEFAULT_DEPARTMENT}
+
+# Типы записей-заглушек для неразобранных файлов: файл превышает лимиты
+# разбора или его разбор не уложился во время. Поля таких записей пустые
+TOO_LARGE = "too_large"
+TIMEOUT = "timeout"
+PLACEHOLDER_DOC_TYPES = frozenset((TOO_LARGE, TIMEOUT))
+
+
+@dataclass(slots=True)
 class Event:
-    name: str
-    department: str
-    date: str
-    participants: str
-    responsible: str
-    # ... остальные поля ...
-
-    def to_dict(self) -> dict:
-        return self.__dict__
+    """
+    Запись заявки. Поддерживает доступ по подписям полей
+    (event["Event name"]), как прежний словарь извлеченных данных.
+    """
+
+    name: str = ""
+    department: str = ""
+    date: str = ""
+    installation_date: str = ""
+    order: str = ""
+    participants: str = ""
+    responsible: str = ""
+    event_format: str = ""
+    guests_of_honor: str = ""
+    level: str = ""
+    schedule: str = ""
+    equipment: str = ""
+    audio_training: str = ""
+    filename: str = ""
+    doc_type: str = ""
+    # SHA-256 содержимого исходного файла
+    content_hash: str = ""
+    # Путь к исходному файлу
+    path: str = ""
+    # Стратегия извлечения данных и доля заполненных ею полей (PDF)
+    strategy: str = ""
+    confidence: float = 0.0
+
+    def __getitem__(self, label: str) -> str:
+        return getattr(self, FIELD_ATTRIBUTES[label])
+
+    def __setitem__(self, label: str, value: str) -> None:
+        setattr(self, FIELD_ATTRIBUTES[label], value)
+
+    def __contains__(self, label: object) -> bool:
+        return label in FIELD_ATTRIBUTES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELD_LABELS)
+
+    def __len__(self) -> int:
+        return len(FIELD_LABELS)
+
+    def keys(self) -> Tuple[str, ...]:
+        return FIELD_LABELS
+
+    def items(self) -> List[Tuple[str, str]]:
+        return [(label, self[label]) for label in FIELD_LABELS]
+
+    def get(self, label: str, default: Any = None) -> Any:
+        return self[label] if label in FIELD_ATTRIBUTES else default
+
+    def strategy_label(self) -> str:
+        """Стратегия извлечения с оценкой: "words 0.92" (или пусто)"""
+        if not self.strategy:
+            return ""
+        return f"{self.strategy} {self.confidence:.2f}"
+
+    def to_dict(self) -> Dict[str, str]:
+        """Поля заявки в виде {подпись: значение}"""
+        return {label: self[label] for label in FIELD_LABELS}
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, str], filename: str = "", doc_type: str = ""
+    ) -> "Event":
+        """Создает запись из словаря {подпись: значение}"""
+        event = cls(filename=filename, doc_type=doc_type)
+        for label, value in data.items():
+            if label in FIELD_ATTRIBUTES:
+                event[label] = value
+        return event
+
+
+class EventBatch:
+    """
+    Колоночное хранилище записей пакета: по одному списку на поле.
+    В словари и DataFrame преобразуется только при выводе результатов.
+    """
+
+    __slots__ = ("_columns",)
+
+    COLUMNS = Event.__slots__
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, List[str]] = {
+            name: [] for name in self.COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self._columns["filename"])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Event]:
+        for values in zip(*self._columns.values()):
+            yield Event(*values)
+
+    def append(self, event: Event) -> None:
+        for name, column in self._columns.items():
+            column.append(getattr(event, name))
+        # Тип документа повторяется во всех записях
+        column = self._columns["doc_type"]
+        column[-1] = sys.intern(column[-1])
+
+    def extend(self, batch: "EventBatch") -> None:
+        for name, column in self._columns.items():
+            column.extend(batch._columns[name])
+
+    def column(self, label: str) -> List[str]:
+        """Значения поля по подписи или имени атрибута"""
+        return self._columns[FIELD_ATTRIBUTES.get(label, label)]
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        """Результаты в виде {имя файла: {подпись: значение}}"""
+        return {event.filename: event.to_dict() for event in self}
+
+    def to_rows(self) -> List[Dict[str, str]]:
+        """Строки таблицы вывода: имя файла, тип документа и поля"""
+        return [
+            {
+                "Filename": event.filename,
+                "File Type": event.doc_type,
+                **event.to_dict(),
+            }
+            for event in self
+        ]
+
+    def to_dataframe(self):
+        """DataFrame с колонками Filename, File Type и полями заявки"""
+        import pandas as pd
+
+        data = {
+            "Filename": self._columns["filename"],
+            "File Type": self._columns["doc_type"],
+        }
+        for label in FIELD_LABELS:
+            data[label] = self.column(label)
+        return pd.DataFrame(data)
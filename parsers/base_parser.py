@@ -1,13 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from utils.file_utils import Source
 
 
 class BaseParser(ABC):
     @abstractmethod
-    def parse(self, file_path: str) -> Dict[str, Any]:
-        """Базовый метод для парсинга файла"""
+    def parse(
+        self, source: Source, hint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Базовый метод для парсинга файла
+        source - путь (в том числе файла в ZIP-архиве), содержимое файла
+        или открытый двоичный файл
+        hint - вид файла, определенный parsers.sniffer
+        """
         pass
 
+    def warm_up(self) -> None:
+        """Загружает зависимости парсера заранее, до первого файла"""
+
     @staticmethod
     def clean_text(text: str) -> str:
         """Очистка текста от лишних пробелов и переносов"""
@@ -1,94 +1,99 @@
-from typing import Any, Dict, Tuple
-from docx import Document
+from typing import IO, Optional, Tuple, Union
+
+from config.settings import DOCX_ENGINE
+from models.event_model import Event
+from utils.file_utils import Source, resolve_source, source_name
+from utils.instrumentation import stage
+
 from .base_parser import BaseParser
+from .docx_xml import read_tables
+from .layout import LAYOUTS, detect_layout
+from .sniffer import DOCX_NEW
+
+# Движки чтения таблиц: объектная модель python-docx или потоковый XML
+DOCX_ENGINES = ("python-docx", "xml")
+
+# Шаблон разметки для вида файла по сниффингу: сниффер проверяет первую
+# ячейку первой таблицы по условию шаблона new. Для остальных видов
+# шаблон определяется по всем шаблонам config.templates
+HINT_LAYOUTS = {DOCX_NEW: "new"}
+# Сколько первых таблиц нужно, чтобы проверить все шаблоны
+MAX_TABLES = max(plan.tables for plan in LAYOUTS.values())
 
 
 class DocxParser(BaseParser):
-    def parse(self, file_path: str) -> Tuple[Dict[str, Any], str]:
+    def __init__(self, engine: Optional[str] = None) -> None:
+        self.engine = engine or DOCX_ENGINE
+        if self.engine not in DOCX_ENGINES:
+            raise ValueError(f"Unknown DOCX engine: {self.engine}")
+
+    def parse(
+        self, source: Source, hint: Optional[str] = None
+    ) -> Tuple[Optional[Event], str]:
         """
         Основной метод парсинга DOCX файла
-        Возвращает кортеж (извлеченные данные, тип документа)
+        Возвращает кортеж (запись заявки, тип документа)
+        По виду файла hint читаются только таблицы, нужные его шаблону;
+        если у шаблона нет условий распознавания или он не подходит, тип
+        определяется по всем шаблонам
         """
         try:
-            doc = Document(file_path)
-            doc_type = self._determine_doc_type(doc)
-            return self._parse_tables(doc.tables, doc_type), doc_type
+            file = resolve_source(source)
+            plan = LAYOUTS.get(HINT_LAYOUTS.get(hint))
+            tables = None
+            if plan is not None and plan.detect:
+                with stage("open"):
+                    tables = self._load_tables(file, plan.tables)
+                doc_type = plan.name
+                if not plan.matches(tables):
+                    tables = None
+                    if not isinstance(file, str):
+                        file.seek(0)
+            if tables is None:
+                with stage("open"):
+                    tables = self._load_tables(file, MAX_TABLES)
+                with stage("detect"):
+                    doc_type = self._determine_doc_type(tables)
+            with stage("map"):
+                event = self._parse_tables(tables, doc_type)
+            event.filename = source_name(source)
+            event.doc_type = doc_type
+            return event, doc_type
         except Exception as e:
-            print(f"DOCX parsing error in {file_path}: {str(e)}")
-            return {}, "error"
+            print(f"DOCX parsing error in {source_name(source)}: {str(e)}")
+            return None, "error"
 
-    def _determine_doc_type(self, doc: Document) -> str:
-        """
-        Определяет тип документа (new/old) на основе структуры
-        """
-        tables = doc.tables
-        if len(tables) >= 3 and (
-            "Название мероприятия" in tables[0].rows[0].cells[0].text
-        ):
-            return "new"
-        return "old"
+    def warm_up(self) -> None:
+        if self.engine == "python-docx":
+            import docx  # noqa: F401
 
-    def _parse_tables(self, tables: list, doc_type: str) -> Dict[str, Any]:
+    def _load_tables(self, file: Union[str, IO[bytes]], limit: int) -> list:
         """
-        Парсит таблицы DOCX документа в зависимости от его типа
+        Загружает таблицы документа (путь или файл) выбранным движком.
+        Для разбора нужны только первые limit таблиц.
         """
-        extracted_data = {
-            "Event name": "",
-            "Department": "",
-            "Date of event": "",
-            "Date of installation": "",
-            "Order": "",
-            "Participants": "",
-            "Responsible": "",
-            "Event format": "",
-            "Guests of honor": "",
-            "Event level": "",
-            "Schedule": "",
-            "Necessary technical equipment": "",
-            "Training on working with audio equipment": "",
-        }
+        if self.engine == "xml":
+            return read_tables(file, limit=limit)
 
-        try:
-            if doc_type == "new" and len(tables) >= 3:
-                for key, row, col in [
-                    ("Event name", 0, 1),
-                    ("Department", 1, 1),
-                    ("Date of event", 2, 1),
-                    ("Date of installation", 3, 1),
-                    ("Order", 4, 1),
-                    ("Participants", 5, 1),
-                    ("Responsible", 6, 1),
-                    ("Event format", 7, 1),
-                    ("Guests of honor", 8, 1),
-                    ("Event level", 9, 1),
-                    ("Schedule", 10, 1),
-                    ("Necessary technical equipment", 14, 1),
-                    ("Training on working with audio equipment", 15, 1),
-                ]:
-                    extracted_data[key] = (
-                        tables[row // 7].rows[row % 7].cells[col].text.strip()
-                    )
+        # python-docx загружается только для соответствующего движка
+        from docx import Document
 
-            elif doc_type == "old" and len(tables) > 0:
-                for key, row, col in [
-                    ("Event name", 4, 2),
-                    ("Department", 0, 2),
-                    ("Date of event", 1, 2),
-                    ("Event format", 2, 2),
-                    ("Participants", 3, 2),
-                    ("Schedule", 4, 2),
-                ]:
-                    extracted_data[key] = (
-                        tables[row // 6].rows[row % 6].cells[col].text.strip()
-                    )
+        return Document(file).tables
 
-                if len(tables[0].rows) > 8:
-                    extracted_data["Necessary technical equipment"] = (
-                        tables[0].rows[8].cells[2].text.strip()
-                        + ", "
-                        + tables[0].rows[5].cells[2].text.strip()
-                    )
+    def _determine_doc_type(self, tables: list) -> str:
+        """
+        Определяет тип документа по шаблонам разметки config.templates
+        """
+        return detect_layout(tables)
 
+    def _parse_tables(self, tables: list, doc_type: str) -> Event:
+        """
+        Извлекает поля по скомпилированному плану шаблона документа
+        """
+        extracted_data = Event()
+
+        try:
+            LAYOUTS[doc_type].fill(extracted_data, tables)
         except Exception as e:
             print(f"Table parsing error: {str(e)}")
 
@@ -0,0 +1,148 @@
+"""
+Легковесное чтение таблиц DOCX без построения объектной модели python-docx.
+Из пакета открывается только основной документ, который разбирается
+потоково до закрытия нужного числа таблиц верхнего уровня.
+"""
+import posixpath
+import zipfile
+from typing import IO, Dict, List, Optional, Union
+from xml.etree import ElementTree as ET
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/"
+    "relationships/officeDocument"
+)
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+
+# Текстовые эквиваленты элементов содержимого run (как в python-docx)
+RUN_TEXT = {
+    f"{W}tab": "\t",
+    f"{W}ptab": "\t",
+    f"{W}cr": "\n",
+    f"{W}noBreakHyphen": "-",
+}
+
+
+class XmlCell:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class XmlRow:
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: List[XmlCell]) -> None:
+        self.cells = cells
+
+
+class XmlTable:
+    """Таблица с интерфейсом tables[i].rows[j].cells[k].text"""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: List[XmlRow]) -> None:
+        self.rows = rows
+
+
+def _run_text(run: ET.Element) -> str:
+    parts = []
+    for child in run:
+        if child.tag == f"{W}t":
+            parts.append(child.text or "")
+        elif child.tag == f"{W}br":
+            if child.get(f"{W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(RUN_TEXT.get(child.tag, ""))
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == f"{W}r":
+            parts.append(_run_text(child))
+        elif child.tag == f"{W}hyperlink":
+            parts.extend(_run_text(run) for run in child.findall(f"{W}r"))
+    return "".join(parts)
+
+
+def _cell_text(tc: ET.Element) -> str:
+    return "\n".join(_paragraph_text(p) for p in tc.findall(f"{W}p"))
+
+
+def _int_property(element: ET.Element, path: str, default: int) -> int:
+    node = element.find(path)
+    if node is None:
+        return default
+    return int(node.get(f"{W}val", default))
+
+
+def _build_table(tbl: ET.Element) -> XmlTable:
+    """
+    Строит таблицу так же, как _Row.cells в python-docx: ячейка с
+    горизонтальным объединением повторяется по числу колонок сетки,
+    продолжение вертикального объединения берется из строки выше.
+    """
+    rows = []
+    above: Dict[int, List[XmlCell]] = {}
+    for tr in tbl.findall(f"{W}tr"):
+        offset = _int_property(tr, f"{W}trPr/{W}gridBefore", 0)
+        cells, current = [], {}
+        for tc in tr.findall(f"{W}tc"):
+            span = _int_property(tc, f"{W}tcPr/{W}gridSpan", 1)
+            merge = tc.find(f"{W}tcPr/{W}vMerge")
+            if merge is not None and merge.get(f"{W}val") != "restart":
+                spanned = above.get(offset) or [XmlCell("")] * span
+            else:
+                spanned = [XmlCell(_cell_text(tc))] * span
+            current[offset] = spanned
+            cells.extend(spanned)
+            offset += span
+        above = current
+        rows.append(XmlRow(cells))
+    return XmlTable(rows)
+
+
+def _document_part(package: zipfile.ZipFile) -> str:
+    """Находит основной документ пакета по связям _rels/.rels"""
+    try:
+        rels = ET.fromstring(package.read("_rels/.rels"))
+    except KeyError:
+        return DEFAULT_DOCUMENT_PART
+    for rel in rels.iter(f"{REL}Relationship"):
+        if rel.get("Type") == OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get("Target", "").lstrip("/"))
+    return DEFAULT_DOCUMENT_PART
+
+
+def read_tables(
+    file: Union[str, IO[bytes]], limit: Optional[int] = 3
+) -> List[XmlTable]:
+    """
+    Возвращает первые limit таблиц верхнего уровня документа DOCX
+    (все таблицы при limit=None)
+    """
+    tables: List[XmlTable] = []
+    with zipfile.ZipFile(file) as package:
+        with package.open(_document_part(package)) as stream:
+            stack: List[ET.Element] = []
+            for event, element in ET.iterparse(stream, ("start", "end")):
+                if event == "start":
+                    stack.append(element)
+                    continue
+
+                stack.pop()
+                # Прямые потомки w:body: таблицы разбираем, остальное
+                # сразу удаляем, чтобы не держать документ в памяти
+                if len(stack) == 2 and stack[-1].tag == f"{W}body":
+                    if element.tag == f"{W}tbl":
+                        tables.append(_build_table(element))
+                        if limit is not None and len(tables) >= limit:
+                            break
+                    stack[-1].remove(element)
+    return tables
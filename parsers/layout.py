@@ -0,0 +1,114 @@
+"""
+Планы извлечения полей из таблиц DOCX, скомпилированные из шаблонов
+config.templates при импорте модуля.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.templates import DEFAULT_LAYOUT, LAYOUT_TEMPLATES
+from models.event_model import FIELD_ATTRIBUTES, Event
+
+Cell = Tuple[int, int, int]
+# Шаг плана: (атрибут Event, ячейки, разделитель, необязательное поле)
+Step = Tuple[str, Tuple[Cell, ...], str, bool]
+
+
+class LayoutPlan:
+    """Скомпилированный шаблон: условия распознавания и шаги извлечения"""
+
+    __slots__ = ("name", "min_tables", "detect", "steps", "tables")
+
+    def __init__(
+        self,
+        name: str,
+        min_tables: int,
+        detect: List[Tuple[Cell, str]],
+        steps: List[Step],
+    ) -> None:
+        self.name = name
+        self.min_tables = min_tables
+        self.detect = detect
+        self.steps = steps
+        # Сколько первых таблиц документа нужно для распознавания и
+        # извлечения полей
+        cells = [cell for cell, _ in detect]
+        cells += [cell for _, step_cells, _, _ in steps for cell in step_cells]
+        self.tables = max([min_tables] + [t + 1 for t, _, _ in cells])
+
+    def matches(self, tables: list) -> bool:
+        """Подходит ли шаблон к таблицам документа"""
+        if len(tables) < self.min_tables:
+            return False
+        try:
+            return all(
+                text in tables[t].rows[r].cells[c].text
+                for (t, r, c), text in self.detect
+            )
+        except IndexError:
+            return False
+
+    def fill(self, event: Event, tables: list) -> Event:
+        """
+        Заполняет запись значениями ячеек. При отсутствии обязательной
+        ячейки бросает IndexError, уже извлеченные поля сохраняются.
+        """
+        if len(tables) < self.min_tables:
+            return event
+
+        # Ячейки строки вычисляются один раз: в python-docx это дорого
+        rows: Dict[Tuple[int, int], list] = {}
+        for attribute, cells, separator, optional in self.steps:
+            values = []
+            try:
+                for t, r, c in cells:
+                    row = rows.get((t, r))
+                    if row is None:
+                        row = rows[t, r] = tables[t].rows[r].cells
+                    values.append(row[c].text.strip())
+            except IndexError:
+                if optional:
+                    continue
+                raise
+            setattr(event, attribute, separator.join(values))
+        return event
+
+
+def compile_template(name: str, template: Dict[str, Any]) -> LayoutPlan:
+    """Компилирует шаблон разметки в план извлечения"""
+    detect = [
+        (tuple(rule["cell"]), rule["contains"])
+        for rule in template.get("detect", [])
+    ]
+    steps: List[Step] = []
+    for label, spec in template["fields"].items():
+        if label not in FIELD_ATTRIBUTES:
+            raise ValueError(f"Unknown field in layout {name}: {label}")
+        if isinstance(spec, dict):
+            cells = tuple(tuple(cell) for cell in spec["cells"])
+            separator = spec.get("separator", "")
+            optional = spec.get("optional", False)
+        else:
+            cells, separator, optional = (tuple(spec),), "", False
+        steps.append((FIELD_ATTRIBUTES[label], cells, separator, optional))
+    return LayoutPlan(name, template.get("min_tables", 0), detect, steps)
+
+
+def compile_templates(
+    templates: Dict[str, Dict[str, Any]]
+) -> Dict[str, LayoutPlan]:
+    return {
+        name: compile_template(name, template)
+        for name, template in templates.items()
+    }
+
+
+LAYOUTS = compile_templates(LAYOUT_TEMPLATES)
+
+
+def detect_layout(
+    tables: list, layouts: Optional[Dict[str, LayoutPlan]] = None
+) -> str:
+    """Имя первого подходящего шаблона"""
+    for name, plan in (layouts or LAYOUTS).items():
+        if plan.matches(tables):
+            return name
+    return DEFAULT_LAYOUT
@@ -0,0 +1,323 @@
+"""
+Движки чтения первой страницы PDF с общим интерфейсом: текст страницы,
+слова с координатами и сетка таблиц.
+
+pdfplumber - эталонный движок. pdfminer - облегченный: символы страницы
+берутся из интерпретатора pdfminer без анализа разметки (LAParams), а
+строки и слова собираются по тем же правилам, что в pdfplumber, но без
+построения объектов pdfplumber для каждого символа. Таблицы в нем ищет
+pdfplumber по требованию.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import IO, Dict, List, Optional, Tuple, Type, Union
+
+# Слово: (x0, top, x1, bottom, текст), координаты от левого верхнего угла
+Word = Tuple[float, float, float, float, str]
+
+# Допуски группировки (в пунктах), как по умолчанию в pdfplumber
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+class PdfPage(ABC):
+    """
+    Первая страница документа. Атрибут page_obj (страница pdfminer)
+    доступен сразу, остальное - после analyze().
+    """
+
+    page_obj = None
+    object_count = 0
+    # Число линий и прямоугольников страницы (признак сетки таблицы)
+    grid_lines = 0
+    text = ""
+    lines: List[str] = []
+
+    @abstractmethod
+    def analyze(self) -> None:
+        """Единственный проход анализа страницы"""
+
+    @property
+    @abstractmethod
+    def words(self) -> List[Word]:
+        """Слова страницы в порядке чтения"""
+
+    @property
+    def word_lines(self) -> List[List[Word]]:
+        """Слова, сгруппированные по строкам"""
+        words = self.words
+        tops = _cluster([word[1] for word in words], Y_TOLERANCE)
+        rows: Dict[float, List[Word]] = defaultdict(list)
+        for word in words:
+            rows[tops[word[1]]].append(word)
+        return [
+            sorted(rows[top], key=lambda word: word[0])
+            for top in sorted(rows)
+        ]
+
+    @property
+    @abstractmethod
+    def tables(self) -> list:
+        """Таблицы: списки строк, ячейка - текст или None"""
+
+    def close(self) -> None:
+        """Освобождает результаты анализа страницы"""
+
+
+class PdfDocument(ABC):
+    """Открытый PDF-документ; закрывается как контекстный менеджер"""
+
+    @staticmethod
+    def warm_up() -> None:
+        """Загружает зависимости движка заранее"""
+
+    @abstractmethod
+    def __init__(self, file: Union[str, IO[bytes]]) -> None:
+        pass
+
+    @abstractmethod
+    def first_page(self) -> Optional[PdfPage]:
+        """Первая страница или None, если страниц нет"""
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PlumberPage(PdfPage):
+    """
+    Страница pdfplumber. Символы, линии и прямоугольники вычисляются
+    один раз, из них строятся текст, строки и сетка таблиц.
+    """
+
+    def __init__(self, page) -> None:
+        self.page = page
+        self.page_obj = page.page_obj
+        self._tables = None
+
+    def analyze(self) -> None:
+        # Единственный проход анализа разметки pdfminer; результат
+        # кэшируется страницей и используется всеми извлечениями ниже
+        self.objects = self.page.objects
+        self.object_count = sum(map(len, self.objects.values()))
+        self.grid_lines = len(self.objects.get("rect", [])) + len(
+            self.objects.get("line", [])
+        )
+        self.text = self.page.extract_text() or ""
+        self.lines = self.text.split("\n")
+
+    @property
+    def words(self) -> List[Word]:
+        return [
+            (w["x0"], w["top"], w["x1"], w["bottom"], w["text"])
+            for w in self.page.extract_words()
+        ]
+
+    @property
+    def tables(self) -> list:
+        """Сетка таблиц, строится по требованию из тех же объектов"""
+        if self._tables is None:
+            self._tables = [
+                table.extract() for table in self.page.find_tables()
+            ]
+        return self._tables
+
+    def close(self) -> None:
+        self.page.close()
+
+
+class PlumberDocument(PdfDocument):
+    @staticmethod
+    def warm_up() -> None:
+        import pdfplumber  # noqa: F401
+
+    def __init__(self, file: Union[str, IO[bytes]]) -> None:
+        import pdfplumber
+
+        # Объекты страниц после первой не создаются
+        self.pdf = pdfplumber.open(file, pages=[1])
+
+    def first_page(self) -> Optional[PdfPage]:
+        return PlumberPage(self.pdf.pages[0]) if self.pdf.pages else None
+
+    def close(self) -> None:
+        self.pdf.close()
+
+
+# Символ: (x0, top, x1, bottom, текст)
+_Char = Tuple[float, float, float, float, str]
+
+
+def _cluster(values: List[float], tolerance: float) -> Dict[float, float]:
+    """
+    Группирует близкие значения (соседние отличаются не больше чем на
+    tolerance) и возвращает для каждого значения среднее его группы
+    """
+    result: Dict[float, float] = {}
+    group: List[float] = []
+    for value in sorted(set(values)):
+        if group and value - group[-1] > tolerance:
+            mean = sum(group) / len(group)
+            result.update((v, mean) for v in group)
+            group = []
+        group.append(value)
+    if group:
+        mean = sum(group) / len(group)
+        result.update((v, mean) for v in group)
+    return result
+
+
+def _text_lines(chars: List[_Char]) -> List[List[Word]]:
+    """Слова по строкам: строки по близости верха, слова по промежуткам"""
+    tops = _cluster([char[1] for char in chars], Y_TOLERANCE)
+    rows: Dict[float, List[_Char]] = defaultdict(list)
+    for char in chars:
+        rows[tops[char[1]]].append(char)
+
+    lines = []
+    for top in sorted(rows):
+        words: List[Word] = []
+        current: List[_Char] = []
+        for char in sorted(rows[top], key=lambda c: c[0]):
+            if char[4].isspace():
+                if current:
+                    words.append(_word(current))
+                    current = []
+                continue
+            if current and char[0] > current[-1][2] + X_TOLERANCE:
+                words.append(_word(current))
+                current = []
+            current.append(char)
+        if current:
+            words.append(_word(current))
+        lines.append(words)
+    return lines
+
+
+def _word(chars: List[_Char]) -> Word:
+    return (
+        chars[0][0],
+        min(char[1] for char in chars),
+        chars[-1][2],
+        max(char[3] for char in chars),
+        "".join(char[4] for char in chars),
+    )
+
+
+def _join_lines(lines: List[List[Word]]) -> str:
+    return "\n".join(" ".join(word[4] for word in line) for line in lines)
+
+
+class MinerPage(PdfPage):
+    """
+    Страница pdfminer без анализа разметки. Таблицы ищет pdfplumber,
+    открывая тот же файл, только если они понадобились
+    """
+
+    def __init__(self, page_obj, file: Union[str, IO[bytes]]) -> None:
+        self.page_obj = page_obj
+        self.file = file
+        self._chars: List[_Char] = []
+        self._lines: List[List[Word]] = []
+        self._tables = None
+
+    def analyze(self) -> None:
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+
+        manager = PDFResourceManager()
+        device = PDFPageAggregator(manager, laparams=None)
+        PDFPageInterpreter(manager, device).process_page(self.page_obj)
+        layout = device.get_result()
+        self._height = layout.y1
+        self._collect(layout)
+        device.close()
+
+        self._lines = _text_lines(self._chars)
+        self.text = _join_lines(self._lines)
+        self.lines = self.text.split("\n")
+
+    def _collect(self, container) -> None:
+        from pdfminer.layout import LTChar, LTContainer, LTCurve, LTRect
+
+        for item in container:
+            if isinstance(item, LTContainer):
+                # Вложенные объекты форм
+                self._collect(item)
+                continue
+            self.object_count += 1
+            top, bottom = self._height - item.y1, self._height - item.y0
+            if isinstance(item, LTChar):
+                self._chars.append(
+                    (item.x0, top, item.x1, bottom, item.get_text())
+                )
+            elif isinstance(item, LTRect):
+                self.grid_lines += 1
+            elif isinstance(item, LTCurve):
+                # Прямые линии (LTLine - частный случай LTCurve)
+                if item.height < 1 or item.width < 1:
+                    self.grid_lines += 1
+
+    @property
+    def words(self) -> List[Word]:
+        return [word for line in self._lines for word in line]
+
+    @property
+    def word_lines(self) -> List[List[Word]]:
+        return self._lines
+
+    @property
+    def tables(self) -> list:
+        if self._tables is None:
+            import pdfplumber
+
+            if not isinstance(self.file, str):
+                self.file.seek(0)
+            with pdfplumber.open(self.file, pages=[1]) as pdf:
+                self._tables = PlumberPage(pdf.pages[0]).tables
+        return self._tables
+
+    def close(self) -> None:
+        self._chars, self._lines, self._tables = [], [], None
+
+
+class MinerDocument(PdfDocument):
+    @staticmethod
+    def warm_up() -> None:
+        import pdfminer.pdfinterp  # noqa: F401
+
+    def __init__(self, file: Union[str, IO[bytes]]) -> None:
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfparser import PDFParser
+
+        self.file = file
+        self._file = open(file, "rb") if isinstance(file, str) else None
+        try:
+            self.document = PDFDocument(PDFParser(self._file or file))
+        except Exception:
+            self.close()
+            raise
+
+    def first_page(self) -> Optional[PdfPage]:
+        from pdfminer.pdfpage import PDFPage
+
+        for page_obj in PDFPage.create_pages(self.document):
+            return MinerPage(page_obj, self.file)
+        return None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+# Доступные движки
+PDF_BACKENDS: Dict[str, Type[PdfDocument]] = {
+    "pdfplumber": PlumberDocument,
+    "pdfminer": MinerDocument,
+}
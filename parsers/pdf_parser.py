@@ -1,29 +1,86 @@
-from typing import Any, Dict, Tuple
-
-import pdfplumber
-
-from config.settings import TABLE_FIELDS_MAPPING
+import re
+import zlib
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+from config.settings import (
+    PDF_BACKEND,
+    PDF_CONFIDENCE_THRESHOLD,
+    PDF_KIND_BACKENDS,
+    PDF_MAX_CONTENT_BYTES,
+    PDF_MAX_FILE_SIZE,
+    PDF_MAX_PAGE_OBJECTS,
+    TABLE_FIELDS_MAPPING,
+)
+from models.event_model import (
+    DEFAULT_DEPARTMENT,
+    DEFAULT_VALUES,
+    TOO_LARGE,
+    Event,
+)
+from utils.file_utils import Source, resolve_source, source_name, source_size
+from utils.instrumentation import stage
+from utils.keyword_matcher import KeywordMatcher
 
 from .base_parser import BaseParser
-
-
-def parse_old_pdf_format(text: str) -> Dict[str, Any]:
+from .pdf_backends import PDF_BACKENDS, X_TOLERANCE, PdfPage, Word
+from .sniffer import (
+    GRID_MIN_OPERATORS,
+    OLD_FORMAT_MIN_ITEMS,
+    PDF_OLD,
+    PDF_TEXT,
+    old_format_items,
+)
+
+# Маппинг полей компилируется один раз при импорте модуля
+FIELD_MATCHER = KeywordMatcher(TABLE_FIELDS_MAPPING)
+
+# Строки потока содержимого: литеральные (...) и шестнадцатеричные <...>
+_STRING = re.compile(rb"\((?:[^()\\]|\\.)*\)|<(?!<)[0-9A-Fa-f\s]*>", re.S)
+_SPACES = b" \t\r\n\f\0"
+# Операторы, рисующие прямоугольник или контур
+_PAINT = re.compile(rb"(?<![^\s\]>)])(?:re|[SsfFBb]\*?)(?![^\s\[(<%/])")
+
+# Стратегии извлечения данных PDF в порядке возрастания стоимости
+STRATEGY_OLD = "old"
+STRATEGY_WORDS = "words"
+STRATEGY_TABLES = "tables"
+
+# Промежуток между словами строки (в высотах строки), начиная с которого
+# слова относятся к разным колонкам формы
+COLUMN_GAP = 2
+
+
+def confidence(event: Event) -> float:
+    """
+    Доля полей TABLE_FIELDS_MAPPING, заполненных при разборе (значения
+    по умолчанию не учитываются)
+    """
+    filled = sum(
+        1
+        for label in TABLE_FIELDS_MAPPING
+        if event[label] and event[label] != DEFAULT_VALUES.get(label)
+    )
+    return round(filled / len(TABLE_FIELDS_MAPPING), 3)
+
+
+def _columns(line: List[Word]) -> List[List[Word]]:
+    """Делит строку слов на колонки по широким промежуткам"""
+    columns = [[line[0]]]
+    for previous, word in zip(line, line[1:]):
+        height = previous[3] - previous[1]
+        if word[0] - previous[2] > COLUMN_GAP * height:
+            columns.append([])
+        columns[-1].append(word)
+    return columns
+
+
+def _join_words(words: List[Word]) -> str:
+    return " ".join(word[4] for word in words)
+
+
+def parse_old_pdf_format(text: str) -> Event:
     """Парсинг старых PDF-файлов с нумерованными пунктами"""
-    result = {
-        "Event name": "",
-        "Department": "Молодежный коворкинг А11",  # По умолчанию
-        "Date of event": "",
-        "Date of installation": "",
-        "Order": "",
-        "Participants": "",
-        "Responsible": "",
-        "Event format": "",
-        "Guests of honor": "",
-        "Event level": "",
-        "Schedule": "",
-        "Necessary technical equipment": "",
-        "Training on working with audio equipment": "",
-    }
+    result = Event(department=DEFAULT_DEPARTMENT)  # По умолчанию
 
     # Полный маппинг всех полей старого формата
     field_mapping = {
@@ -93,48 +150,214 @@ def parse_old_pdf_format(text: str) -> Dict[str, Any]:
     return result
 
 
-class PDFParser(BaseParser):
-    def parse(self, file_path: str) -> Tuple[Dict[str, Any], str]:
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                if not pdf.pages:
-                    return {}, "empty_pdf"
+def page_content(page_obj, limit: int) -> Optional[bytes]:
+    """
+    Распакованное содержимое страницы pdfminer или None, если оно больше
+    limit байт. Потоки FlateDecode распаковываются не дальше limit байт,
+    поэтому сжатая «бомба» не загружается в память целиком. Потоки с
+    другими фильтрами учитываются в размере в сжатом виде, а в
+    содержимое не входят.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    size = 0
+    chunks = []
+    for stream in page_obj.contents:
+        stream = resolve1(stream)
+        raw = stream.get_rawdata()
+        if raw is None:
+            # Поток уже распакован
+            data = stream.get_data()
+            size += len(data)
+            chunks.append(data)
+            continue
+        filters = [getattr(f, "name", f) for f, _ in stream.get_filters()]
+        if filters in (["FlateDecode"], ["Fl"]):
+            try:
+                raw = zlib.decompressobj().decompress(raw, limit - size + 1)
+                chunks.append(raw)
+            except zlib.error:
+                pass
+        elif not filters:
+            chunks.append(raw)
+        size += len(raw)
+        if size > limit:
+            return None
+    return b"\n".join(chunks)
+
+
+def count_objects(content: bytes) -> int:
+    """
+    Оценка числа объектов страницы по потоку содержимого до анализа
+    разметки: символы выводимых строк и нарисованные фигуры
+    """
+    objects = len(_PAINT.findall(content))
+    for string in _STRING.findall(content):
+        if string[:1] == b"(":
+            objects += len(string) - 2
+        else:
+            objects += len(string[1:-1].translate(None, _SPACES)) // 2
+    return objects
 
-                first_page = pdf.pages[0]
-                text = first_page.extract_text()
 
-                # Улучшенное определение старого формата
-                if self._is_old_format(text):
-                    return parse_old_pdf_format(text), "old_pdf_format"
+class PDFParser(BaseParser):
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        kind_backends: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        backend - движок чтения PDF по умолчанию, kind_backends - движки
+        для видов файлов по сниффингу (по умолчанию из настроек)
+        """
+        self.backend = backend or PDF_BACKEND
+        self.kind_backends = (
+            PDF_KIND_BACKENDS if kind_backends is None else kind_backends
+        )
+        for name in (self.backend, *self.kind_backends.values()):
+            if name not in PDF_BACKENDS:
+                raise ValueError(f"Unknown PDF backend: {name}")
 
-                # Пробуем распарсить как таблицы
-                tables = first_page.extract_tables()
-                if tables and self._validate_tables(tables):
-                    return self._parse_tables(tables), "pdf_table"
+    def warm_up(self) -> None:
+        for name in {self.backend, *self.kind_backends.values()}:
+            PDF_BACKENDS[name].warm_up()
 
-                # Если не распознано как таблицы, пробуем текст
-                return self._parse_text(text), "pdf_text"
+    def parse(
+        self, source: Source, hint: Optional[str] = None
+    ) -> Tuple[Optional[Event], str]:
+        """
+        Парсит первую страницу PDF
+        hint - вид файла по сниффингу: позволяет пропустить определение
+        старого формата (pdf-old-numbered) и поиск таблиц (pdf-text)
+        Файлы сверх лимитов PDF_MAX_* возвращаются пустой записью с типом
+        too_large
+        """
+        try:
+            if source_size(source) > PDF_MAX_FILE_SIZE:
+                event, doc_type = Event(), TOO_LARGE
+            else:
+                event, doc_type = self._parse_first_page(
+                    resolve_source(source), hint
+                )
+                if event is None:
+                    return None, doc_type
+
+            event.filename = source_name(source)
+            event.doc_type = doc_type
+            return event, doc_type
 
         except Exception as e:
             print(f"PDF parsing error: {str(e)}")
-            return {}, "error"
-
-    def _is_old_format(self, text: str) -> bool:
-        """Определяет, является ли PDF старым форматом"""
-        if not text:
-            return False
-
-        # Проверяем несколько характерных признаков старого формата
-        lines = text.split("\n")
-
-        # FIXME - не работает, некорректно считывает информацию со старых файлов 
-        old_format_indicators = [
-            any(line.strip().startswith("9.3") for line in lines)
-            for i in range(1, 6)
-        ]
-
-        # Должны быть хотя бы 3 совпадения из 5 возможных
-        return sum(old_format_indicators) >= 3
+            return None, "error"
+
+    def _parse_first_page(
+        self, file: Union[str, IO[bytes]], hint: Optional[str]
+    ) -> Tuple[Optional[Event], str]:
+        # Движок выбирается по виду файла; библиотеки движка загружаются
+        # только при первом разборе PDF
+        backend = PDF_BACKENDS[self.kind_backends.get(hint, self.backend)]
+        with stage("open"):
+            pdf = backend(file)
+        with pdf:
+            page = pdf.first_page()
+            if page is None:
+                return None, "empty_pdf"
+
+            # Лимиты проверяются до анализа разметки - самой дорогой стадии
+            content = page_content(page.page_obj, PDF_MAX_CONTENT_BYTES)
+            if content is None:
+                return Event(), TOO_LARGE
+            if count_objects(content) > PDF_MAX_PAGE_OBJECTS:
+                return Event(), TOO_LARGE
+
+            with stage("layout"):
+                page.analyze()
+            try:
+                return self._parse_layout(page, hint)
+            finally:
+                page.close()
+
+    def _parse_layout(
+        self, layout: PdfPage, hint: Optional[str] = None
+    ) -> Tuple[Event, str]:
+        """
+        Определяет формат страницы и извлекает данные каскадом стратегий:
+        старый образец, затем разбор слов по строкам и колонкам. Следующая
+        стратегия (слова, затем таблицы) выполняется, только если
+        предыдущей заполнено меньше PDF_CONFIDENCE_THRESHOLD полей;
+        выбирается результат с наибольшей оценкой. Стратегия и ее оценка
+        сохраняются в записи (strategy, confidence)
+        """
+        # Сниффер видит номера пунктов только в строках с однобайтовой
+        # кодировкой, поэтому другие подсказки проверяются по тексту страницы
+        is_old_format = hint == PDF_OLD
+        if not is_old_format:
+            with stage("detect"):
+                is_old_format = self._is_old_format(layout.lines)
+        if not is_old_format:
+            return self._parse_new_layout(layout, hint)
+
+        with stage("map"):
+            old = self._scored(
+                parse_old_pdf_format(layout.text), STRATEGY_OLD
+            )
+        if old.confidence >= PDF_CONFIDENCE_THRESHOLD:
+            return old, "old_pdf_format"
+        # Нумерованный текст, не разобранный как старый образец
+        event, doc_type = self._parse_new_layout(layout, hint)
+        if old.confidence > event.confidence:
+            return old, "old_pdf_format"
+        return event, doc_type
+
+    def _parse_new_layout(
+        self, layout: PdfPage, hint: Optional[str] = None
+    ) -> Tuple[Event, str]:
+        """Разбор по словам и, при низкой оценке, по таблицам"""
+        # Дешевая стратегия: слова страницы уже получены анализом
+        with stage("map"):
+            event = self._scored(
+                self._parse_words(layout.word_lines), STRATEGY_WORDS
+            )
+        doc_type = (
+            "pdf_table"
+            if layout.grid_lines >= GRID_MIN_OPERATORS
+            else "pdf_text"
+        )
+        # Поиск таблиц не выполняется для текстовой формы и для страницы
+        # со слишком большим числом объектов (в том числе во вложенных
+        # формах, которые не учитываются оценкой до анализа)
+        if (
+            event.confidence >= PDF_CONFIDENCE_THRESHOLD
+            or hint == PDF_TEXT
+            or layout.object_count > PDF_MAX_PAGE_OBJECTS
+        ):
+            return event, doc_type
+
+        with stage("extract"):
+            tables = layout.tables
+            is_table = bool(tables) and self._validate_tables(tables)
+        if is_table:
+            with stage("map"):
+                table_event = self._scored(
+                    self._parse_tables(tables), STRATEGY_TABLES
+                )
+            if table_event.confidence >= event.confidence:
+                return table_event, "pdf_table"
+        return event, doc_type
+
+    @staticmethod
+    def _scored(event: Event, strategy: str) -> Event:
+        event.strategy = strategy
+        event.confidence = confidence(event)
+        return event
+
+    def _is_old_format(self, lines: list) -> bool:
+        """
+        Определяет, является ли PDF старым форматом по строкам текста:
+        строки начинаются с номеров пунктов (|1|, |6.1|, 9.3 ...), и
+        разных номеров не меньше OLD_FORMAT_MIN_ITEMS
+        """
+        return old_format_items(lines) >= OLD_FORMAT_MIN_ITEMS
 
     def _validate_tables(self, tables: list) -> bool:
         """Проверяет, что таблицы соответствуют новому формату"""
@@ -157,11 +380,11 @@ class PDFParser(BaseParser):
             for header in known_headers
         )
 
-    def _parse_tables(self, tables: list) -> Dict[str, Any]:
+    def _parse_tables(self, tables: list) -> Event:
         """
         Парсит данные из таблиц PDF с использованием маппинга из settings.py
         """
-        extracted_data = {key: "" for key in TABLE_FIELDS_MAPPING.keys()}
+        extracted_data = Event()
 
         try:
             # Обработка основной таблицы
@@ -178,13 +401,9 @@ class PDFParser(BaseParser):
                             continue
 
                         # Ищем соответствие в маппинге полей
-                        for field, keywords in TABLE_FIELDS_MAPPING.items():
-                            if any(
-                                keyword in key_part1 or keyword in key_part2
-                                for keyword in keywords
-                            ):
-                                extracted_data[field] = value
-                                break
+                        match = FIELD_MATCHER.find(key_part1, key_part2)
+                        if match:
+                            extracted_data[match[0]] = value
 
             # Обработка дополнительных таблиц (если есть)
             for table in tables[1:]:
@@ -197,11 +416,10 @@ class PDFParser(BaseParser):
                         if not value:
                             continue
 
-                        for field, keywords in TABLE_FIELDS_MAPPING.items():
-                            if not extracted_data[field] and any(
-                                keyword in key_part1 or keyword in key_part2
-                                for keyword in keywords
-                            ):
+                        for field, _ in FIELD_MATCHER.matches(
+                            key_part1, key_part2
+                        ):
+                            if not extracted_data[field]:
                                 extracted_data[field] = value
                                 break
 
@@ -211,35 +429,55 @@ class PDFParser(BaseParser):
             print(f"Error parsing PDF tables: {str(e)}")
             return extracted_data
 
-    def _parse_text(self, text: str) -> Dict[str, Any]:
+    def _parse_words(self, lines: List[List[Word]]) -> Event:
         """
-        Парсит текст PDF, когда не удалось извлечь таблицы
+        Парсит слова страницы по строкам. Строка, разделенная широкими
+        промежутками на колонки, - строка формы: подпись в первых
+        колонках, значение в последней. Строка без колонок разбирается
+        как текст «Подпись: значение». Строки без подписи продолжают
+        значение предыдущего поля (в форме - только слова колонки
+        значения)
         """
-        extracted_data = {key: "" for key in TABLE_FIELDS_MAPPING.keys()}
-
-        if not text:
-            return extracted_data
-
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
+        extracted_data = Event()
         current_field = None
+        value_x = None
 
         for line in lines:
-            # Проверяем, начинается ли строка с известного ключевого слова
-            found_field = None
-            for field, keywords in TABLE_FIELDS_MAPPING.items():
-                if any(line.startswith(keyword) for keyword in keywords):
-                    found_field = field
-                    # Разделяем строку на ключ и значение
-                    for keyword in keywords:
-                        if line.startswith(keyword):
-                            value = line[len(keyword)].strip(":")
-                            extracted_data[field] = value
-                            current_field = field
-                            break
-                    break
-
-            if not found_field and current_field:
-                # Продолжение предыдущего поля
-                extracted_data[current_field] += " " + line
+            if not line:
+                continue
+            columns = _columns(line)
+            if len(columns) > 1:
+                labels = [_join_words(column) for column in columns[:-1]]
+                match = FIELD_MATCHER.find(*labels)
+                if match:
+                    current_field = match[0]
+                    value_x = columns[-1][0][0]
+                    extracted_data[current_field] = self.clean_text(
+                        _join_words(columns[-1])
+                    )
+                    continue
+            text = _join_words(line)
+            match = FIELD_MATCHER.match_prefix(text)
+            if match:
+                current_field, keyword = match
+                value_x = None
+                extracted_data[current_field] = text[len(keyword):].strip(
+                    ": "
+                )
+            elif current_field:
+                if value_x is not None:
+                    # Перенос значения в колонке формы; перенос подписи
+                    # пропускается
+                    line = [
+                        word
+                        for word in line
+                        if word[0] >= value_x - X_TOLERANCE
+                    ]
+                    if not line:
+                        continue
+                    text = _join_words(line)
+                extracted_data[current_field] = self.clean_text(
+                    f"{extracted_data[current_field]} {text}"
+                )
 
         return extracted_data
@@ -0,0 +1,359 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import PARSE_TIMEOUT
+from models.event_model import TIMEOUT, Event
+from utils.file_utils import Source, source_name
+from utils.instrumentation import TRACER
+
+# Парсеры рабочего процесса, создаются один раз при запуске процесса пула
+_worker_parsers: Dict[str, Any] = {}
+
+# Файл задачи - путь (в том числе файла в архиве) или содержимое файла
+ParseResult = Tuple[Source, Optional[Event], str, Optional[str]]
+ParseTask = Tuple[Source, str, Optional[str]]
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Возвращает число рабочих процессов (по умолчанию - число ядер)"""
+    if not workers or workers < 1:
+        return os.cpu_count() or 1
+    return workers
+
+
+def init_worker(
+    parsers: Dict[str, Any], trace: bool = False, warm: bool = False
+) -> None:
+    """
+    Инициализирует парсеры и инструментацию в рабочем процессе пула
+    При warm=True зависимости парсеров загружаются сразу
+    """
+    _worker_parsers.update(parsers)
+    TRACER.enabled = trace
+    # При fork процесс наследует замеры родителя - они уже учтены
+    TRACER.pop_records()
+    if warm:
+        for parser in parsers.values():
+            parser.warm_up()
+
+
+def parse_file(
+    parsers: Dict[str, Any],
+    file: Source,
+    file_type: str,
+    hint: Optional[str] = None,
+) -> ParseResult:
+    """
+    Парсит один файл подходящим парсером
+    Возвращает кортеж (файл, запись заявки, тип документа, ошибка)
+    """
+    with TRACER.file(file if isinstance(file, str) else source_name(file)):
+        try:
+            data, doc_type = parsers[file_type].parse(file, hint)
+            result = file, data, doc_type, None
+        except Exception as e:
+            result = file, None, "error", str(e)
+        data = result[1]
+        TRACER.set_branch(result[2], data.strategy_label() if data else None)
+    return result
+
+
+def _parse_task(task: ParseTask) -> Tuple[ParseResult, list]:
+    """
+    Задача пула: парсинг файла парсерами рабочего процесса.
+    Замеры инструментации возвращаются вместе с результатом.
+    """
+    result = parse_file(_worker_parsers, *task)
+    return result, TRACER.pop_records()
+
+
+def _worker_main(
+    conn: Connection, parsers: Dict[str, Any], trace: bool, warm: bool
+) -> None:
+    """Цикл рабочего процесса: задачи и результаты передаются по каналу"""
+    init_worker(parsers, trace, warm)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        conn.send(_parse_task(task))
+
+
+class _Worker:
+    """Рабочий процесс, его канал и выполняемая задача"""
+
+    __slots__ = ("process", "conn", "task", "future", "deadline")
+
+    def __init__(self, parsers: Dict[str, Any], warm: bool) -> None:
+        self.conn, child_conn = Pipe()
+        self.process = Process(
+            target=_worker_main,
+            args=(child_conn, parsers, TRACER.enabled, warm),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[ParseTask] = None
+        self.future: Optional[Future] = None
+        self.deadline: Optional[float] = None
+
+    def assign(
+        self, task: ParseTask, future: Future, timeout: Optional[float]
+    ) -> None:
+        self.task, self.future = task, future
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.conn.send(task)
+
+    def finish(self, result: ParseResult) -> None:
+        future = self.future
+        self.task = self.future = self.deadline = None
+        future.set_result(result)
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WatchdogPool:
+    """
+    Пул рабочих процессов со сторожем. Каждый файл парсится в отдельном
+    процессе не дольше timeout секунд; зависший или аварийно завершившийся
+    процесс уничтожается и заменяется новым, а файл получает тип timeout
+    или ошибку. Остальные процессы продолжают работу.
+    """
+
+    def __init__(
+        self,
+        parsers: Dict[str, Any],
+        workers: Optional[int] = None,
+        timeout: Optional[float] = PARSE_TIMEOUT,
+        warm: bool = False,
+    ) -> None:
+        self.workers = resolve_workers(workers)
+        self.timeout = timeout
+        self._parsers = parsers
+        self._warm = warm
+        self._queue: Deque[Tuple[ParseTask, Future]] = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Канал для пробуждения диспетчера при новых задачах и закрытии
+        self._wakeup_reader, self._wakeup_writer = Pipe(duplex=False)
+        self._slots = [_Worker(parsers, warm) for _ in range(self.workers)]
+        self._dispatcher = threading.Thread(target=self._run, daemon=True)
+        self._dispatcher.start()
+
+    def __enter__(self) -> "WatchdogPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, task: ParseTask) -> Future:
+        """Ставит задачу (файл, тип файла, вид) в очередь"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pool is closed")
+            self._queue.append((task, future))
+            self._wakeup_writer.send_bytes(b"")
+        return future
+
+    def close(self) -> None:
+        """
+        Останавливает процессы; задачи в очереди отменяются, выполняемые
+        завершаются ошибкой
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup_writer.send_bytes(b"")
+        self._dispatcher.join()
+        for _, future in self._queue:
+            future.cancel()
+        for worker in self._slots:
+            if worker.future is not None:
+                worker.kill()
+                worker.future.set_exception(RuntimeError("Pool is closed"))
+            else:
+                worker.stop()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                self._dispatch()
+
+            busy = [w for w in self._slots if w.future is not None]
+            deadlines = [w.deadline for w in busy if w.deadline is not None]
+            wait_time = None
+            if deadlines:
+                wait_time = max(0.0, min(deadlines) - time.monotonic())
+            ready = wait(
+                [self._wakeup_reader] + [w.conn for w in busy], wait_time
+            )
+
+            if self._wakeup_reader in ready:
+                while self._wakeup_reader.poll():
+                    self._wakeup_reader.recv_bytes()
+            now = time.monotonic()
+            for worker in busy:
+                if worker.conn in ready:
+                    self._collect(worker)
+                elif worker.deadline is not None and now >= worker.deadline:
+                    file = worker.task[0]
+                    event = Event(filename=source_name(file), doc_type=TIMEOUT)
+                    self._replace(worker, (file, event, TIMEOUT, None))
+
+    def _dispatch(self) -> None:
+        for index, worker in enumerate(self._slots):
+            while worker.future is None and self._queue:
+                task, future = self._queue.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    worker.assign(task, future, self.timeout)
+                except OSError:
+                    # Простаивавший процесс завершился: задача достается
+                    # новому процессу
+                    worker.future = None
+                    worker.kill()
+                    worker = self._slots[index] = _Worker(
+                        self._parsers, self._warm
+                    )
+                    worker.assign(task, future, self.timeout)
+
+    def _collect(self, worker: "_Worker") -> None:
+        try:
+            result, records = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join()
+            error = f"Worker crashed with exit code {worker.process.exitcode}"
+            self._replace(worker, (worker.task[0], None, "error", error))
+            return
+        TRACER.records.extend(records)
+        worker.finish(result)
+
+    def _replace(self, worker: "_Worker", result: ParseResult) -> None:
+        """Уничтожает процесс и запускает вместо него новый"""
+        worker.kill()
+        self._slots[self._slots.index(worker)] = _Worker(
+            self._parsers, self._warm
+        )
+        worker.finish(result)
+
+
+def parse_files(
+    parsers: Dict[str, Any],
+    files: List[str],
+    file_type: str,
+    workers: Optional[int] = 1,
+    hints: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = PARSE_TIMEOUT,
+) -> Iterator[ParseResult]:
+    """
+    Парсит файлы в пуле процессов со сторожем (timeout секунд на файл).
+    Без таймаута при workers <= 1 файлы парсятся в текущем процессе.
+    Результаты возвращаются по мере готовности в порядке путей файлов.
+    hints - виды файлов по сниффингу, передаются парсерам.
+    """
+    files = sorted(files)
+    workers = min(resolve_workers(workers), len(files))
+    hints = hints or {}
+    tasks = [(file, file_type, hints.get(file)) for file in files]
+    if not tasks:
+        return
+
+    if workers <= 1 and timeout is None:
+        for task in tasks:
+            yield parse_file(parsers, *task)
+        return
+
+    with WatchdogPool(parsers, workers, timeout) as pool:
+        # Результаты берутся в порядке задач независимо от порядка
+        # завершения: готовые раньше очереди ждут в своих Future
+        futures = [pool.submit(task) for task in tasks]
+        for future in futures:
+            yield future.result()
+
+
+async def parse_file_async(
+    pool: WatchdogPool,
+    file: str,
+    file_type: str,
+    hint: Optional[str] = None,
+) -> ParseResult:
+    """Парсит файл в пуле, не блокируя цикл событий"""
+    import asyncio
+
+    return await asyncio.wrap_future(pool.submit((file, file_type, hint)))
+
+
+class WorkerPool:
+    """
+    Пул заранее запущенных процессов с загруженными зависимостями
+    парсеров для долгоживущих сервисов. Число принятых, но не завершенных
+    задач ограничено: workers выполняются, queue_limit ждут в очереди.
+    """
+
+    def __init__(
+        self,
+        parsers: Dict[str, Any],
+        workers: Optional[int] = None,
+        queue_limit: int = 0,
+        timeout: Optional[float] = PARSE_TIMEOUT,
+    ) -> None:
+        self._pool = WatchdogPool(parsers, workers, timeout, warm=True)
+        self.workers = self._pool.workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_limit
+
+    def submit(self, tasks: List[ParseTask]) -> Optional[List[Future]]:
+        """
+        Ставит задачи (файл, тип файла, вид) в очередь целиком.
+        Возвращает None, если очередь переполнена.
+        """
+        with self._lock:
+            if self.pending + len(tasks) > self.capacity:
+                return None
+            self.pending += len(tasks)
+        futures = [self._pool.submit(task) for task in tasks]
+        for future in futures:
+            future.add_done_callback(self._task_done)
+        return futures
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _task_done(self, _: Future) -> None:
+        with self._lock:
+            self.pending -= 1
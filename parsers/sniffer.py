@@ -0,0 +1,378 @@
+"""
+Быстрое определение формата файла без полного разбора.
+DOCX: сигнатура zip, центральный каталог и начало основного документа до
+первой ячейки первой таблицы. PDF: заголовок, маркер конца файла и
+содержимое первой страницы из начала файла.
+"""
+import os
+import re
+import zipfile
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from config.settings import SNIFF_MAX_BYTES
+from utils.file_utils import Source, open_source
+
+from .docx_xml import W, _cell_text, _document_part
+from .layout import LAYOUTS
+
+DOCX_NEW = "docx-new"
+DOCX_OLD = "docx-old"
+PDF_TABLE = "pdf-table"
+PDF_TEXT = "pdf-text"
+PDF_OLD = "pdf-old-numbered"
+# PDF, вид которого не удалось определить по началу файла
+PDF_UNKNOWN = "pdf"
+UNSUPPORTED = "unsupported"
+CORRUPT = "corrupt"
+
+# Тип парсера для каждого вида; None - файл не парсится
+KIND_FILE_TYPES: Dict[str, Optional[str]] = {
+    DOCX_NEW: "docx",
+    DOCX_OLD: "docx",
+    PDF_TABLE: "pdf",
+    PDF_TEXT: "pdf",
+    PDF_OLD: "pdf",
+    PDF_UNKNOWN: "pdf",
+    UNSUPPORTED: None,
+    CORRUPT: None,
+}
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+PDF_MAGIC = b"%PDF-"
+
+# Минимальное число линий и прямоугольников, образующих сетку таблицы
+GRID_MIN_OPERATORS = 4
+
+# Условия шаблона new (config.templates) на первую ячейку первой таблицы:
+# по ним DOCX нового образца отличается от остальных
+_NEW_FIRST_CELL = [
+    text for cell, text in LAYOUTS["new"].detect if cell == (0, 0, 0)
+]
+
+# Номер пункта заявки старого образца в начале строки: в ячейке
+# таблицы ("|6.1|Телевизоры...") или подпункт бланка без разделителей
+# ("9.3 Дополнительные..."). Обычная нумерация ("1. Открытие") не подходит
+_OLD_ITEM = re.compile(r"\|\s*(\d(?:\.\d)?)\s*\|")
+_OLD_SUBITEM = re.compile(r"(\d\.\d)\.?(?:\s|$)")
+# Подпункты, которые есть только в бланке старого образца
+OLD_FORMAT_SUBITEMS = frozenset(("6.1", "6.2", "6.3", "9.1", "9.2", "9.3"))
+# Сколько разных пунктов должно найтись в заявке старого образца
+OLD_FORMAT_MIN_ITEMS = 3
+
+_OBJECT = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+_PAGE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_CONTENTS = re.compile(rb"/Contents\s*(?:(\d+)\s+\d+\s+R|\[([^\]]*)\])")
+_REFERENCE = re.compile(rb"(\d+)\s+\d+\s+R")
+_FILTER = re.compile(rb"/Filter\s*\[?\s*/(\w+)")
+_TOKEN = re.compile(
+    rb"\(|<(?!<)|\[|\]|%[^\r\n]*|/[^\s/\[\]()<>{}%]*"
+    rb"|[A-Za-z'\"][A-Za-z0-9*'\"]*"
+)
+_LITERAL_ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+}
+
+
+def sniff(source: Source) -> str:
+    """
+    Определяет вид файла по его содержимому. source - путь (в том числе
+    файла в ZIP-архиве), содержимое файла или открытый двоичный файл
+    """
+    try:
+        with open_source(source) as f:
+            head = f.read(1024)
+            f.seek(0)
+            if head.startswith(ZIP_MAGIC):
+                return _sniff_docx(f)
+            if PDF_MAGIC in head:
+                return _sniff_pdf(f)
+    except Exception:
+        # Любая ошибка чтения (зашифрованная или сжатая неподдерживаемым
+        # методом часть архива и т.п.) относится только к этому файлу
+        return CORRUPT
+    if head.startswith(OLE_MAGIC):
+        # Документ Word 97-2003
+        return UNSUPPORTED
+    return CORRUPT
+
+
+def sniff_files(files: Iterable[str]) -> Dict[str, str]:
+    """Виды файлов: {путь: вид}"""
+    return {file: sniff(file) for file in files}
+
+
+def route_files(kinds: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Распределяет файлы по парсерам согласно виду, а не расширению.
+    Неподдерживаемые и поврежденные файлы пропускаются.
+    """
+    routes: Dict[str, List[str]] = {"pdf": [], "docx": []}
+    for file, kind in sorted(kinds.items()):
+        file_type = KIND_FILE_TYPES[kind]
+        if file_type is None:
+            print(f"Пропущен файл {file}: {kind}")
+            continue
+        routes[file_type].append(file)
+    return routes
+
+
+def old_format_items(lines: Iterable[str]) -> int:
+    """Число разных номеров пунктов старого образца в начале строк"""
+    items = set()
+    for line in lines:
+        line = line.strip()
+        match = _OLD_ITEM.match(line)
+        if match:
+            items.add(match.group(1))
+            continue
+        match = _OLD_SUBITEM.match(line)
+        if match and match.group(1) in OLD_FORMAT_SUBITEMS:
+            items.add(match.group(1))
+    return len(items)
+
+
+def print_inventory(kinds: Dict[str, str]) -> None:
+    """Выводит распределение файлов по видам"""
+    counts = Counter(kinds.values())
+    print(f"Всего файлов: {len(kinds)}")
+    for kind in KIND_FILE_TYPES:
+        if counts[kind]:
+            print(f"  {kind}: {counts[kind]}")
+    for file, kind in sorted(kinds.items()):
+        if KIND_FILE_TYPES[kind] is None:
+            print(f"  {kind}: {file}")
+
+
+def _sniff_docx(f) -> str:
+    try:
+        with zipfile.ZipFile(f) as package:
+            part = _document_part(package)
+            if part not in package.NameToInfo:
+                # Другой формат OOXML/ODF или произвольный архив
+                return UNSUPPORTED
+            with package.open(part) as stream:
+                first_cell = _first_cell_text(stream)
+    except (zipfile.BadZipFile, ET.ParseError, zlib.error, EOFError):
+        return CORRUPT
+    if (
+        first_cell is not None
+        and _NEW_FIRST_CELL
+        and all(text in first_cell for text in _NEW_FIRST_CELL)
+    ):
+        return DOCX_NEW
+    return DOCX_OLD
+
+
+def _first_cell_text(stream) -> Optional[str]:
+    """
+    Текст первой ячейки первой таблицы верхнего уровня.
+    Читается не больше SNIFF_MAX_BYTES распакованного XML.
+    """
+    parser = ET.XMLPullParser(("start", "end"))
+    stack: List[ET.Element] = []
+    remaining = SNIFF_MAX_BYTES
+    while remaining > 0:
+        chunk = stream.read(min(remaining, 16 * 1024))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            # Путь document/body/tbl/tr/tc
+            if (
+                element.tag == f"{W}tc"
+                and len(stack) == 4
+                and stack[1].tag == f"{W}body"
+            ):
+                return _cell_text(element)
+            if len(stack) == 2:
+                stack[-1].remove(element)
+    return None
+
+
+def _sniff_pdf(f) -> str:
+    size = f.seek(0, os.SEEK_END)
+    f.seek(max(0, size - 2048))
+    if b"%%EOF" not in f.read() and not _has_eof_marker(f):
+        # Файл обрезан: таблица перекрестных ссылок не дописана
+        return CORRUPT
+    f.seek(0)
+    content = _first_page_content(f.read(SNIFF_MAX_BYTES))
+    if content is None:
+        return PDF_UNKNOWN
+
+    texts, operators = _scan_content(content)
+    lines = (text.decode("latin-1") for text in texts)
+    if old_format_items(lines) >= OLD_FORMAT_MIN_ITEMS:
+        return PDF_OLD
+    if operators["re"] + operators["l"] >= GRID_MIN_OPERATORS:
+        return PDF_TABLE
+    if operators["Do"]:
+        # Сетка может быть нарисована во вложенном объекте формы
+        return PDF_UNKNOWN
+    return PDF_TEXT
+
+
+def _has_eof_marker(f, chunk_size: int = 1 << 20) -> bool:
+    """
+    Ищет маркер конца файла во всем файле: после него могут быть
+    дописаны посторонние байты, которые не мешают разбору
+    """
+    f.seek(0)
+    tail = b""
+    for chunk in iter(lambda: f.read(chunk_size), b""):
+        if b"%%EOF" in tail + chunk:
+            return True
+        tail = chunk[-4:]
+    return False
+
+
+def _first_page_content(data: bytes) -> Optional[bytes]:
+    """
+    Содержимое первой встреченной в файле страницы.
+    None, если страница или ее потоки не найдены в прочитанном начале
+    файла (например, в сжатых потоках объектов) или не распаковываются.
+    """
+    objects = {
+        int(match.group(1)): match.end() for match in _OBJECT.finditer(data)
+    }
+    for start in objects.values():
+        end = data.find(b"endobj", start)
+        header = data[start:end if end != -1 else len(data)]
+        header = header.split(b"stream", 1)[0]
+        if not _PAGE.search(header):
+            continue
+        contents = _CONTENTS.search(header)
+        if contents is None:
+            return None
+        if contents.group(1):
+            ids = [int(contents.group(1))]
+        else:
+            ids = [int(i) for i in _REFERENCE.findall(contents.group(2))]
+
+        parts = []
+        for object_id in ids:
+            if object_id not in objects:
+                return None
+            part = _read_stream(data, objects[object_id])
+            if part is None:
+                return None
+            parts.append(part)
+        return b"\n".join(parts)
+    return None
+
+
+def _read_stream(data: bytes, start: int) -> Optional[bytes]:
+    keyword = data.find(b"stream", start)
+    if keyword == -1:
+        return None
+    header = data[start:keyword]
+    body = keyword + len(b"stream")
+    if data[body:body + 2] == b"\r\n":
+        body += 2
+    elif data[body:body + 1] in (b"\n", b"\r"):
+        body += 1
+    end = data.find(b"endstream", body)
+    raw = data[body:end if end != -1 else len(data)]
+
+    filters = _FILTER.findall(header)
+    if not filters:
+        return raw
+    if filters != [b"FlateDecode"]:
+        return None
+    try:
+        return zlib.decompressobj().decompress(raw, SNIFF_MAX_BYTES)
+    except zlib.error:
+        return None
+
+
+def _scan_content(content: bytes) -> Tuple[List[bytes], Counter]:
+    """
+    Строки текста и число операторов потока содержимого.
+    Строки одного массива TJ склеиваются.
+    """
+    texts: List[bytes] = []
+    operators: Counter = Counter()
+    array: Optional[List[bytes]] = None
+    position = 0
+    while True:
+        match = _TOKEN.search(content, position)
+        if match is None:
+            break
+        token = match.group()
+        position = match.end()
+        if token == b"(" or token == b"<":
+            if token == b"(":
+                text, position = _read_literal(content, position)
+            else:
+                end = content.find(b">", position)
+                end = end if end != -1 else len(content)
+                text = _decode_hex(content[position:end])
+                position = end + 1
+            if array is not None:
+                array.append(text)
+            else:
+                texts.append(text)
+        elif token == b"[":
+            array = []
+        elif token == b"]":
+            if array is not None:
+                texts.append(b"".join(array))
+            array = None
+        elif token[:1] not in (b"%", b"/"):
+            operators[token.decode("latin-1")] += 1
+    return texts, operators
+
+
+def _read_literal(content: bytes, position: int) -> Tuple[bytes, int]:
+    """Читает строку (...) с учетом вложенных скобок и экранирования"""
+    result = bytearray()
+    depth = 1
+    length = len(content)
+    while position < length:
+        byte = content[position]
+        position += 1
+        if byte == 0x5C:  # обратная косая черта
+            if position >= length:
+                break
+            escaped = content[position]
+            position += 1
+            if 0x30 <= escaped <= 0x37:
+                digits = content[position - 1:position + 2]
+                octal = re.match(rb"[0-7]{1,3}", digits).group()
+                result.append(int(octal, 8) & 0xFF)
+                position += len(octal) - 1
+            elif escaped in (0x0A, 0x0D):
+                # Перенос строки внутри строки
+                if escaped == 0x0D and content[position:position + 1] == b"\n":
+                    position += 1
+            else:
+                result += _LITERAL_ESCAPES.get(escaped, bytes([escaped]))
+            continue
+        if byte == 0x28:
+            depth += 1
+        elif byte == 0x29:
+            depth -= 1
+            if depth == 0:
+                break
+        result.append(byte)
+    return bytes(result), position
+
+
+def _decode_hex(data: bytes) -> bytes:
+    digits = re.sub(rb"[^0-9A-Fa-f]", b"", data)
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii"))
@@ -5,10 +5,65 @@ from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 import pdfplumber
-import xlsxwriter
-
 from docx import Document
 
+from models.event_model import Event
+from parsers.layout import LAYOUTS, detect_layout
+from utils.keyword_matcher import KeywordMatcher
+from utils.sinks import XlsxSink
+
+# Ключевые фразы таблиц PDF: основные данные, формат мероприятия
+# и техническое оснащение. Компилируются один раз при импорте.
+MAIN_TABLE_MATCHER = KeywordMatcher(
+    {
+        "Event name": ["Название мероприятия"],
+        "Department": ["Организатор"],
+        "Date of event": ["Даты проведения мероприятия"],
+        "Date of installation": ["Даты монтажа", "подготовки площадки"],
+        "Order": ["Приказ об организации"],
+        "Participants": ["Количество участников", "контингент"],
+        "Responsible": ["Ответственный за проведение"],
+    }
+)
+FORMAT_TABLE_MATCHER = KeywordMatcher(
+    {
+        "Event format": ["Формат мероприятия"],
+        "Guests of honor": ["Почетные гости", "ведущие мероприятия"],
+        "Event level": ["Уровень мероприятия"],
+        "Schedule": ["Расписание", "разбивка по времени"],
+    }
+)
+EQUIPMENT_TABLE_MATCHER = KeywordMatcher(
+    {
+        "Necessary technical equipment": [
+            "Необходимое техническое оснащение"
+        ],
+        "Training on working with audio equipment": [
+            "Обучение работе",
+            "звуковом оборудовании",
+        ],
+    }
+)
+
+# Словарь для поиска ключевых фраз в тексте
+TEXT_MATCHER = KeywordMatcher.from_phrases(
+    {
+        "Название мероприятия": "Event name",
+        "Организатор": "Department",
+        "Даты проведения мероприятия": "Date of event",
+        "Даты монтажа": "Date of installation",
+        "Приказ об организации": "Order",
+        "Количество участников": "Participants",
+        "Ответственный за проведение": "Responsible",
+        "Формат мероприятия": "Event format",
+        "Почетные гости": "Guests of honor",
+        "Уровень мероприятия": "Event level",
+        "Расписание": "Schedule",
+        "Необходимое техническое оснащение": "Necessary technical equipment",
+        "Обучение работе": "Training on working with audio equipment",
+    }
+)
+
 
 def clear(output_xlsx: str, output_json: str) -> None:
     """
@@ -50,12 +105,7 @@ def determine_document_type(doc: Document) -> str:
     """
     Определяет, является ли документ новым или старым по его структуре.
     """
-    tables = doc.tables
-    if len(tables) >= 3 and (
-        "Название мероприятия" in tables[0].rows[0].cells[0].text
-    ):
-        return "new"
-    return "old"
+    return detect_layout(doc.tables)
 
 
 def parse_first_page_tables(doc_path: str) -> Tuple[Dict[str, Any], str]:
@@ -66,64 +116,14 @@ def parse_first_page_tables(doc_path: str) -> Tuple[Dict[str, Any], str]:
     doc_type = determine_document_type(doc)
     tables = doc.tables[:3]  # Берем только первые три таблицы
 
-    extracted_data = {
-        "Event name": "",
-        "Department": "",
-        "Date of event": "",
-        "Date of installation": "",
-        "Order": "",
-        "Participants": "",
-        "Responsible": "",
-        "Event format": "",
-        "Guests of honor": "",
-        "Event level": "",
-        "Schedule": "",
-        "Necessary technical equipment": "",
-        "Training on working with audio equipment": "",
-    }
+    extracted_data = Event()
 
     try:
-        if doc_type == "new" and len(tables) >= 3:
-            for key, row, col in [
-                ("Event name", 0, 1),
-                ("Department", 1, 1),
-                ("Date of event", 2, 1),
-                ("Date of installation", 3, 1),
-                ("Order", 4, 1),
-                ("Participants", 5, 1),
-                ("Responsible", 6, 1),
-                ("Event format", 7, 1),
-                ("Guests of honor", 8, 1),
-                ("Event level", 9, 1),
-                ("Schedule", 10, 1),
-                ("Necessary technical equipment", 14, 1),
-                ("Training on working with audio equipment", 15, 1),
-            ]:
-                extracted_data[key] = (
-                    tables[row // 7].rows[row % 7].cells[col].text.strip()
-                )
-        elif doc_type == "old":
-            for key, row, col in [
-                ("Event name", 4, 2),
-                ("Department", 0, 2),
-                ("Date of event", 1, 2),
-                ("Event format", 2, 2),
-                ("Participants", 3, 2),
-                ("Schedule", 4, 2),
-            ]:
-                extracted_data[key] = (
-                    tables[row // 6].rows[row % 6].cells[col].text.strip()
-                )
-                extracted_data["Necessary technical equipment"] = (
-                    tables[0].rows[8].cells[2].text.strip()
-                    + ", "
-                    + tables[0].rows[5].cells[2].text.strip()
-                )
-
+        LAYOUTS[doc_type].fill(extracted_data, tables)
     except Exception as e:
         print(f"error with {doc_path} file: {str(e)}")
 
-    return extracted_data, doc_type
+    return extracted_data.to_dict(), doc_type
 
 
 def parse_pdf_table_data(tables):
@@ -148,9 +148,15 @@ def parse_pdf_table_data(tables):
     }
 
     try:
-        # Обработка первой таблицы (основные данные)
-        if len(tables) > 0:
-            for row in tables[0]:
+        # Таблицы: основные данные, формат мероприятия, тех. оснащение
+        for index, matcher in (
+            (0, MAIN_TABLE_MATCHER),
+            (2, FORMAT_TABLE_MATCHER),
+            (4, EQUIPMENT_TABLE_MATCHER),
+        ):
+            if len(tables) <= index:
+                continue
+            for row in tables[index]:
                 if len(row) >= 4:
                     key = clean_text(row[0] or row[1] or "")
                     value = clean_text(row[3] or "")
@@ -158,61 +164,9 @@ def parse_pdf_table_data(tables):
                     if not key or not value:
                         continue
 
-                    if "Название мероприятия" in key:
-                        extracted_data["Event name"] = value
-                    elif "Организатор" in key:
-                        extracted_data["Department"] = value
-                    elif "Даты проведения мероприятия" in key:
-                        extracted_data["Date of event"] = value
-                    elif "Даты монтажа" in key or "подготовки площадки" in key:
-                        extracted_data["Date of installation"] = value
-                    elif "Приказ об организации" in key:
-                        extracted_data["Order"] = value
-                    elif "Количество участников" in key or "контингент" in key:
-                        extracted_data["Participants"] = value
-                    elif "Ответственный за проведение" in key:
-                        extracted_data["Responsible"] = value
-
-        # Обработка второй таблицы (формат мероприятия)
-        if len(tables) > 2:
-            for row in tables[2]:
-                if len(row) >= 4:
-                    key = clean_text(row[0] or row[1] or "")
-                    value = clean_text(row[3] or "")
-
-                    if not key or not value:
-                        continue
-
-                    if "Формат мероприятия" in key:
-                        extracted_data["Event format"] = value
-                    elif (
-                        "Почетные гости" in key or "ведущие мероприятия" in key
-                    ):
-                        extracted_data["Guests of honor"] = value
-                    elif "Уровень мероприятия" in key:
-                        extracted_data["Event level"] = value
-                    elif "Расписание" in key or "разбивка по времени" in key:
-                        extracted_data["Schedule"] = value
-
-        # Обработка третьей таблицы (техническое оснащение)
-        if len(tables) > 4:
-            for row in tables[4]:
-                if len(row) >= 4:
-                    key = clean_text(row[0] or row[1] or "")
-                    value = clean_text(row[3] or "")
-
-                    if not key or not value:
-                        continue
-
-                    if "Необходимое техническое оснащение" in key:
-                        extracted_data["Necessary technical equipment"] = value
-                    elif (
-                        "Обучение работе" in key
-                        or "звуковом оборудовании" in key
-                    ):
-                        extracted_data[
-                            "Training on working with audio equipment"
-                        ] = value
+                    match = matcher.find(key)
+                    if match:
+                        extracted_data[match[0]] = value
 
         return extracted_data
 
@@ -244,38 +198,16 @@ def parse_pdf_from_text(text: str) -> Tuple[Dict[str, Any], str]:
     # Разбиваем текст на строки
     lines = [line.strip() for line in text.split("\n") if line.strip()]
 
-    # Словарь для поиска ключевых фраз
-    key_phrases = {
-        "Название мероприятия": "Event name",
-        "Организатор": "Department",
-        "Даты проведения мероприятия": "Date of event",
-        "Даты монтажа": "Date of installation",
-        "Приказ об организации": "Order",
-        "Количество участников": "Participants",
-        "Ответственный за проведение": "Responsible",
-        "Формат мероприятия": "Event format",
-        "Почетные гости": "Guests of honor",
-        "Уровень мероприятия": "Event level",
-        "Расписание": "Schedule",
-        "Необходимое техническое оснащение": "Necessary technical equipment",
-        "Обучение работе": "Training on working with audio equipment",
-    }
-
     current_key = None
     collected_data = {}
 
     for line in lines:
         # Проверяем, содержит ли строка ключевую фразу
         found_key = None
-        for phrase, field in key_phrases.items():
-            if phrase in line:
-                found_key = field
-                parts = line.split(phrase, 1)
-                if len(parts) > 1:
-                    collected_data[field] = parts[1].strip()
-                else:
-                    collected_data[field] = ""
-                break
+        match = TEXT_MATCHER.find(line)
+        if match:
+            found_key, phrase = match
+            collected_data[found_key] = line.split(phrase, 1)[1].strip()
 
         if found_key:
             current_key = found_key
@@ -396,17 +328,9 @@ def main() -> None:
 
 def save_to_excel(data, filename):
     """Сохранение с настройкой ширины столбцов"""
-    df = pd.DataFrame([data])
-    writer = pd.ExcelWriter(filename, engine="xlsxwriter")
-    df.to_excel(writer, index=False)
-
-    worksheet = writer.sheets["Sheet1"]
-    for i, col in enumerate(df.columns):
-        # Автоподбор ширины столбца
-        max_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
-        worksheet.set_column(i, i, max_len)
-
-    writer.close()
+    # Ширина столбцов подбирается по мере записи строк
+    with XlsxSink(filename, columns=list(data)) as sink:
+        sink.write_row(list(data.values()))
 
 
 if __name__ == "__main__":
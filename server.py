@@ -0,0 +1,242 @@
+"""
+Локальный HTTP-сервис парсинга заявок.
+
+    python server.py [--host 127.0.0.1] [--port 8765] [--workers N]
+
+POST /parse  - тело запроса: файл DOCX/PDF (имя в параметре ?filename=)
+               или JSON {"path": "путь к файлу"}; файл в ZIP-архиве задается
+               путем вида "архив.zip!файл"
+POST /batch  - JSON {"paths": [...]}, результаты в порядке путей
+GET  /health - состояние пула и очереди
+
+Ответ на файл: {"filename", "doc_type", "data", "error"}.
+"""
+import argparse
+import json
+import os
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from config.settings import (
+    PARSE_WORKERS,
+    SERVER_HOST,
+    SERVER_MAX_UPLOAD_BYTES,
+    SERVER_PORT,
+    SERVER_QUEUE_LIMIT,
+    SERVER_RETRY_AFTER,
+    SERVER_TIMEOUT,
+)
+from parsers.docx_parser import DocxParser
+from parsers.pdf_parser import PDFParser
+from parsers.pool import TIMEOUT, WorkerPool
+from parsers.sniffer import KIND_FILE_TYPES, sniff
+from utils.file_utils import Source, source_exists, source_name
+
+
+class ServiceError(Exception):
+    """Ошибка запроса с HTTP-статусом ответа"""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ParseServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        pool: WorkerPool,
+        max_upload: int = SERVER_MAX_UPLOAD_BYTES,
+    ) -> None:
+        super().__init__(address, ParseRequestHandler)
+        self.pool = pool
+        self.max_upload = max_upload
+
+    def parse(
+        self, files: List[Tuple[Source, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Парсит файлы [(путь или содержимое, имя для ответа)] в пуле.
+        Содержимое загруженных файлов передается процессам пула в памяти.
+        Бросает ServiceError, если очередь пула переполнена.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        tasks, positions = [], []
+        for position, (source, name) in enumerate(files):
+            found = not isinstance(source, str) or source_exists(source)
+            kind = sniff(source) if found else None
+            file_type = KIND_FILE_TYPES.get(kind)
+            if file_type is None:
+                error = kind or "not found"
+                results[position] = _response(name, None, "error", error)
+                continue
+            tasks.append((source, file_type, kind))
+            positions.append(position)
+
+        if len(tasks) > self.pool.capacity:
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Batch is larger than queue capacity {self.pool.capacity}",
+            )
+        pending = self.pool.submit(tasks) if tasks else []
+        if pending is None:
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "Queue is full")
+
+        # Зависший разбор прерывается сторожем пула через SERVER_TIMEOUT
+        for position, future in zip(positions, pending):
+            _, data, doc_type, error = future.result()
+            results[position] = _response(
+                files[position][1], data, doc_type, error
+            )
+        return results
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "workers": self.pool.workers,
+            "pending": self.pool.pending,
+            "capacity": self.pool.capacity,
+        }
+
+
+def _response(
+    name: str, data: Any, doc_type: str, error: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "filename": name,
+        "doc_type": doc_type,
+        "data": data.to_dict() if data else None,
+        "error": error,
+    }
+
+
+class ParseRequestHandler(BaseHTTPRequestHandler):
+    server: ParseServer
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path == "/health":
+            self._send_json(HTTPStatus.OK, self.server.health())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        try:
+            if url.path == "/parse":
+                status, body = self._parse(parse_qs(url.query))
+            elif url.path == "/batch":
+                status, body = self._batch()
+            else:
+                raise ServiceError(HTTPStatus.NOT_FOUND, "Not found")
+        except ServiceError as e:
+            status, body = e.status, {"error": str(e)}
+        self._send_json(status, body)
+
+    def _parse(
+        self, query: Dict[str, List[str]]
+    ) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        if self._is_json():
+            path = self._read_json().get("path")
+            if not isinstance(path, str):
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "Expected path")
+            result = self.server.parse([(path, source_name(path))])[0]
+        else:
+            name = os.path.basename(query.get("filename", ["upload"])[0])
+            result = self.server.parse([(self._read_body(), name)])[0]
+
+        if result["doc_type"] == TIMEOUT:
+            return HTTPStatus.GATEWAY_TIMEOUT, result
+        if result["error"] is None:
+            return HTTPStatus.OK, result
+        return HTTPStatus.UNPROCESSABLE_ENTITY, result
+
+    def _batch(self) -> Tuple[HTTPStatus, List[Dict[str, Any]]]:
+        paths = self._read_json().get("paths")
+        if not isinstance(paths, list) or not all(
+            isinstance(path, str) for path in paths
+        ):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Expected paths")
+        files = [(path, source_name(path)) for path in paths]
+        return HTTPStatus.OK, self.server.parse(files)
+
+    def _is_json(self) -> bool:
+        content_type = self.headers.get("Content-Type", "")
+        return content_type.split(";")[0].strip() == "application/json"
+
+    def _read_body(self) -> bytes:
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            raise ServiceError(HTTPStatus.LENGTH_REQUIRED, "Length required")
+        if length > self.server.max_upload:
+            # Тело не читается: соединение закрывается после ответа
+            self.close_connection = True
+            raise ServiceError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "File is too large"
+            )
+        return self.rfile.read(length)
+
+    def _read_json(self) -> Dict[str, Any]:
+        try:
+            body = json.loads(self._read_body())
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Invalid JSON")
+        if not isinstance(body, dict):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Expected object")
+        return body
+
+    def _send_json(self, status: HTTPStatus, body: Any) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.send_header("Retry-After", str(SERVER_RETRY_AFTER))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="HTTP-сервис парсера заявок")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument(
+        "--port", type=int, default=SERVER_PORT, help="0 - любой свободный"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="число рабочих процессов (по умолчанию - число ядер)",
+    )
+    parser.add_argument(
+        "--queue-limit", type=int, default=SERVER_QUEUE_LIMIT
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    parsers = {"pdf": PDFParser(), "docx": DocxParser()}
+    # Процессы запускаются и загружают зависимости до первого запроса
+    pool = WorkerPool(
+        parsers, args.workers, args.queue_limit, timeout=SERVER_TIMEOUT
+    )
+    server = ParseServer((args.host, args.port), pool)
+    host, port = server.server_address[:2]
+    print(f"Сервис запущен на http://{host}:{port} ({pool.workers} процессов)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Общие фикстуры тестов. Модули проекта импортируются из корня
+репозитория, как при запуске main.py.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def corpus(tmp_path_factory):
+    """Синтетический корпус: по 3 заявки каждого вида"""
+    directory = tmp_path_factory.mktemp("corpus")
+    return generate_corpus(str(directory), 3, seed=1)
@@ -0,0 +1,70 @@
+import os
+
+from utils import cache as cache_module
+from utils.cache import PARSER_DEPENDENCIES, ParseCache, code_fingerprint
+
+
+def test_put_and_get(tmp_path):
+    cache = ParseCache(str(tmp_path), 1 << 20)
+    assert cache.get("a") is None
+    cache.put("a", {"Event name": "Форум"}, "new")
+    assert cache.get("a") == ({"Event name": "Форум"}, "new")
+    # Запись переживает перезапуск
+    assert ParseCache(str(tmp_path), 1 << 20).get("a") is not None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path), 1 << 20)
+    data = {"Schedule": "x" * 1000}
+    for number, key in enumerate("abc"):
+        cache.put(key, data, "new")
+        os.utime(cache._path(key), (number, number))
+    # Чтение обновляет отметку использования записи a
+    assert cache.get("a") is not None
+    entry_size = os.path.getsize(cache._path("a"))
+    cache.max_bytes = entry_size * 3
+    cache.put("d", data, "new")
+    # Удаляются самые давние записи, пока размер не станет ниже 90% лимита
+    assert [key for key in "abcd" if cache.get(key)] == ["a", "d"]
+    assert cache.size == 2 * entry_size
+
+
+def test_fingerprint_covers_dependencies(tmp_path):
+    parsers = tmp_path / "parsers"
+    parsers.mkdir()
+    (parsers / "parser.py").write_text("A = 1\n")
+    (parsers / "notes.txt").write_text("-")
+    dependency = tmp_path / "event_model.py"
+    dependency.write_text("B = 1\n")
+
+    def fingerprint():
+        return code_fingerprint(str(parsers), [str(dependency)])
+
+    first = fingerprint()
+    (parsers / "notes.txt").write_text("+")
+    assert fingerprint() == first
+    dependency.write_text("B = 2\n")
+    second = fingerprint()
+    assert second != first
+    (parsers / "parser.py").write_text("A = 2\n")
+    assert fingerprint() != second
+
+
+def test_parser_dependencies_exist():
+    names = {os.path.basename(path) for path in PARSER_DEPENDENCIES}
+    assert names == {"event_model.py", "file_utils.py", "keyword_matcher.py"}
+    assert all(os.path.isfile(path) for path in PARSER_DEPENDENCIES)
+
+
+def test_code_change_invalidates_entries(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path), 1 << 20)
+    cache.put("a", {"Event name": "Форум"}, "new")
+    old_directory = cache.directory
+
+    monkeypatch.setattr(cache_module, "code_fingerprint", lambda: "changed")
+    changed = ParseCache(str(tmp_path), 1 << 20)
+    assert changed.directory != old_directory
+    assert changed.get("a") is None
+    assert changed.size == 0
+    # Записи прежнего кода удаляются с диска
+    assert not os.path.exists(old_directory)
@@ -0,0 +1,110 @@
+import itertools
+import random
+from datetime import datetime
+
+import pytest
+
+from utils.dates import Booking, BookingIndex, event_bookings, parse_intervals
+
+
+def dt(day, month, hour=0, minute=0, year=2025):
+    return datetime(year, month, day, hour, minute)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("05.03.2025", [(dt(5, 3), dt(6, 3))]),
+    ("05.03.25 10:00-12:00", [(dt(5, 3, 10), dt(5, 3, 12))]),
+    ("5 марта 2025 с 10.00 до 12.30", [(dt(5, 3, 10), dt(5, 3, 12, 30))]),
+    ("05-07.03.2025", [(dt(5, 3), dt(8, 3))]),
+    ("с 5 по 6 марта 2025 10:00-11:00", [
+        (dt(5, 3, 10), dt(5, 3, 11)), (dt(6, 3, 10), dt(6, 3, 11)),
+    ]),
+    ("05.03 - 07.03.2025", [(dt(5, 3), dt(8, 3))]),
+    ("10:00-12:00 05.03.2025", [(dt(5, 3, 10), dt(5, 3, 12))]),
+    ("05.03.2025 18:00", [(dt(5, 3, 18), dt(6, 3))]),
+    ("05.03.2025 22:00-02:00", [(dt(5, 3, 22), dt(6, 3, 2))]),
+    ("05.03, 07.03 10.30-11.00", [
+        (dt(5, 3, 10, 30), dt(5, 3, 11)), (dt(7, 3, 10, 30), dt(7, 3, 11)),
+    ]),
+    ("31.02.2025", []),
+    ("", []),
+    ("по согласованию", []),
+])
+def test_parse_intervals(text, expected):
+    assert parse_intervals(text, default_year=2025) == expected
+
+
+def test_year_from_neighbour_date():
+    assert parse_intervals("05.03, 07.03.2026", default_year=2020) == [
+        (dt(5, 3, year=2026), dt(6, 3, year=2026)),
+        (dt(7, 3, year=2026), dt(8, 3, year=2026)),
+    ]
+    assert parse_intervals("05.03", default_year=2020) == [
+        (dt(5, 3, year=2020), dt(6, 3, year=2020)),
+    ]
+
+
+def test_event_bookings_fields():
+    data = {
+        "Date of event": "05.03.2025 10:00-12:00",
+        "Date of installation": "04.03.2025",
+    }
+    assert event_bookings("a.docx", data) == [
+        Booking(dt(5, 3, 10), dt(5, 3, 12), "a.docx", "Date of event"),
+        Booking(dt(4, 3), dt(5, 3), "a.docx", "Date of installation"),
+    ]
+
+
+def booking(filename, start, end):
+    return Booking(dt(1, 3, start), dt(1, 3, end), filename, "Date of event")
+
+
+def test_conflicts_between_files_only():
+    index = BookingIndex([
+        booking("a", 10, 12),
+        booking("a", 11, 13),
+        booking("b", 12, 14),
+        booking("c", 14, 15),
+        booking("d", 9, 10),
+    ])
+    pairs = {
+        tuple(sorted((first.filename, second.filename)))
+        for first, second in index.conflicts()
+    }
+    # Смежные интервалы [9, 10) и [10, 12) не пересекаются
+    assert pairs == {("a", "b")}
+    assert len(index.conflicts()) == 1
+
+
+def test_query_and_conflicts_match_brute_force():
+    rng = random.Random(3)
+    bookings = []
+    for number in range(200):
+        start = rng.randrange(0, 22)
+        end = rng.randrange(start + 1, 23)
+        bookings.append(booking(f"f{number % 50}", start, end))
+    index = BookingIndex(bookings)
+    assert len(index) == len(bookings)
+
+    for start, end in [(0, 1), (5, 6), (10, 20), (22, 23)]:
+        expected = sorted(
+            b for b in bookings
+            if b.start < dt(1, 3, end) and dt(1, 3, start) < b.end
+        )
+        assert index.query(dt(1, 3, start), dt(1, 3, end)) == expected
+
+    expected_pairs = {
+        tuple(sorted(pair))
+        for pair in itertools.combinations(bookings, 2)
+        if pair[0].filename != pair[1].filename
+        and pair[0].start < pair[1].end and pair[1].start < pair[0].end
+    }
+    found = [tuple(sorted(pair)) for pair in index.conflicts()]
+    assert len(found) == len(expected_pairs)
+    assert set(found) == expected_pairs
+
+
+def test_empty_index():
+    index = BookingIndex([])
+    assert index.query(dt(1, 3), dt(2, 3)) == []
+    assert index.conflicts() == []
@@ -0,0 +1,52 @@
+from models.event_model import DEFAULT_DEPARTMENT, TIMEOUT, TOO_LARGE, Event
+from utils.dedupe import find_duplicates, has_parsed_fields, jaccard, shingles
+
+FORUM = dict(
+    name="Молодежный форум проектов",
+    department="Студенческий совет университета",
+    date="05.03.2025 10:00-18:00",
+    responsible="Иванов Иван Иванович",
+    participants="150 студентов и преподавателей",
+    equipment="Проектор, два микрофона, ноутбук",
+)
+
+
+def test_shingles_keep_field_labels():
+    tokens = shingles(Event(name="Форум", department="Форум"))
+    assert tokens == {"Event name:форум", "Department:форум"}
+    assert jaccard(set(), set()) == 1.0
+
+
+def test_near_duplicates_grouped_with_most_complete_first():
+    records = [
+        Event(**FORUM),
+        Event(name="Лекция по истории", department="Кафедра истории"),
+        Event(**FORUM, schedule="Открытие"),
+    ]
+    assert find_duplicates(records) == [[2, 0]]
+
+
+def test_same_content_hash_always_grouped():
+    first = Event(name="Форум", content_hash="h1")
+    second = Event(name="Совсем другая заявка", content_hash="h1")
+    assert find_duplicates([first, Event(name="Лекция"), second]) == [[0, 2]]
+
+
+def test_records_without_parsed_fields_are_not_compared():
+    records = [
+        Event(department=DEFAULT_DEPARTMENT),
+        Event(department=DEFAULT_DEPARTMENT),
+        Event(filename="a.pdf", doc_type=TIMEOUT),
+        Event(filename="b.pdf", doc_type=TIMEOUT),
+        Event(doc_type=TOO_LARGE),
+        Event(),
+    ]
+    assert not any(has_parsed_fields(data) for data in records)
+    assert find_duplicates(records) == []
+
+
+def test_default_values_do_not_count_as_parsed():
+    assert has_parsed_fields(Event(department="Кафедра истории"))
+    assert has_parsed_fields(
+        Event(department=DEFAULT_DEPARTMENT, name="Форум")
+    )
@@ -0,0 +1,26 @@
+import glob
+import os
+
+import pytest
+
+from conftest import ROOT
+from parsers.docx_parser import DocxParser
+
+SAMPLES = sorted(glob.glob(os.path.join(ROOT, "docx", "*.docx")))
+
+
+def _assert_equivalent(files):
+    xml_parser, reference = DocxParser("xml"), DocxParser("python-docx")
+    for file in files:
+        assert xml_parser.parse(file) == reference.parse(file), file
+
+
+@pytest.mark.parametrize("file", SAMPLES, ids=os.path.basename)
+def test_xml_engine_matches_python_docx_on_samples(file):
+    _assert_equivalent([file])
+
+
+def test_xml_engine_matches_python_docx_on_corpus(corpus):
+    files = corpus["docx_new"] + corpus["docx_old"]
+    assert files
+    _assert_equivalent(files)
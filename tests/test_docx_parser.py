@@ -0,0 +1,45 @@
+import pytest
+
+from parsers import docx_parser, layout
+from parsers.docx_parser import DocxParser
+from parsers.layout import compile_template
+from parsers.sniffer import DOCX_NEW, DOCX_OLD, sniff
+
+# Новая редакция бланка старого образца, добавленная только шаблоном
+V3 = {
+    "min_tables": 1,
+    "detect": [{"cell": (0, 0, 1), "contains": "Подразделение"}],
+    "fields": {"Department": (0, 0, 2), "Event name": (0, 4, 2)},
+}
+
+
+@pytest.fixture
+def v3_layouts(monkeypatch):
+    layouts = {
+        "new": layout.LAYOUTS["new"],
+        "v3": compile_template("v3", V3),
+        "old": layout.LAYOUTS["old"],
+    }
+    monkeypatch.setattr(layout, "LAYOUTS", layouts)
+    monkeypatch.setattr(docx_parser, "LAYOUTS", layouts)
+
+
+@pytest.mark.parametrize("engine", ["xml", "python-docx"])
+def test_added_template_detected_with_hint(corpus, v3_layouts, engine):
+    parser = DocxParser(engine)
+    for file in corpus["docx_old"]:
+        assert sniff(file) == DOCX_OLD
+        event, doc_type = parser.parse(file, DOCX_OLD)
+        assert doc_type == "v3"
+        assert (event, doc_type) == parser.parse(file)
+
+
+@pytest.mark.parametrize("kind, hint", [
+    ("docx_new", DOCX_NEW),
+    ("docx_old", DOCX_OLD),
+])
+def test_hint_gives_same_result(corpus, kind, hint):
+    parser = DocxParser()
+    for file in corpus[kind]:
+        assert sniff(file) == hint
+        assert parser.parse(file, hint) == parser.parse(file)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import zipfile
+
+import pytest
+
+from parsers.docx_parser import DocxParser
+from utils import file_utils
+from utils.file_utils import (
+    ArchiveError,
+    file_hash,
+    find_files,
+    open_source,
+    resolve_source,
+    source_size,
+)
+
+
+def make_archive(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        for name, file in members.items():
+            package.write(file, name)
+    return str(path)
+
+
+def encrypt_members(path):
+    """Помечает все файлы архива как зашифрованные"""
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    start = data.find(b"PK\x01\x02")
+    while start >= 0:
+        data[start + 8] |= 1
+        start = data.find(b"PK\x01\x02", start + 4)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_archive_members_read_like_files(corpus, tmp_path):
+    file = corpus["docx_new"][0]
+    archive = make_archive(tmp_path / "a.zip", {"dir/a.docx": file})
+    member = archive + "!dir/a.docx"
+    assert source_size(member) == os.path.getsize(file)
+    assert file_hash(member) == file_hash(file)
+    with open(file, "rb") as f:
+        assert resolve_source(member).read() == f.read()
+
+
+def test_archive_stays_open_until_changed(corpus, tmp_path):
+    archive = make_archive(tmp_path / "a.zip", {
+        "a.docx": corpus["docx_new"][0],
+        "b.pdf": corpus["pdf_table"][0],
+    })
+    with open_source(archive + "!a.docx"):
+        package = file_utils._archives[archive][1]
+    source_size(archive + "!b.pdf")
+    assert file_utils._archives[archive][1] is package
+
+    make_archive(archive, {"a.docx": corpus["docx_old"][0]})
+    os.utime(archive, ns=(0, 0))
+    assert source_size(archive + "!a.docx") == os.path.getsize(
+        corpus["docx_old"][0]
+    )
+    assert file_utils._archives[archive][1] is not package
+    assert package.fp is None
+
+
+def test_encrypted_member_is_error_per_file(corpus, tmp_path):
+    archive = make_archive(tmp_path / "secret.zip", {
+        "a.docx": corpus["docx_new"][0],
+    })
+    encrypt_members(archive)
+    member = archive + "!a.docx"
+    with pytest.raises(ArchiveError):
+        file_hash(member)
+    with pytest.raises(OSError):
+        resolve_source(member)
+    assert DocxParser().parse(member) == (None, "error")
+
+
+def test_missing_member(tmp_path, corpus):
+    archive = make_archive(tmp_path / "a.zip", {
+        "a.docx": corpus["docx_new"][0],
+    })
+    with pytest.raises(ArchiveError):
+        source_size(archive + "!b.docx")
+
+
+def test_find_files_in_archives_any_case(corpus, tmp_path):
+    shutil.copy(corpus["pdf_text"][0], tmp_path / "plain.pdf")
+    upper = make_archive(tmp_path / "UPPER.ZIP", {
+        "x/a.docx": corpus["docx_new"][0],
+        "b.pdf": corpus["pdf_table"][0],
+    })
+    docx_files, pdf_files = find_files(str(tmp_path))
+    assert docx_files == [upper + "!x/a.docx"]
+    assert sorted(pdf_files) == sorted(
+        [upper + "!b.pdf", str(tmp_path / "plain.pdf")]
+    )
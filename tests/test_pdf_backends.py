@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from parsers import pdf_parser
+from parsers.pdf_backends import MinerDocument, PlumberDocument
+from parsers.pdf_parser import PDFParser
+
+
+def first_page_tables(backend, file):
+    with backend(file) as pdf:
+        page = pdf.first_page()
+        page.analyze()
+        try:
+            return page.grid_lines, page.tables
+        finally:
+            page.close()
+
+
+def test_miner_tables_match_plumber(corpus):
+    for file in corpus["pdf_table"]:
+        expected = first_page_tables(PlumberDocument, file)
+        assert expected[1]
+        assert first_page_tables(MinerDocument, file) == expected
+        with open(file, "rb") as f:
+            stream = io.BytesIO(f.read())
+        assert first_page_tables(MinerDocument, stream) == expected
+
+
+@pytest.mark.parametrize("kind", ["pdf_table", "pdf_text"])
+def test_table_path_same_for_both_backends(corpus, kind, monkeypatch):
+    # Таблицы ищутся при любой оценке разбора по словам
+    monkeypatch.setattr(pdf_parser, "PDF_CONFIDENCE_THRESHOLD", 2)
+    plumber = PDFParser("pdfplumber", {})
+    miner = PDFParser("pdfminer", {})
+    for file in corpus[kind]:
+        event, doc_type = plumber.parse(file)
+        assert miner.parse(file) == (event, doc_type)
+        if kind == "pdf_table":
+            assert event.strategy == "tables"
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import (
+    NEW_LAYOUT_ROWS,
+    _pdf_text,
+    _write_pdf,
+    random_fields,
+)
+from parsers.pdf_parser import PDFParser
+from parsers.sniffer import (
+    PDF_OLD,
+    PDF_TABLE,
+    PDF_TEXT,
+    old_format_items,
+    sniff,
+)
+
+AGENDA = ["1. Открытие", "2. Доклады", "3. Награждение"]
+
+
+def write_text_form(path, extra_lines):
+    """Текстовая форма нового образца и дополнительные строки после нее"""
+    values = random_fields(random.Random(7))
+    lines = [
+        f"{label}: {values[field]}"
+        for rows in NEW_LAYOUT_ROWS
+        for field, label in rows
+    ]
+    content = [
+        _pdf_text(40, 800 - 18 * i, line)
+        for i, line in enumerate(lines + extra_lines)
+    ]
+    _write_pdf(str(path), content)
+    return str(path)
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (AGENDA, 0),
+    (["|1|Заявитель|Иванов|", "|2|Дата|05.03|", "| 6.1 |ТВ|да|"], 3),
+    (["6.1 Телевизоры", "9.1. Ответственный", "9.3 Требования"], 3),
+    (["1.1 Приветствие", "1.2 Доклад", "2.1 Обсуждение"], 0),
+])
+def test_old_format_items(lines, expected):
+    assert old_format_items(lines) == expected
+
+
+def test_numbered_agenda_is_not_old_format(tmp_path):
+    file = write_text_form(tmp_path / "agenda.pdf", AGENDA)
+    assert sniff(file) == PDF_TEXT
+    for hint in (None, PDF_TEXT):
+        event, doc_type = PDFParser().parse(file, hint)
+        assert doc_type == "pdf_text"
+        assert event.strategy == "words"
+        assert event.confidence >= 0.5
+
+
+def test_low_scoring_old_format_falls_through(tmp_path):
+    # Подпункты бланка без таблицы: старый образец не разбирается
+    subitems = ["6.1 Телевизоры", "9.1 Ответственный", "9.3 Требования"]
+    file = write_text_form(tmp_path / "numbered.pdf", subitems)
+    assert sniff(file) == PDF_OLD
+    for hint in (None, PDF_OLD):
+        event, doc_type = PDFParser().parse(file, hint)
+        assert (doc_type, event.strategy) == ("pdf_text", "words")
+        assert event.confidence >= 0.5
+
+
+def test_old_format_files(corpus):
+    for file in corpus["pdf_old"]:
+        event, doc_type = PDFParser().parse(file)
+        assert (doc_type, event.strategy) == ("old_pdf_format", "old")
+        assert event.confidence >= 0.5
+
+
+@pytest.mark.parametrize("hint", [PDF_TABLE, PDF_TEXT])
+def test_old_format_found_despite_other_hint(corpus, hint):
+    # Сниффер не видит номера пунктов при многобайтовой кодировке шрифта
+    for file in corpus["pdf_old"]:
+        event, doc_type = PDFParser().parse(file, hint)
+        assert (doc_type, event.strategy) == ("old_pdf_format", "old")
@@ -0,0 +1,63 @@
+import os
+import time
+
+from models.event_model import TIMEOUT, Event
+from parsers.pool import WatchdogPool, parse_files
+
+
+class FakeParser:
+    """Парсер, который зависает или аварийно завершает процесс по имени"""
+
+    def warm_up(self):
+        pass
+
+    def parse(self, file, hint=None):
+        if file == "hang":
+            time.sleep(60)
+        if file == "crash":
+            os._exit(3)
+        return Event(name=file), hint or "fake"
+
+
+PARSERS = {"fake": FakeParser()}
+
+
+def test_timeout_replaces_worker():
+    with WatchdogPool(PARSERS, workers=2, timeout=0.5) as pool:
+        hang = pool.submit(("hang", "fake", None))
+        ok = pool.submit(("ok", "fake", None))
+        file, data, doc_type, error = hang.result(10)
+        assert (file, doc_type, error) == ("hang", TIMEOUT, None)
+        assert data.doc_type == TIMEOUT
+        assert ok.result(10)[1].name == "ok"
+        # Пул продолжает работу после замены процесса
+        assert pool.submit(("after", "fake", None)).result(10)[2] == "fake"
+
+
+def test_crash_is_reported_per_file():
+    with WatchdogPool(PARSERS, workers=1, timeout=5) as pool:
+        crash = pool.submit(("crash", "fake", None))
+        ok = pool.submit(("ok", "fake", "kind"))
+        file, data, doc_type, error = crash.result(10)
+        assert (file, data, doc_type) == ("crash", None, "error")
+        assert "exit code 3" in error
+        assert ok.result(10)[1:3] == (Event(name="ok"), "kind")
+
+
+def test_parse_files_keeps_path_order():
+    files = ["c", "a", "hang", "b"]
+    results = list(
+        parse_files(PARSERS, files, "fake", workers=3, timeout=0.5)
+    )
+    assert [result[0] for result in results] == ["a", "b", "c", "hang"]
+    assert [result[2] for result in results] == [
+        "fake", "fake", "fake", TIMEOUT
+    ]
+
+
+def test_parse_files_in_process_without_timeout():
+    results = list(
+        parse_files(PARSERS, ["b", "a"], "fake", workers=1, timeout=None,
+                    hints={"a": "kind"})
+    )
+    assert [(r[0], r[2]) for r in results] == [("a", "kind"), ("b", "fake")]
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from config.settings import SERVER_RETRY_AFTER
+from parsers.docx_parser import DocxParser
+from parsers.pdf_parser import PDFParser
+from parsers.pool import WorkerPool
+from server import ParseServer
+
+
+class SlowDocxParser(DocxParser):
+    """Парсер DOCX, задерживающий разбор файлов с "slow" в имени"""
+
+    def parse(self, source, hint=None):
+        if isinstance(source, str) and "slow" in source:
+            time.sleep(1)
+        return super().parse(source, hint)
+
+
+@pytest.fixture(scope="module")
+def server():
+    parsers = {"pdf": PDFParser(), "docx": SlowDocxParser()}
+    pool = WorkerPool(parsers, workers=1, queue_limit=1, timeout=30)
+    server = ParseServer(("127.0.0.1", 0), pool)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    pool.close()
+
+
+def request(server, path, body=None, content_type="application/json"):
+    """Ответ сервиса: (статус, заголовки, JSON)"""
+    host, port = server.server_address[:2]
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode("utf-8")
+    headers = {"Content-Type": content_type} if body is not None else {}
+    req = urllib.request.Request(
+        f"http://{host}:{port}{path}", data=body, headers=headers
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status, response.headers, json.load(response)
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, e.headers, json.load(e)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_health(server):
+    status, _, body = request(server, "/health")
+    assert status == 200
+    assert body == {"status": "ok", "workers": 1, "pending": 0, "capacity": 2}
+
+
+def test_parse_upload(server, corpus):
+    file = corpus["docx_new"][0]
+    status, _, body = request(
+        server, "/parse?filename=dir/a.docx", read(file),
+        "application/octet-stream",
+    )
+    assert status == 200
+    assert (body["filename"], body["doc_type"], body["error"]) == (
+        "a.docx", "new", None
+    )
+    expected, _ = DocxParser().parse(file)
+    assert body["data"] == expected.to_dict()
+
+
+def test_parse_path(server, corpus):
+    status, _, body = request(
+        server, "/parse", {"path": corpus["pdf_table"][0]}
+    )
+    assert status == 200
+    assert body["doc_type"] == "pdf_table"
+    assert body["data"]["Event name"]
+
+    status, _, body = request(server, "/parse", {"path": "missing.pdf"})
+    assert status == 422
+    assert (body["doc_type"], body["error"]) == ("error", "not found")
+
+
+def test_bad_requests(server):
+    assert request(server, "/parse", b"{")[0] == 400
+    assert request(server, "/batch", {"paths": "a.pdf"})[0] == 400
+    assert request(server, "/unknown")[0] == 404
+
+
+def test_batch_keeps_order(server, corpus):
+    paths = [corpus["docx_old"][0], "missing.docx", corpus["pdf_text"][0]]
+    status, _, body = request(server, "/batch", {"paths": paths})
+    assert status == 200
+    assert [result["doc_type"] for result in body] == [
+        "old", "error", "pdf_text",
+    ]
+    # Пакет больше очереди не принимается целиком
+    status, _, _ = request(server, "/batch", {"paths": [paths[0]] * 3})
+    assert status == 413
+
+
+def test_queue_full(server, corpus, tmp_path):
+    slow = tmp_path / "slow.docx"
+    slow.write_bytes(read(corpus["docx_new"][0]))
+    futures = server.pool.submit([(str(slow), "docx", None)] * 2)
+    assert futures is not None
+    status, headers, body = request(
+        server, "/parse", {"path": corpus["docx_new"][0]}
+    )
+    assert status == 503
+    assert headers["Retry-After"] == str(SERVER_RETRY_AFTER)
+    assert body == {"error": "Queue is full"}
+
+    for future in futures:
+        assert future.result(30)[2] == "new"
+    # Счетчик очереди уменьшается колбэком после выдачи результата
+    deadline = time.monotonic() + 5
+    while server.pool.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert request(server, "/health")[2]["pending"] == 0
+    status, _, _ = request(server, "/parse", {"path": corpus["docx_new"][0]})
+    assert status == 200
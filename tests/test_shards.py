@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+import main
+from models.event_model import Event
+from utils.shards import (
+    PartialSink,
+    parse_shard,
+    partial_path,
+    read_partials,
+    shard_files,
+)
+
+
+@pytest.mark.parametrize("value, expected", [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b", "1/2/3"])
+def test_parse_shard_rejects(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_shards_split_files_by_relative_path():
+    names = [f"dir/file{i}.pdf" for i in range(50)]
+    shards = [
+        shard_files([os.path.join("/a", n) for n in names], "/a", i, 3)
+        for i in (1, 2, 3)
+    ]
+    assert sorted(sum(shards, [])) == sorted("/a/" + n for n in names)
+    assert all(shards)
+    # На другой машине папка входных файлов может лежать в другом месте
+    moved = shard_files([os.path.join("/b/c", n) for n in names], "/b/c", 2, 3)
+    assert [path[len("/b/c"):] for path in moved] == [
+        path[len("/a"):] for path in shards[1]
+    ]
+
+
+def write_partial(tmp_path, index, count, paths, **header):
+    path = partial_path(str(tmp_path / "output.json"), index, count)
+    sink = PartialSink(path, index, count, root="in", files=len(paths))
+    for file in paths:
+        data = Event(name=file, path=os.path.join("in", file))
+        data.content_hash = "hash-" + file
+        sink.write(os.path.basename(file), data, "new")
+    sink.close()
+    if header:
+        with open(path, encoding="utf-8") as f:
+            partial = json.load(f)
+        partial.update(header)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(partial, f)
+    return path
+
+
+def test_read_partials_in_run_order(tmp_path):
+    first = write_partial(tmp_path, 1, 2, ["b.docx", "z.pdf"])
+    second = write_partial(tmp_path, 2, 2, ["a.docx", "x/c.PDF"])
+    merged = read_partials([second, first])
+    assert [data.name for data in merged] == [
+        "x/c.PDF", "z.pdf", "a.docx", "b.docx",
+    ]
+    assert merged[0].filename == "c.PDF"
+    assert merged[0].path == os.path.join("in", "x/c.PDF")
+    assert merged[0].content_hash == "hash-x/c.PDF"
+
+
+def test_read_partials_rejects_incompatible(tmp_path, capsys):
+    first = write_partial(tmp_path, 1, 2, ["a.docx"])
+    other = write_partial(tmp_path, 2, 2, ["b.docx"], parser_version="0")
+    assert read_partials([first, other]) is None
+    assert read_partials([first, first]) is None
+    (tmp_path / "bad.json").write_text("{}")
+    assert read_partials([str(tmp_path / "bad.json")]) is None
+    assert read_partials([first]) is not None
+    assert "Отсутствуют шарды 2/2" in capsys.readouterr().out
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(
+        sys, "argv", ["main.py", "--no-cache", "--workers", "1", *args]
+    )
+    main.main()
+
+
+def test_merged_shards_match_single_run(corpus, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("inputs")
+    for files in corpus.values():
+        for file in files:
+            shutil.copy(file, "inputs")
+
+    run_main(monkeypatch, "--formats", "json")
+    with open("output.json", encoding="utf-8") as f:
+        single = f.read()
+
+    # Шарды не удаляют выходные файлы обычного запуска
+    run_main(monkeypatch, "--shard", "1/2")
+    run_main(monkeypatch, "--shard", "2/2")
+    assert os.path.exists("output.json")
+
+    os.remove("output.json")
+    run_main(
+        monkeypatch, "--formats", "json", "--merge",
+        "output.shard-1-of-2.json", "output.shard-2-of-2.json",
+    )
+    with open("output.json", encoding="utf-8") as f:
+        assert f.read() == single
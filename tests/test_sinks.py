@@ -0,0 +1,223 @@
+import json
+import sqlite3
+
+import pytest
+
+from config.settings import FIXTURE_MODEL
+from models.event_model import FIELD_LABELS, TIMEOUT, TOO_LARGE, Event
+from utils.sinks import (
+    XLSX_COLUMNS,
+    ConflictSink,
+    DedupeSink,
+    FixtureSink,
+    JsonLinesSink,
+    JsonObjectSink,
+    SqliteSink,
+    XlsxSink,
+)
+
+
+def event(name, content_hash="h1", **fields):
+    data = Event(name=name, **fields)
+    data.content_hash = content_hash
+    return data
+
+
+def rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(
+            "SELECT content_hash, filename, doc_type, name FROM events "
+            "ORDER BY content_hash"
+        ).fetchall()
+
+
+def test_sqlite_upserts_by_content_hash(tmp_path):
+    path = str(tmp_path / "out.sqlite")
+    with SqliteSink(path, batch_size=2) as sink:
+        sink.write("a.docx", event("Форум"), "new")
+        sink.write("b.docx", event("Лекция", "h2"), "old")
+        sink.write("a.docx", event("Форум 2"), "new")
+    assert rows(path) == [
+        ("h1", "a.docx", "new", "Форум 2"),
+        ("h2", "b.docx", "old", "Лекция"),
+    ]
+
+
+@pytest.mark.parametrize("doc_type", [TIMEOUT, TOO_LARGE])
+def test_sqlite_keeps_rows_on_placeholder(tmp_path, doc_type):
+    path = str(tmp_path / "out.sqlite")
+    with SqliteSink(path) as sink:
+        sink.write("a.pdf", event("Форум"), "pdf_text")
+    with SqliteSink(path) as sink:
+        sink.write("a.pdf", event(""), doc_type)
+    assert rows(path) == [("h1", "a.pdf", "pdf_text", "Форум")]
+
+
+def test_sqlite_requires_content_hash(tmp_path):
+    with SqliteSink(str(tmp_path / "out.sqlite")) as sink:
+        with pytest.raises(ValueError):
+            sink.write("a.pdf", event("Форум", ""), "pdf_text")
+
+
+def test_fixture_objects_keyed_by_content_hash(tmp_path):
+    path = str(tmp_path / "fixture.json")
+    fields = {"name": "Event name", "kind": "File Type"}
+    with FixtureSink(path, fields=fields) as sink:
+        assert sink.needs_content_hash
+        sink.write("a.docx", event("Форум"), "new")
+        sink.write("b.pdf", event("", "h2", doc_type=TIMEOUT), TIMEOUT)
+        sink.write("c.pdf", event("", "h3", doc_type=TOO_LARGE), TOO_LARGE)
+        sink.write("d.docx", event("Лекция", "h4"), "old")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [
+            {
+                "model": FIXTURE_MODEL,
+                "pk": "h1",
+                "fields": {"name": "Форум", "kind": "new"},
+            },
+            {
+                "model": FIXTURE_MODEL,
+                "pk": "h4",
+                "fields": {"name": "Лекция", "kind": "old"},
+            },
+        ]
+
+
+def test_fixture_without_pk(tmp_path):
+    path = str(tmp_path / "fixture.json")
+    with FixtureSink(path, model="app.event", pk=None) as sink:
+        assert not sink.needs_content_hash
+        sink.write("a.docx", event("Форум"), "new")
+    with open(path, encoding="utf-8") as f:
+        (fixture,) = json.load(f)
+    assert (fixture["model"], fixture["pk"]) == ("app.event", None)
+    assert fixture["fields"]["name"] == "Форум"
+    assert fixture["fields"]["source_file"] == "a.docx"
+
+
+def test_empty_fixture_and_unknown_field(tmp_path):
+    path = str(tmp_path / "fixture.json")
+    FixtureSink(path).close()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == []
+    with pytest.raises(ValueError):
+        FixtureSink(path, fields={"name": "Unknown"})
+
+
+RECORDS = [
+    ("a.docx", Event(name="Форум", department="Совет"), "new"),
+    ("b.pdf", Event(name="Лекция \"1\"", schedule="10:00\n12:00"), "pdf_text"),
+]
+
+
+def test_json_object_matches_json_dump(tmp_path):
+    path = str(tmp_path / "out.json")
+    with JsonObjectSink(path) as sink:
+        for filename, data, doc_type in RECORDS:
+            sink.write(filename, data, doc_type)
+    expected = {filename: dict(data) for filename, data, _ in RECORDS}
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == json.dumps(expected, ensure_ascii=False, indent=4)
+
+
+def test_empty_json_object(tmp_path):
+    path = str(tmp_path / "out.json")
+    JsonObjectSink(path).close()
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == json.dumps({}, indent=4)
+
+
+def test_json_lines_append(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    with JsonLinesSink(path) as sink:
+        sink.write(*RECORDS[0])
+    with JsonLinesSink(path, append=True) as sink:
+        sink.write(*RECORDS[1])
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [
+        {"Filename": filename, "File Type": doc_type, **data}
+        for filename, data, doc_type in RECORDS
+    ]
+    with JsonLinesSink(path) as sink:
+        sink.write(*RECORDS[1])
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_xlsx_rows_and_widths(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "out.xlsx")
+    with XlsxSink(path) as sink:
+        for filename, data, doc_type in RECORDS:
+            sink.write(filename, data, doc_type)
+        sink.write_row(["=1+1", None])
+    sheet = openpyxl.load_workbook(path).active
+    rows = [
+        ["" if value is None else value for value in row]
+        for row in sheet.iter_rows(values_only=True)
+    ]
+    assert rows[0] == XLSX_COLUMNS
+    assert rows[1:3] == [
+        [filename, doc_type, *(data[label] for label in FIELD_LABELS)]
+        for filename, data, doc_type in RECORDS
+    ]
+    # Значения - текст, а не формулы
+    assert rows[3][:2] == ["=1+1", ""]
+    widths = {
+        column: sheet.column_dimensions[
+            openpyxl.utils.get_column_letter(index)
+        ].width
+        for index, column in enumerate(XLSX_COLUMNS, 1)
+    }
+    # Ширина многострочного значения - по самой длинной строке
+    assert widths["Schedule"] == widths["Filename"]
+    assert widths["Filename"] < widths["Necessary technical equipment"]
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_conflict_report(tmp_path):
+    path = str(tmp_path / "conflicts.json")
+    with ConflictSink(path) as sink:
+        sink.write("a.docx", Event(date="05.03.2025 10:00-12:00"), "new")
+        sink.write("b.docx", Event(date="05.03.2025 11:00-13:00"), "new")
+        sink.write("c.docx", Event(date="05.03.2025 12:00-14:00"), "new")
+        sink.write("d.docx", Event(date="по согласованию"), "new")
+        sink.write("e.docx", Event(name="Без дат"), "new")
+    report = read_json(path)
+    assert report["unparsed"] == ["d.docx"]
+    assert [
+        (c["start"], c["end"], [b["filename"] for b in c["bookings"]])
+        for c in report["conflicts"]
+    ] == [
+        ("2025-03-05T11:00:00", "2025-03-05T12:00:00", ["a.docx", "b.docx"]),
+        ("2025-03-05T12:00:00", "2025-03-05T13:00:00", ["b.docx", "c.docx"]),
+    ]
+    assert report["conflicts"][0]["bookings"][0] == {
+        "filename": "a.docx",
+        "field": "Date of event",
+        "start": "2025-03-05T10:00:00",
+        "end": "2025-03-05T12:00:00",
+    }
+
+
+def test_dedupe_passes_canonical_records(tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    path = str(tmp_path / "duplicates.json")
+    forum = dict(department="Совет", date="05.03.2025", responsible="Иванов")
+    with DedupeSink([JsonLinesSink(output)], path) as sink:
+        sink.write("a.pdf", event("Форум молодежи", "h1", **forum), "words")
+        sink.write("b.pdf", event("", "h2", doc_type=TIMEOUT), TIMEOUT)
+        sink.write("c.pdf", event("", "h3", doc_type=TIMEOUT), TIMEOUT)
+        sink.write("a.docx", event("Форум молодежи", "h4", **forum), "new")
+        sink.write("copy.docx", event("Лекция", "h1"), "new")
+    with open(output, encoding="utf-8") as f:
+        written = [json.loads(line)["Filename"] for line in f]
+    assert written == ["a.pdf", "b.pdf", "c.pdf"]
+    assert read_json(path) == [
+        {"canonical": "a.pdf", "duplicates": ["a.docx", "copy.docx"]},
+    ]
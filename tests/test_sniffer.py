@@ -0,0 +1,95 @@
+import io
+import zipfile
+
+import pytest
+
+from parsers.sniffer import (
+    CORRUPT,
+    DOCX_NEW,
+    DOCX_OLD,
+    OLE_MAGIC,
+    PDF_OLD,
+    PDF_TABLE,
+    PDF_TEXT,
+    UNSUPPORTED,
+    route_files,
+    sniff,
+    sniff_files,
+)
+
+CORPUS_KINDS = {
+    "docx_new": DOCX_NEW,
+    "docx_old": DOCX_OLD,
+    "pdf_table": PDF_TABLE,
+    "pdf_text": PDF_TEXT,
+    "pdf_old": PDF_OLD,
+}
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def encrypted(data):
+    """Архив, все файлы которого помечены как зашифрованные"""
+    data = bytearray(data)
+    start = 0
+    while True:
+        start = data.find(b"PK\x01\x02", start)
+        if start < 0:
+            return bytes(data)
+        # Бит 0 флагов общего назначения в центральном каталоге
+        data[start + 8] |= 1
+        start += 4
+
+
+@pytest.mark.parametrize("kind", sorted(CORPUS_KINDS))
+def test_corpus_kinds(corpus, kind):
+    for file in corpus[kind]:
+        assert sniff(file) == CORPUS_KINDS[kind]
+
+
+def test_bytes_and_file_objects(corpus):
+    file = corpus["pdf_table"][0]
+    assert sniff(read(file)) == PDF_TABLE
+    with open(file, "rb") as f:
+        assert sniff(f) == PDF_TABLE
+
+
+def test_files_inside_archive(corpus, tmp_path):
+    archive = tmp_path / "mail.zip"
+    with zipfile.ZipFile(archive, "w") as package:
+        package.write(corpus["docx_new"][0], "a/new.docx")
+    assert sniff(f"{archive}!a/new.docx") == DOCX_NEW
+
+
+def test_truncated_pdf_is_corrupt(corpus):
+    data = read(corpus["pdf_text"][0])
+    assert sniff(data[: len(data) // 2]) == CORRUPT
+
+
+def test_pdf_with_trailing_bytes(corpus):
+    data = read(corpus["pdf_text"][0])
+    assert sniff(data + b"\0" * 10000) == PDF_TEXT
+
+
+def test_encrypted_docx_part_is_corrupt(corpus):
+    assert sniff(encrypted(read(corpus["docx_new"][0]))) == CORRUPT
+
+
+def test_unsupported_and_garbage():
+    assert sniff(OLE_MAGIC + b"\0" * 100) == UNSUPPORTED
+    assert sniff(b"not a document") == CORRUPT
+    assert sniff(io.BytesIO(b"")) == CORRUPT
+
+
+def test_route_files_skips_unparsed(tmp_path, corpus):
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(encrypted(read(corpus["docx_old"][0])))
+    files = [corpus["pdf_text"][0], corpus["docx_old"][0], str(broken)]
+    routes = route_files(sniff_files(files))
+    assert routes == {
+        "pdf": [corpus["pdf_text"][0]],
+        "docx": [corpus["docx_old"][0]],
+    }
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from utils import watcher as watcher_module
+from utils.watcher import FolderWatcher
+
+
+class Clock:
+    """Подменяет модуль time в watcher: время двигается вручную"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(watcher_module, "time", clock)
+    return clock
+
+
+def write(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_waits_until_file_settles(tmp_path, clock):
+    watcher = FolderWatcher(str(tmp_path), settle_seconds=5)
+    pdf = write(tmp_path / "a.pdf", b"1")
+    assert watcher.poll() == []
+
+    # Файл дописывается: отсчет начинается заново
+    clock.now = 4
+    write(tmp_path / "a.pdf", b"12")
+    assert watcher.poll() == []
+    clock.now = 8
+    assert watcher.poll() == []
+    clock.now = 9
+    assert watcher.poll() == [(pdf, "pdf")]
+    clock.now = 20
+    assert watcher.poll() == []
+
+
+def test_changed_file_is_reported_again(tmp_path, clock):
+    watcher = FolderWatcher(str(tmp_path), settle_seconds=0)
+    docx = write(tmp_path / "a.docx", b"1")
+    watcher.poll()
+    assert watcher.poll() == [(docx, "docx")]
+
+    write(tmp_path / "a.docx", b"12")
+    watcher.poll()
+    assert watcher.poll() == [(docx, "docx")]
+
+
+def test_state_survives_restart(tmp_path, clock):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    state = str(tmp_path / "state.json")
+    done = write(folder / "done.pdf", b"1")
+    failed = write(folder / "failed.pdf", b"2")
+
+    watcher = FolderWatcher(str(folder), 0, state)
+    watcher.poll()
+    assert watcher.poll() == [(done, "pdf"), (failed, "pdf")]
+    watcher.done(done)
+
+    # Файл без записанного результата разбирается после перезапуска
+    restarted = FolderWatcher(str(folder), 0, state)
+    restarted.poll()
+    assert restarted.poll() == [(failed, "pdf")]
+
+
+def test_broken_state_is_ignored(tmp_path, clock, capsys):
+    state = tmp_path / "state.json"
+    state.write_text("[1, 2]")
+    folder = tmp_path / "in"
+    folder.mkdir()
+    pdf = write(folder / "a.pdf", b"1")
+
+    watcher = FolderWatcher(str(folder), 0, str(state))
+    watcher.poll()
+    assert watcher.poll() == [(pdf, "pdf")]
+    assert "Не удалось прочитать состояние" in capsys.readouterr().out
+
+
+def test_removed_file_is_forgotten(tmp_path, clock):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    state = str(tmp_path / "state.json")
+    pdf = write(folder / "a.pdf", b"1")
+    watcher = FolderWatcher(str(folder), 0, state)
+    watcher.poll()
+    assert watcher.poll() == [(pdf, "pdf")]
+    watcher.done(pdf)
+    modified = os.stat(pdf).st_mtime_ns
+
+    os.remove(pdf)
+    assert watcher.poll() == []
+    assert FolderWatcher(str(folder), 0, state)._done == {}
+
+    # Вернувшийся файл с той же подписью разбирается заново
+    write(folder / "a.pdf", b"1")
+    os.utime(pdf, ns=(modified, modified))
+    watcher.poll()
+    assert watcher.poll() == [(pdf, "pdf")]
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.settings import (
+    PARSER_VERSION,
+    PDF_BACKEND,
+    PDF_CONFIDENCE_THRESHOLD,
+    PDF_KIND_BACKENDS,
+    PDF_MAX_CONTENT_BYTES,
+    PDF_MAX_FILE_SIZE,
+    PDF_MAX_PAGE_OBJECTS,
+    TABLE_FIELDS_MAPPING,
+)
+from config.templates import LAYOUT_TEMPLATES
+
+from .file_utils import file_hash
+
+# Лимиты и пороги, от которых зависит результат парсинга
+PARSE_LIMITS = {
+    "PDF_MAX_FILE_SIZE": PDF_MAX_FILE_SIZE,
+    "PDF_MAX_CONTENT_BYTES": PDF_MAX_CONTENT_BYTES,
+    "PDF_MAX_PAGE_OBJECTS": PDF_MAX_PAGE_OBJECTS,
+    "PDF_CONFIDENCE_THRESHOLD": PDF_CONFIDENCE_THRESHOLD,
+}
+# Движки чтения PDF
+PDF_BACKENDS_CONFIG = {
+    "PDF_BACKEND": PDF_BACKEND,
+    "PDF_KIND_BACKENDS": PDF_KIND_BACKENDS,
+}
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Исходники, от которых зависит результат парсинга: все модули парсеров
+# и используемые ими модули вне пакета
+PARSERS_DIR = os.path.join(ROOT_DIR, "parsers")
+PARSER_DEPENDENCIES = tuple(
+    os.path.join(ROOT_DIR, *path.split("/"))
+    for path in (
+        "models/event_model.py",
+        "utils/file_utils.py",
+        "utils/keyword_matcher.py",
+    )
+)
+
+
+def code_fingerprint(
+    directory: str = PARSERS_DIR,
+    dependencies: Iterable[str] = PARSER_DEPENDENCIES,
+) -> str:
+    """Отпечаток исходного кода парсеров и модулей, от которых они зависят"""
+    paths = [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith(".py")
+    ]
+    digest = hashlib.sha256()
+    for path in paths + list(dependencies):
+        digest.update(os.path.relpath(path, ROOT_DIR).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def mapping_fingerprint(
+    mapping: Dict[str, Any] = TABLE_FIELDS_MAPPING
+) -> str:
+    """Отпечаток маппинга полей таблиц или шаблонов разметки"""
+    dump = json.dumps(mapping, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(dump.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Дисковый кэш результатов парсинга.
+    Ключ записи - хэш содержимого файла, записи хранятся в пространстве
+    имен, зависящем от версии парсеров, их кода, маппинга полей, шаблонов
+    разметки, лимитов и порогов, движков PDF, поэтому при любом их
+    изменении кэш инвалидируется автоматически.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.namespace = hashlib.sha256(
+            "|".join(
+                (
+                    PARSER_VERSION,
+                    code_fingerprint(),
+                    mapping_fingerprint(),
+                    mapping_fingerprint(LAYOUT_TEMPLATES),
+                    mapping_fingerprint(PARSE_LIMITS),
+                    mapping_fingerprint(PDF_BACKENDS_CONFIG),
+                )
+            ).encode("utf-8")
+        ).hexdigest()[:16]
+        self.directory = os.path.join(directory, self.namespace)
+        os.makedirs(self.directory, exist_ok=True)
+        self._drop_stale_namespaces(directory)
+        self.size = sum(entry.stat().st_size for entry in self._entries())
+
+    def key(self, file_path: str) -> str:
+        """Ключ записи для файла"""
+        return file_hash(file_path)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Возвращает (данные, тип документа) или None при промахе"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # Отметка последнего использования для LRU
+        except (OSError, ValueError):
+            return None
+        return entry["data"], entry["doc_type"]
+
+    def put(self, key: str, data: Dict[str, Any], doc_type: str) -> None:
+        """Сохраняет результат парсинга файла"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"data": data, "doc_type": doc_type}, f, ensure_ascii=False
+            )
+        if os.path.exists(path):
+            self.size -= os.path.getsize(path)
+        os.replace(tmp_path, path)
+        self.size += os.path.getsize(path)
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи до лимита размера"""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        # Оставляем запас, чтобы не вытеснять записи на каждой вставке
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self.size <= target:
+                break
+            self.size -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        ]
+
+    def _drop_stale_namespaces(self, directory: str) -> None:
+        """Удаляет записи, созданные другой версией парсеров"""
+        for entry in os.scandir(directory):
+            if entry.is_dir() and entry.name != self.namespace:
+                shutil.rmtree(entry.path, ignore_errors=True)
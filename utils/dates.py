@@ -0,0 +1,299 @@
+"""
+Разбор дат и времени бронирования из текста заявок и поиск пересечений
+бронирований.
+
+Поддерживаются даты вида 05.03.2025, 05.03.25, 05.03, 5 марта 2025,
+диапазоны дней (05-07.03.2025, 5-7 марта, 05.03 - 07.03.2025, с 5 по 7
+марта) и времени (10:00-12:00, с 10.00 до 12.00). Несколько дат в одной
+строке дают несколько интервалов. Время относится к предшествующим ему
+датам (или следующим, если указано перед ними); без времени бронируется
+весь день.
+"""
+import heapq
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+# Поля заявки, занимающие площадку
+BOOKING_FIELDS = ("Date of event", "Date of installation")
+
+# Наибольшая длина диапазона дней, для которого время повторяется по дням
+MAX_RANGE_DAYS = 31
+
+_MONTHS = {
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "май": 5, "мая": 5,
+    "июн": 6, "июл": 7, "авг": 8, "сен": 9, "окт": 10, "ноя": 11,
+    "дек": 12,
+}
+
+# Все шаблоны собраны в одно выражение и компилируются при импорте
+_TOKEN = re.compile(
+    r"""
+    (?:(?P<wfirst>\d{1,2})\s*(?:[-–—]|по)\s*)?
+    (?P<wday>\d{1,2})\s+
+    (?P<month>январ[яь]|феврал[яь]|март[а]?|апрел[яь]|ма[йя]|июн[яь]
+        |июл[яь]|август[а]?|сентябр[яь]|октябр[яь]|ноябр[яь]|декабр[яь])
+    (?:\s+(?P<wyear>\d{4}))?
+  | (?:(?P<nfirst>\d{1,2})\s*[-–—]\s*)?
+    (?P<nday>\d{1,2})\.(?P<nmonth>\d{1,2})(?:\.(?P<nyear>\d{4}|\d{2}))?
+    (?![\d:])
+  | (?P<hour>\d{1,2})[:.](?P<minute>\d{2})
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+# Текст между токенами, связывающий их в диапазон
+_RANGE = re.compile(r"\s*(?:[-–—]|до|по)\s*$", re.IGNORECASE)
+
+# День без года: (день, месяц, год или None)
+_Day = Tuple[int, int, Optional[int]]
+
+
+def _tokens(text: str) -> list:
+    """
+    Токены строки: ("date", первый день, последний день) и ("time",
+    минуты от полуночи) с признаком диапазона с предыдущим токеном
+    """
+    tokens = []
+    end = 0
+    for match in _TOKEN.finditer(text):
+        gap = _RANGE.fullmatch(text, end, match.start())
+        joined = bool(tokens) and gap is not None
+        end = match.end()
+        groups = match.groupdict()
+        if groups["hour"] is not None:
+            hour, minute = int(groups["hour"]), int(groups["minute"])
+            if hour <= 24 and minute < 60:
+                tokens.append(("time", hour * 60 + minute, joined))
+            continue
+
+        if groups["month"] is not None:
+            month = _MONTHS[groups["month"][:3].lower()]
+            day, first = groups["wday"], groups["wfirst"]
+            year = groups["wyear"]
+        else:
+            month = int(groups["nmonth"])
+            day, first = groups["nday"], groups["nfirst"]
+            year = groups["nyear"]
+            if year is None and not 1 <= month <= 12:
+                # 10.30 без года - это время, а не дата
+                hour, minute = int(day), month
+                if len(groups["nmonth"]) == 2 and hour <= 24 and minute < 60:
+                    tokens.append(("time", hour * 60 + minute, joined))
+                continue
+        if year is not None:
+            year = int(year) + (2000 if len(year) == 2 else 0)
+        last: _Day = (int(day), month, year)
+        start: _Day = (int(first), month, year) if first else last
+        tokens.append(("date", start, last, joined))
+    return tokens
+
+
+def _fill_years(tokens: list, default_year: int) -> None:
+    """
+    Дни без года получают год ближайшей следующей даты с годом,
+    затем предыдущей, иначе default_year
+    """
+    dates = [token for token in tokens if token[0] == "date"]
+    years: List[Optional[int]] = [token[2][2] for token in dates]
+    following: Optional[int] = None
+    for i in range(len(years) - 1, -1, -1):
+        if years[i] is None:
+            years[i] = following
+        following = years[i]
+    previous = default_year
+    for i, year in enumerate(years):
+        if year is None:
+            years[i] = previous
+        previous = years[i]
+
+    index = 0
+    for position, token in enumerate(tokens):
+        if token[0] != "date":
+            continue
+        year = years[index]
+        index += 1
+        (d1, m1, y1), (d2, m2, y2) = token[1], token[2]
+        tokens[position] = (
+            "date", (d1, m1, y1 or year), (d2, m2, y2 or year), token[3]
+        )
+
+
+def _to_date(day: _Day) -> Optional[date]:
+    try:
+        return date(day[2], day[1], day[0])
+    except ValueError:
+        return None
+
+
+def _group_intervals(
+    days: List[Tuple[date, date]], times: List[Tuple[int, bool]]
+) -> List[Interval]:
+    """Интервалы группы: дни (диапазоны) и следующее за ними время"""
+    spans = []
+    for minute, joined in times:
+        if joined and spans and spans[-1][1] is None:
+            spans[-1] = (spans[-1][0], minute)
+        else:
+            spans.append((minute, None))
+
+    intervals = []
+    for first, last in days:
+        if last < first:
+            first, last = last, first
+        start_day = datetime(first.year, first.month, first.day)
+        if not spans:
+            end_day = datetime(last.year, last.month, last.day)
+            intervals.append((start_day, end_day + timedelta(days=1)))
+            continue
+        count = min((last - first).days, MAX_RANGE_DAYS - 1) + 1
+        for offset in range(count):
+            midnight = start_day + timedelta(days=offset)
+            for start, end in spans:
+                # Время без конца бронирует площадку до конца дня
+                if end is None:
+                    end = 24 * 60
+                elif end <= start:
+                    end += 24 * 60
+                intervals.append((
+                    midnight + timedelta(minutes=start),
+                    midnight + timedelta(minutes=end),
+                ))
+    return intervals
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str, default_year: int) -> Tuple[Interval, ...]:
+    tokens = _tokens(text)
+    _fill_years(tokens, default_year)
+
+    intervals: List[Interval] = []
+    days: List[Tuple[date, date]] = []
+    times: List[Tuple[int, bool]] = []
+    for token in tokens:
+        if token[0] == "time":
+            times.append((token[1], token[2]))
+            continue
+        # Время перед первой датой группы относится к ней
+        if times and days:
+            intervals.extend(_group_intervals(days, times))
+            days, times = [], []
+        first, last = _to_date(token[1]), _to_date(token[2])
+        if first is None or last is None:
+            continue
+        if token[3] and days:
+            # "05.03 - 07.03": вторая дата закрывает диапазон первой
+            days[-1] = (days[-1][0], last)
+        else:
+            days.append((first, last))
+    if days:
+        intervals.extend(_group_intervals(days, times))
+    return tuple(intervals)
+
+
+def parse_intervals(
+    text: str, default_year: Optional[int] = None
+) -> List[Interval]:
+    """
+    Интервалы [начало, конец) бронирования, указанные в тексте.
+    Год дат без года берется из соседних дат или default_year
+    (по умолчанию - текущий).
+    """
+    if not text:
+        return []
+    year = default_year or date.today().year
+    return list(_parse(" ".join(text.split()), year))
+
+
+class Booking(NamedTuple):
+    """Интервал бронирования площадки по заявке"""
+
+    start: datetime
+    end: datetime
+    filename: str
+    field: str
+
+
+def event_bookings(
+    filename: str, data, default_year: Optional[int] = None
+) -> List[Booking]:
+    """Бронирования заявки по полям дат"""
+    return [
+        Booking(start, end, filename, field)
+        for field in BOOKING_FIELDS
+        for start, end in parse_intervals(data.get(field, ""), default_year)
+    ]
+
+
+class BookingIndex:
+    """
+    Статическое дерево интервалов над бронированиями: отсортированный по
+    началу массив, узлы - середины отрезков, в каждом узле - наибольший
+    конец интервала в поддереве. Построение O(n log n), запрос O(log n + k).
+    """
+
+    def __init__(self, bookings: Iterable[Booking]) -> None:
+        self.bookings = sorted(bookings)
+        self._max_end: List[Optional[datetime]] = [None] * len(self.bookings)
+        self._build(0, len(self.bookings))
+
+    def __len__(self) -> int:
+        return len(self.bookings)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        ends = [
+            end
+            for end in (
+                self.bookings[mid].end,
+                self._build(lo, mid),
+                self._build(mid + 1, hi),
+            )
+            if end is not None
+        ]
+        self._max_end[mid] = max(ends)
+        return self._max_end[mid]
+
+    def query(self, start: datetime, end: datetime) -> List[Booking]:
+        """Бронирования, пересекающиеся с [start, end)"""
+        found = []
+        stack = [(0, len(self.bookings))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # В поддереве нет интервалов, заканчивающихся после start
+            if self._max_end[mid] <= start:
+                continue
+            stack.append((lo, mid))
+            booking = self.bookings[mid]
+            if booking.start < end:
+                if start < booking.end:
+                    found.append(booking)
+                # Правее - только интервалы, начинающиеся не раньше
+                stack.append((mid + 1, hi))
+        found.sort()
+        return found
+
+    def conflicts(self) -> List[Tuple[Booking, Booking]]:
+        """
+        Пары пересекающихся бронирований разных заявок.
+        Проход по началам интервалов с кучей активных по концу:
+        O(n log n + k) для k пересечений.
+        """
+        pairs = []
+        active: List[Tuple[datetime, int]] = []
+        for index, booking in enumerate(self.bookings):
+            while active and active[0][0] <= booking.start:
+                heapq.heappop(active)
+            for _, other in active:
+                previous = self.bookings[other]
+                if previous.filename != booking.filename:
+                    pairs.append((previous, booking))
+            heapq.heappush(active, (booking.end, index))
+        return pairs
@@ -0,0 +1,171 @@
+"""
+Поиск повторно поданных заявок: одинаковых файлов (по хэшу содержимого)
+и почти одинаковых записей (одна заявка в DOCX и PDF, мелкие правки).
+
+Значения полей нормализуются и разбиваются на шинглы, по ним строятся
+MinHash-сигнатуры. Сигнатуры делятся на полосы (LSH): кандидатами
+считаются записи, совпавшие хотя бы в одной полосе, и только для них
+считается точный коэффициент Жаккара. Группы собираются через
+систему непересекающихся множеств.
+"""
+import hashlib
+import struct
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from config.settings import DEDUPE_BANDS, DEDUPE_NUM_PERM, DEDUPE_THRESHOLD
+from models.event_model import (
+    DEFAULT_VALUES,
+    FIELD_LABELS,
+    PLACEHOLDER_DOC_TYPES,
+)
+
+from .text_utils import normalize_text
+
+# Каждое хэширование blake2b дает 16 32-битных значений сигнатуры;
+# блоки различаются солью, так что значения независимы
+_BLOCK = 16
+_SALTS = [
+    block.to_bytes(16, "little")
+    for block in range(-(-DEDUPE_NUM_PERM // _BLOCK))
+]
+_UNPACK = struct.Struct(f"<{_BLOCK}I").unpack
+
+
+def shingles(data: Mapping[str, str]) -> Set[str]:
+    """
+    Шинглы записи: пары соседних слов нормализованного значения каждого
+    поля с подписью поля (одинаковый текст в разных полях различается)
+    """
+    result = set()
+    for label in FIELD_LABELS:
+        words = normalize_text(data.get(label) or "").lower().split()
+        if len(words) == 1:
+            result.add(f"{label}:{words[0]}")
+        for first, second in zip(words, words[1:]):
+            result.add(f"{label}:{first} {second}")
+    return result
+
+
+def has_parsed_fields(data: Mapping[str, str]) -> bool:
+    """
+    Есть ли в записи значения, извлеченные из файла: у заглушек и записей
+    только со значениями по умолчанию их нет
+    """
+    if getattr(data, "doc_type", "") in PLACEHOLDER_DOC_TYPES:
+        return False
+    for label in FIELD_LABELS:
+        value = data.get(label)
+        if value and value != DEFAULT_VALUES.get(label):
+            return True
+    return False
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    """
+    MinHash-сигнатура множества из DEDUPE_NUM_PERM значений: минимумы
+    хэш-функций по элементам
+    """
+    rows = []
+    for token in tokens:
+        data = token.encode("utf-8")
+        row: Tuple[int, ...] = ()
+        for salt in _SALTS:
+            row += _UNPACK(hashlib.blake2b(data, salt=salt).digest())
+        rows.append(row)
+    if not rows:
+        return ()
+    return tuple(map(min, zip(*rows)))[:DEDUPE_NUM_PERM]
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class DisjointSet:
+    """Система непересекающихся множеств над индексами 0..n-1"""
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Сжатие путей
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # Корень - меньший индекс: группа упорядочена по записям
+            self.parent[max(first, second)] = min(first, second)
+
+
+def _completeness(data: Mapping[str, str]) -> int:
+    return sum(1 for label in FIELD_LABELS if data.get(label))
+
+
+def find_duplicates(
+    records: Sequence[Mapping[str, str]],
+    threshold: float = DEDUPE_THRESHOLD,
+    bands: int = DEDUPE_BANDS,
+) -> List[List[int]]:
+    """
+    Группы повторов среди записей: списки индексов, первым идет
+    каноническая запись - с наибольшим числом заполненных полей, при
+    равенстве - более ранняя. Записи без повторов в группы не входят.
+    Записи с одинаковым content_hash объединяются всегда, остальные -
+    при сходстве шинглов не ниже threshold. Записи без разобранных полей
+    (заглушки, только значения по умолчанию) сравниваются только по хэшу.
+    """
+    groups = DisjointSet(len(records))
+
+    by_hash: Dict[str, int] = {}
+    for index, data in enumerate(records):
+        content_hash = getattr(data, "content_hash", "")
+        if content_hash:
+            groups.union(by_hash.setdefault(content_hash, index), index)
+
+    sets = [
+        shingles(data) if has_parsed_fields(data) else set()
+        for data in records
+    ]
+    rows = DEDUPE_NUM_PERM // bands
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    for index, tokens in enumerate(sets):
+        signature = minhash(tokens)
+        if not signature:
+            continue
+        for band in range(bands):
+            key = band, signature[band * rows:(band + 1) * rows]
+            buckets[key].append(index)
+
+    checked = set()
+    for candidates in buckets.values():
+        for i, first in enumerate(candidates):
+            for second in candidates[i + 1:]:
+                if (first, second) in checked:
+                    continue
+                checked.add((first, second))
+                if groups.find(first) == groups.find(second):
+                    continue
+                if jaccard(sets[first], sets[second]) >= threshold:
+                    groups.union(first, second)
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(records)):
+        members[groups.find(index)].append(index)
+    result = []
+    for group in members.values():
+        if len(group) < 2:
+            continue
+        canonical = max(group, key=lambda i: (_completeness(records[i]), -i))
+        group.remove(canonical)
+        result.append([canonical] + group)
+    result.sort()
+    return result
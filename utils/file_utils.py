@@ -1,21 +1,206 @@
+import hashlib
+import io
 import os
-from typing import List, Tuple
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+# Источник данных парсера: путь, содержимое файла или открытый файл.
+# Файл внутри ZIP-архива задается путем вида "архив.zip!папка/файл.docx"
+Source = Union[str, bytes, IO[bytes]]
+
+ARCHIVE_SEPARATOR = ".zip!"
+
+# Число архивов, остающихся открытыми между обращениями к их файлам
+ARCHIVE_CACHE_SIZE = 8
+
+# Ошибки чтения файла архива: зашифрован, неподдерживаемое сжатие,
+# поврежден или отсутствует
+_MEMBER_ERRORS = (
+    KeyError,
+    NotImplementedError,
+    RuntimeError,
+    EOFError,
+    zipfile.BadZipFile,
+    zlib.error,
+)
+
+# Открытые архивы: путь -> ((время изменения, размер), архив)
+_Archive = Tuple[Tuple[int, int], zipfile.ZipFile]
+_archives: "OrderedDict[str, _Archive]" = OrderedDict()
+_archives_lock = threading.Lock()
+
+
+class ArchiveError(OSError):
+    """Файл внутри архива не удалось прочитать"""
+
+
+def split_archive_path(path: str) -> Tuple[str, Optional[str]]:
+    """
+    Разделяет путь вида архив.zip!файл на путь архива и имя файла в нем.
+    Для обычного пути имя файла - None.
+    """
+    index = path.lower().find(ARCHIVE_SEPARATOR)
+    if index < 0:
+        return path, None
+    split = index + len(ARCHIVE_SEPARATOR) - 1
+    return path[:split], path[split + 1:]
+
+
+def source_name(source: Source) -> str:
+    """Имя файла источника (пустое для содержимого в памяти)"""
+    if isinstance(source, bytes):
+        return ""
+    path = source if isinstance(source, str) else getattr(source, "name", "")
+    if not isinstance(path, str):
+        return ""
+    archive, member = split_archive_path(path)
+    return os.path.basename(member if member is not None else archive)
+
+
+def _open_archive(path: str) -> zipfile.ZipFile:
+    """
+    Открытый архив: остается открытым для следующих файлов того же архива
+    и открывается заново, если архив изменился на диске
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _archives_lock:
+        cached = _archives.pop(path, None)
+        if cached is not None and cached[0] == version:
+            _archives[path] = cached
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        package = zipfile.ZipFile(path)
+        _archives[path] = (version, package)
+        while len(_archives) > ARCHIVE_CACHE_SIZE:
+            _archives.popitem(last=False)[1][1].close()
+        return package
+
+
+def _forget_archives() -> None:
+    # Дочерний процесс не делит позицию файла архива с родителем
+    _archives.clear()
+
+
+os.register_at_fork(after_in_child=_forget_archives)
+
+
+@contextmanager
+def _member_errors(path: str) -> Iterator[None]:
+    """Ошибки чтения файла архива как ArchiveError (OSError)"""
+    try:
+        yield
+    except _MEMBER_ERRORS as e:
+        raise ArchiveError(f"Не удалось прочитать {path}: {e}") from e
+
+
+def source_exists(path: str) -> bool:
+    """Существует ли файл (для файла в архиве - сам архив)"""
+    return os.path.isfile(split_archive_path(path)[0])
+
+
+def source_size(source: Source) -> int:
+    """Размер содержимого источника в байтах"""
+    if isinstance(source, bytes):
+        return len(source)
+    if isinstance(source, str):
+        archive, member = split_archive_path(source)
+        if member is None:
+            return os.path.getsize(archive)
+        with _member_errors(source):
+            return _open_archive(archive).getinfo(member).file_size
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+
+@contextmanager
+def open_source(source: Source) -> Iterator[IO[bytes]]:
+    """
+    Открывает источник для последовательного чтения. Файл архива читается
+    из архива потоком, без распаковки на диск; открытый файл не
+    закрывается.
+    """
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+        return
+    if not isinstance(source, str):
+        yield source
+        return
+    archive, member = split_archive_path(source)
+    if member is None:
+        with open(archive, "rb") as f:
+            yield f
+        return
+    with _member_errors(source), _open_archive(archive).open(member) as f:
+        yield f
+
+
+def resolve_source(source: Source) -> Union[str, IO[bytes]]:
+    """
+    Источник для библиотек разбора: обычный путь передается как есть,
+    файл архива и содержимое в памяти - как файл в памяти с произвольным
+    доступом
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if not isinstance(source, str):
+        return source
+    archive, member = split_archive_path(source)
+    if member is None:
+        return archive
+    with _member_errors(source):
+        return io.BytesIO(_open_archive(archive).read(member))
 
 
 def find_files(directory: str) -> Tuple[List[str], List[str]]:
-    """Поиск файлов в директории"""
+    """
+    Поиск файлов в директории. Файлы DOCX/PDF внутри ZIP-архивов
+    возвращаются путями вида архив.zip!файл.
+    """
     docx_files, pdf_files = [], []
     for root, _, files in os.walk(directory):
         for file in files:
-            if file.endswith(".docx"):
-                docx_files.append(os.path.join(root, file))
-            elif file.endswith(".pdf"):
-                pdf_files.append(os.path.join(root, file))
+            path = os.path.join(root, file)
+            if file.lower().endswith(".zip"):
+                members = _archive_members(path)
+            else:
+                members = [path]
+            for member in members:
+                if member.endswith(".docx"):
+                    docx_files.append(member)
+                elif member.endswith(".pdf"):
+                    pdf_files.append(member)
     return docx_files, pdf_files
 
 
+def _archive_members(path: str) -> List[str]:
+    try:
+        names = _open_archive(path).namelist()
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"Не удалось прочитать архив {path}: {e}")
+        return []
+    prefix = path + ARCHIVE_SEPARATOR[-1]
+    return [prefix + name for name in names if not name.endswith("/")]
+
+
 def clear_output_files(*files):
     """Очистка выходных файлов"""
     for file in files:
         if os.path.exists(file):
             os.remove(file)
+
+
+def file_hash(path: Source, chunk_size: int = 1 << 20) -> str:
+    """Вычисляет SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open_source(path) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,159 @@
+"""
+Опциональная инструментация конвейера: время (wall и CPU) по стадиям,
+файлам и типам документов. По умолчанию выключена и почти не добавляет
+накладных расходов.
+
+Стадии: open (открытие файла, для DOCX - вместе с чтением таблиц),
+layout (анализ страницы PDF), detect (определение формата),
+extract (извлечение таблиц PDF), map (маппинг полей),
+cache (поиск в кэше), save (запись результатов), total (файл целиком).
+"""
+import contextlib
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class Tracer:
+    """Сборщик замеров времени стадий"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.records: List[Dict[str, Any]] = []
+        self._file: Optional[str] = None
+        self._branch: Optional[str] = None
+        self._strategy: Optional[str] = None
+
+    def stage(self, name: str):
+        """Контекст замера стадии (пустой, если инструментация выключена)"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def file(self, path: str) -> Iterator[None]:
+        """Контекст обработки файла: стадии внутри относятся к нему"""
+        if not self.enabled:
+            yield
+            return
+        self._file, self._branch = path, None
+        first = len(self.records)
+        try:
+            with self._measure("total"):
+                yield
+        finally:
+            # Ветка обработки становится известна только после парсинга
+            for record in self.records[first:]:
+                record["doc_type"] = self._branch
+                record["strategy"] = self._strategy
+            self._file, self._branch, self._strategy = None, None, None
+
+    def set_branch(
+        self, doc_type: str, strategy: Optional[str] = None
+    ) -> None:
+        """
+        Запоминает ветку обработки текущего файла и стратегию извлечения
+        (для PDF - с оценкой уверенности)
+        """
+        self._branch, self._strategy = doc_type, strategy
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Возвращает и очищает накопленные замеры"""
+        records, self.records = self.records, []
+        return records
+
+    @contextlib.contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        started = time.time()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.records.append(
+                {
+                    "file": self._file,
+                    "doc_type": self._branch,
+                    "strategy": self._strategy,
+                    "stage": name,
+                    "pid": os.getpid(),
+                    "start_ms": round(started * 1000, 3),
+                    "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+                    "cpu_ms": round((time.process_time() - cpu) * 1000, 3),
+                }
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """Сводка: суммарное и среднее время по стадиям и типам документов"""
+        groups: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for record in self.records:
+            doc_type = record["doc_type"] or "-"
+            stats = groups.setdefault(doc_type, {}).setdefault(
+                record["stage"], {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0}
+            )
+            stats["count"] += 1
+            stats["wall_ms"] += record["wall_ms"]
+            stats["cpu_ms"] += record["cpu_ms"]
+        for stages in groups.values():
+            for stats in stages.values():
+                stats["wall_ms"] = round(stats["wall_ms"], 3)
+                stats["cpu_ms"] = round(stats["cpu_ms"], 3)
+                stats["mean_wall_ms"] = round(
+                    stats["wall_ms"] / stats["count"], 3
+                )
+        return groups
+
+    def write_trace(self, path: str) -> None:
+        """
+        Записывает замеры по файлам: CSV для таблиц или JSON в формате
+        Trace Event (chrome://tracing, Perfetto) для профилировщика
+        """
+        if path.endswith(".json"):
+            events = [
+                {
+                    "name": record["stage"],
+                    "cat": record["doc_type"] or "-",
+                    "ph": "X",
+                    "ts": record["start_ms"] * 1000,
+                    "dur": record["wall_ms"] * 1000,
+                    "pid": record["pid"],
+                    "tid": record["pid"],
+                    "args": {
+                        "file": record["file"],
+                        "strategy": record["strategy"],
+                        "cpu_ms": record["cpu_ms"],
+                    },
+                }
+                for record in self.records
+            ]
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events}, f, ensure_ascii=False)
+            return
+
+        fields = ["file", "doc_type", "strategy", "stage", "pid", "start_ms"]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=fields + ["wall_ms", "cpu_ms"]
+            )
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    def print_summary(self) -> None:
+        """Выводит сводку в консоль"""
+        for doc_type, stages in sorted(self.summary().items()):
+            print(f"[{doc_type}]")
+            for name, stats in stages.items():
+                print(
+                    f"  {name:<8} n={stats['count']:<6} "
+                    f"wall={stats['wall_ms']:.1f} мс "
+                    f"cpu={stats['cpu_ms']:.1f} мс "
+                    f"среднее={stats['mean_wall_ms']:.2f} мс"
+                )
+
+
+# Общий сборщик процесса; в рабочих процессах пула - свой экземпляр
+TRACER = Tracer()
+stage = TRACER.stage
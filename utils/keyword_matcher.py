@@ -0,0 +1,96 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Match = Tuple[str, str]
+
+
+class KeywordMatcher:
+    """
+    Поиск полей по ключевым фразам одним проходом по строке.
+    Все фразы компилируются в одно регулярное выражение; при нескольких
+    совпадениях побеждает фраза, объявленная раньше, - как при
+    последовательной проверке фраз в порядке маппинга.
+    """
+
+    def __init__(self, mapping: Dict[str, Sequence[str]]) -> None:
+        self._compile(
+            (keyword, field)
+            for field, keywords in mapping.items()
+            for keyword in keywords
+        )
+
+    @classmethod
+    def from_phrases(cls, phrases: Dict[str, str]) -> "KeywordMatcher":
+        """Создает матчер из словаря {фраза: поле}"""
+        matcher = cls.__new__(cls)
+        matcher._compile(phrases.items())
+        return matcher
+
+    def _compile(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Компилирует пары (фраза, поле) в порядке приоритета"""
+        self._fields: Dict[str, str] = {}
+        for keyword, field in pairs:
+            self._fields.setdefault(keyword, field)
+
+        keywords = list(self._fields)
+        self._priority = {keyword: i for i, keyword in enumerate(keywords)}
+        pattern = "|".join(map(re.escape, keywords)) or "(?!)"
+        # Опережающая проверка находит фразу в каждой позиции строки,
+        # в том числе пересекающиеся вхождения
+        self._search = re.compile(f"(?=({pattern}))")
+        self._prefix = re.compile(pattern)
+        # Фразы, начинающиеся в той же позиции, что и найденная
+        # регулярным выражением, проверяются отдельно
+        self._overlaps = {
+            keyword: [
+                other
+                for other in keywords
+                if other != keyword
+                and (other.startswith(keyword) or keyword.startswith(other))
+            ]
+            for keyword in keywords
+        }
+
+    def matches(self, *texts: str) -> List[Match]:
+        """
+        Возвращает пары (поле, фраза) для всех полей, фразы которых
+        содержатся в текстах, в порядке приоритета
+        """
+        best: Dict[str, str] = {}
+        for keyword in self._iter_keywords(texts):
+            field = self._fields[keyword]
+            current = best.get(field)
+            if current is None or (
+                self._priority[keyword] < self._priority[current]
+            ):
+                best[field] = keyword
+        return sorted(
+            best.items(), key=lambda item: self._priority[item[1]]
+        )
+
+    def find(self, *texts: str) -> Optional[Match]:
+        """Возвращает самое приоритетное совпадение (поле, фраза)"""
+        found = self.matches(*texts)
+        return found[0] if found else None
+
+    def match_prefix(self, text: str) -> Optional[Match]:
+        """Возвращает (поле, фраза) для фразы, с которой начинается текст"""
+        match = self._prefix.match(text)
+        if match is None:
+            return None
+        candidates = [match.group(0)] + [
+            other
+            for other in self._overlaps[match.group(0)]
+            if text.startswith(other)
+        ]
+        keyword = min(candidates, key=self._priority.get)
+        return self._fields[keyword], keyword
+
+    def _iter_keywords(self, texts: Iterable[str]) -> Iterable[str]:
+        for text in texts:
+            for match in self._search.finditer(text):
+                keyword = match.group(1)
+                yield keyword
+                for other in self._overlaps[keyword]:
+                    if text.startswith(other, match.start()):
+                        yield other
@@ -0,0 +1,174 @@
+"""
+Распределенная обработка: разбиение входных файлов на части (шарды) по
+хэшу пути и частичные результаты, которые собираются в итоговые файлы
+командой слияния.
+"""
+import hashlib
+import json
+import os
+import socket
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from config.settings import PARSER_VERSION
+from models.event_model import Event
+
+from .file_utils import source_name
+from .sinks import BaseSink
+
+# Признак и версия формата частичного результата
+PARTIAL_FORMAT = "event-parser-partial"
+PARTIAL_VERSION = 1
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Разбирает номер шарда вида i/N (1 <= i <= N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Expected shard as i/N: {value}")
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}")
+    return index, count
+
+
+def shard_key(path: str, root: str) -> str:
+    """
+    Путь файла относительно папки входных файлов: одинаков на всех
+    машинах независимо от точки монтирования и ОС
+    """
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def shard_files(
+    files: Iterable[str], root: str, index: int, count: int
+) -> List[str]:
+    """Файлы шарда index из count: остаток от деления хэша пути"""
+    selected = []
+    for file in files:
+        digest = hashlib.sha256(shard_key(file, root).encode("utf-8"))
+        if int.from_bytes(digest.digest()[:8], "big") % count == index - 1:
+            selected.append(file)
+    return selected
+
+
+def partial_path(output: str, index: int, count: int) -> str:
+    """Путь частичного результата: output.shard-2-of-4.json"""
+    return f"{os.path.splitext(output)[0]}.shard-{index}-of-{count}.json"
+
+
+class PartialSink(BaseSink):
+    """
+    Частичный результат шарда в JSON: описание запуска (шард, версия
+    парсеров, папка, узел, время) и записи с путем исходного файла и
+    хэшем содержимого. Записи дописываются потоково.
+    """
+
+    # Хэш переносится в записи слияния (SQLite, поиск повторов)
+    needs_content_hash = True
+
+    def __init__(
+        self, path: str, index: int, count: int, root: str, files: int
+    ) -> None:
+        self.path = path
+        self.root = root
+        header = {
+            "format": PARTIAL_FORMAT,
+            "version": PARTIAL_VERSION,
+            "parser_version": PARSER_VERSION,
+            "shard": index,
+            "shards": count,
+            "input_dir": root,
+            "files": files,
+            "host": socket.gethostname(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(json.dumps(header, ensure_ascii=False)[:-1])
+        self._file.write(', "records": [')
+        self._empty = True
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        record = {
+            "path": shard_key(getattr(data, "path", ""), self.root),
+            "filename": filename,
+            "doc_type": doc_type,
+            "content_hash": getattr(data, "content_hash", ""),
+            "fields": dict(data),
+        }
+        self._file.write("\n" if self._empty else ",\n")
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.flush()
+        self._empty = False
+
+    def close(self) -> None:
+        self._file.write("]}\n")
+        self._file.close()
+
+
+def read_partials(paths: List[str]) -> Optional[List[Event]]:
+    """
+    Читает частичные результаты и проверяет, что они относятся к одному
+    разбиению и одной версии парсеров. Возвращает записи в порядке
+    обычного запуска (PDF, затем DOCX по расширению, каждые по пути) или
+    None, если результаты несовместимы.
+    """
+    headers: Dict[int, Dict[str, Any]] = {}
+    records: Dict[str, Event] = {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                partial = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Не удалось прочитать частичный результат {path}: {e}")
+            return None
+        if (
+            not isinstance(partial, dict)
+            or partial.get("format") != PARTIAL_FORMAT
+            or partial.get("version") != PARTIAL_VERSION
+        ):
+            print(f"{path} не является частичным результатом")
+            return None
+
+        first = next(iter(headers.values()), partial)
+        for key in ("shards", "parser_version"):
+            if partial[key] != first[key]:
+                print(
+                    f"Частичные результаты несовместимы: {key} = "
+                    f"{partial[key]} в {path}, {first[key]} в других"
+                )
+                return None
+        if partial["shard"] in headers:
+            print(f"Шард {partial['shard']} передан повторно: {path}")
+            return None
+        headers[partial["shard"]] = partial
+
+        for record in partial.pop("records"):
+            if record["path"] in records:
+                print(f"Файл {record['path']} встречается в нескольких шардах")
+                continue
+            # Имя назначается заново: совпадения имен файлов разных
+            # шардов проверяются при слиянии
+            event = Event.from_dict(
+                record["fields"], source_name(record["path"]),
+                record["doc_type"],
+            )
+            event.content_hash = record["content_hash"]
+            event.path = os.path.join(partial["input_dir"], record["path"])
+            records[record["path"]] = event
+
+    count = next(iter(headers.values()))["shards"] if headers else 0
+    missing = sorted(set(range(1, count + 1)) - set(headers))
+    if missing:
+        print(
+            "Отсутствуют шарды "
+            f"{', '.join(f'{i}/{count}' for i in missing)}: "
+            "результат будет неполным"
+        )
+    return [records[path] for path in sorted(records, key=_run_order)]
+
+
+def _run_order(path: str) -> Tuple[bool, str]:
+    return not path.lower().endswith(".pdf"), path
@@ -0,0 +1,370 @@
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from config.settings import (
+    FIXTURE_FIELDS,
+    FIXTURE_MODEL,
+    FIXTURE_PK,
+    SQLITE_BATCH_SIZE,
+)
+from models.event_model import (
+    FIELD_ATTRIBUTES,
+    FIELD_LABELS,
+    PLACEHOLDER_DOC_TYPES,
+)
+
+from .dates import BOOKING_FIELDS, Booking, BookingIndex, event_bookings
+from .dedupe import find_duplicates
+
+# Колонки таблицы результатов
+XLSX_COLUMNS = ["Filename", "File Type", *FIELD_LABELS]
+# Максимальная ширина колонки Excel
+XLSX_MAX_WIDTH = 255
+# Колонки таблицы events в SQLite: атрибуты полей заявки
+SQLITE_FIELDS = [FIELD_ATTRIBUTES[label] for label in FIELD_LABELS]
+SQLITE_INDEXES = ("date", "department", "responsible")
+
+
+class BaseSink(ABC):
+    """Приемник результатов, записывающий каждую запись сразу на диск"""
+
+    # Нужен ли приемнику хэш содержимого файла (content_hash записи):
+    # без кэша и таких приемников файлы не хэшируются
+    needs_content_hash = False
+
+    def __enter__(self) -> "BaseSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        """Записывает результат парсинга одного файла"""
+        pass
+
+    def close(self) -> None:
+        """Завершает запись"""
+        pass
+
+
+class JsonLinesSink(BaseSink):
+    """
+    Запись результатов в JSONL: одна строка на файл. При append=True
+    строки дописываются к существующему файлу
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self.path = path
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        record = {"Filename": filename, "File Type": doc_type, **data}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonObjectSink(BaseSink):
+    """
+    Инкрементальная запись JSON-объекта {имя файла: данные}
+    в том же виде, что и json.dump(results, indent=4)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("{")
+        self._empty = True
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        key = json.dumps(filename, ensure_ascii=False)
+        value = json.dumps(dict(data), ensure_ascii=False, indent=4)
+        value = value.replace("\n", "\n    ")
+        self._file.write("\n" if self._empty else ",\n")
+        self._file.write(f"    {key}: {value}")
+        self._file.flush()
+        self._empty = False
+
+    def close(self) -> None:
+        self._file.write("}" if self._empty else "\n}")
+        self._file.close()
+
+
+class FixtureSink(BaseSink):
+    """
+    Инкрементальная запись фикстуры для загрузки в систему администратора:
+    JSON-массив объектов {"model", "pk", "fields"}. Каждый объект
+    дописывается в файл сразу, результаты целиком в памяти не хранятся.
+    Записи-заглушки (too_large, timeout) в фикстуру не попадают.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model: str = FIXTURE_MODEL,
+        fields: Optional[Mapping[str, str]] = None,
+        pk: Optional[str] = FIXTURE_PK,
+    ) -> None:
+        self.path = path
+        self.model = model
+        self.fields = dict(FIXTURE_FIELDS if fields is None else fields)
+        self.pk = pk
+        # Первичный ключ по хэшу содержимого требует хэширования файлов
+        self.needs_content_hash = pk == "content_hash"
+        for column in self.fields.values():
+            if column not in XLSX_COLUMNS:
+                raise ValueError(f"Unknown fixture source field: {column}")
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[")
+        self._empty = True
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        if doc_type in PLACEHOLDER_DOC_TYPES:
+            return
+        columns = {"Filename": filename, "File Type": doc_type}
+        fields = {}
+        for field, column in self.fields.items():
+            if column in columns:
+                fields[field] = columns[column]
+            else:
+                fields[field] = data.get(column, "")
+        pk = getattr(data, self.pk, "") if self.pk else ""
+        fixture = {"model": self.model, "pk": pk or None, "fields": fields}
+        value = json.dumps(fixture, ensure_ascii=False, indent=4)
+        self._file.write("\n" if self._empty else ",\n")
+        self._file.write("    " + value.replace("\n", "\n    "))
+        self._file.flush()
+        self._empty = False
+
+    def close(self) -> None:
+        self._file.write("]" if self._empty else "\n]")
+        self._file.close()
+
+
+class XlsxSink(BaseSink):
+    """
+    Потоковая запись в XLSX средствами xlsxwriter в режиме constant_memory:
+    строки сбрасываются на диск по мере записи, ширина колонок для
+    автоподбора считается на лету
+    """
+
+    def __init__(
+        self, path: str, columns: Optional[Sequence[str]] = None
+    ) -> None:
+        import xlsxwriter
+
+        self.path = path
+        self.columns = list(columns or XLSX_COLUMNS)
+        self._workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self._sheet = self._workbook.add_worksheet()
+        self._widths = [0] * len(self.columns)
+        self._row = 0
+        self.write_row(self.columns)
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        self.write_row(
+            [filename, doc_type]
+            + [data.get(column, "") for column in self.columns[2:]]
+        )
+
+    def write_row(self, values: List[Any]) -> None:
+        """Записывает строку значений в порядке колонок"""
+        for col, value in enumerate(values):
+            text = "" if value is None else str(value)
+            # Строки пишутся как текст, без распознавания формул
+            self._sheet.write_string(self._row, col, text)
+            width = max(map(len, text.split("\n")))
+            if width > self._widths[col]:
+                self._widths[col] = width
+        self._row += 1
+
+    def close(self) -> None:
+        for col, width in enumerate(self._widths):
+            self._sheet.set_column(
+                col, col, min(width + 2, XLSX_MAX_WIDTH)
+            )
+        self._workbook.close()
+
+
+class SqliteSink(BaseSink):
+    """
+    Запись результатов в таблицу events базы SQLite.
+    Записи сохраняются пакетами по batch_size в одной транзакции, ключ -
+    хэш содержимого файла: повторный запуск изменяет только строки,
+    данные которых поменялись. Записи-заглушки неразобранных файлов не
+    сохраняются, чтобы не затереть прежний результат пустыми полями.
+    """
+
+    needs_content_hash = True
+
+    def __init__(
+        self, path: str, batch_size: int = SQLITE_BATCH_SIZE
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._rows: List[Tuple[str, ...]] = []
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        columns = ["content_hash", "filename", "doc_type", *SQLITE_FIELDS]
+        quoted = [f'"{column}"' for column in columns]
+        fields = ", ".join(f'"{field}" TEXT' for field in SQLITE_FIELDS)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "content_hash TEXT PRIMARY KEY, filename TEXT, "
+                f"doc_type TEXT, {fields})"
+            )
+            for column in SQLITE_INDEXES:
+                self._connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS events_{column} '
+                    f'ON events ("{column}")'
+                )
+
+        # Строка обновляется, только если изменилось хотя бы одно значение
+        updates = ", ".join(f"{q} = excluded.{q}" for q in quoted[1:])
+        changed = " OR ".join(
+            f"events.{q} IS NOT excluded.{q}" for q in quoted[1:]
+        )
+        self._upsert = (
+            f"INSERT INTO events ({', '.join(quoted)}) "
+            f"VALUES ({', '.join('?' * len(quoted))}) "
+            f"ON CONFLICT (content_hash) DO UPDATE SET {updates} "
+            f"WHERE {changed}"
+        )
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        if doc_type in PLACEHOLDER_DOC_TYPES:
+            return
+        content_hash = getattr(data, "content_hash", "")
+        if not content_hash:
+            raise ValueError(f"Content hash is required: {filename}")
+        self._rows.append(
+            (content_hash, filename, doc_type)
+            + tuple(data.get(label, "") for label in FIELD_LABELS)
+        )
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Записывает накопленные строки одной транзакцией"""
+        if not self._rows:
+            return
+        with self._connection:
+            self._connection.executemany(self._upsert, self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+
+class ConflictSink(BaseSink):
+    """
+    Отчет о пересечениях бронирований площадки. Поля дат записей
+    разбираются в интервалы по мере записи; при закрытии интервалы
+    индексируются и пересекающиеся пары заявок пишутся в JSON вместе
+    со списком заявок, даты которых не удалось разобрать.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.bookings: List[Booking] = []
+        self.unparsed: List[str] = []
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        bookings = event_bookings(filename, data)
+        if not bookings and any(data.get(f) for f in BOOKING_FIELDS):
+            self.unparsed.append(filename)
+        self.bookings.extend(bookings)
+
+    def close(self) -> None:
+        conflicts = BookingIndex(self.bookings).conflicts()
+        report = {
+            "conflicts": [
+                {
+                    "start": max(a.start, b.start).isoformat(),
+                    "end": min(a.end, b.end).isoformat(),
+                    "bookings": [_booking_dict(a), _booking_dict(b)],
+                }
+                for a, b in conflicts
+            ],
+            "unparsed": self.unparsed,
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        print(f"Найдено пересечений бронирований: {len(conflicts)}")
+
+
+def _booking_dict(booking: Booking) -> Dict[str, str]:
+    return {
+        "filename": booking.filename,
+        "field": booking.field,
+        "start": booking.start.isoformat(),
+        "end": booking.end.isoformat(),
+    }
+
+
+class DedupeSink(BaseSink):
+    """
+    Отбор повторных заявок перед записью: записи накапливаются, при
+    закрытии группируются повторы и в sinks передаются только
+    канонические записи групп и записи без повторов. Состав групп
+    пишется в JSON по пути path.
+    """
+
+    # Одинаковые файлы группируются по хэшу содержимого
+    needs_content_hash = True
+
+    def __init__(self, sinks: Sequence[BaseSink], path: str) -> None:
+        self.sinks = list(sinks)
+        self.path = path
+        self._records: List[Tuple[str, Mapping[str, str], str]] = []
+
+    def write(
+        self, filename: str, data: Mapping[str, str], doc_type: str
+    ) -> None:
+        self._records.append((filename, data, doc_type))
+
+    def close(self) -> None:
+        try:
+            groups = find_duplicates([data for _, data, _ in self._records])
+            skipped = {index for group in groups for index in group[1:]}
+            for index, record in enumerate(self._records):
+                if index not in skipped:
+                    for sink in self.sinks:
+                        sink.write(*record)
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+        report = [
+            {
+                "canonical": self._records[group[0]][0],
+                "duplicates": [self._records[i][0] for i in group[1:]],
+            }
+            for group in groups
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        print(f"Пропущено повторных заявок: {len(skipped)}")
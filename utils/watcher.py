@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .file_utils import find_files, split_archive_path
+
+Signature = Tuple[int, int]
+
+
+class FolderWatcher:
+    """
+    Опрос папки с заявками: находит новые и измененные файлы.
+    Файл считается готовым, когда его размер и время изменения не менялись
+    settle_seconds секунд - так пропускаются недописанные файлы.
+    Подписи файлов, отмеченных done(), сохраняются в state_path (если
+    задан): после перезапуска неизмененные файлы повторно не разбираются.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        settle_seconds: float,
+        state_path: Optional[str] = None,
+    ) -> None:
+        self.directory = directory
+        self.settle_seconds = settle_seconds
+        self.state_path = state_path
+        # Подписи файлов, результаты которых уже записаны
+        self._done: Dict[str, Signature] = self._load_state()
+        self._processed: Dict[str, Signature] = dict(self._done)
+        # Файл -> (подпись, момент, с которого подпись не менялась)
+        self._pending: Dict[str, Tuple[Signature, float]] = {}
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """Возвращает готовые к разбору файлы: [(путь, тип файла)]"""
+        now = time.monotonic()
+        docx_files, pdf_files = find_files(self.directory)
+        present = set(docx_files) | set(pdf_files)
+        ready = []
+        for files, file_type in ((pdf_files, "pdf"), (docx_files, "docx")):
+            for file in sorted(files):
+                signature = self._signature(file)
+                if signature is None:
+                    continue
+                if self._processed.get(file) == signature:
+                    self._pending.pop(file, None)
+                    continue
+
+                pending = self._pending.get(file)
+                if pending is None or pending[0] != signature:
+                    self._pending[file] = (signature, now)
+                elif now - pending[1] >= self.settle_seconds:
+                    del self._pending[file]
+                    self._processed[file] = signature
+                    ready.append((file, file_type))
+
+        # Удаленные файлы забываем, чтобы заново появившиеся разобрать
+        for file in set(self._processed) - present:
+            del self._processed[file]
+        for file in set(self._pending) - present:
+            del self._pending[file]
+        removed = set(self._done) - present
+        for file in removed:
+            del self._done[file]
+        if removed:
+            self._save_state()
+        return ready
+
+    def done(self, file: str) -> None:
+        """Отмечает, что результат разбора файла записан"""
+        if file in self._processed:
+            self._done[file] = self._processed[file]
+            self._save_state()
+
+    def _load_state(self) -> Dict[str, Signature]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            return {
+                file: tuple(signature) for file, signature in state.items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Не удалось прочитать состояние {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        temporary = self.state_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self._done, f, ensure_ascii=False)
+        os.replace(temporary, self.state_path)
+
+    @staticmethod
+    def _signature(file: str) -> Optional[Signature]:
+        # Файлы архива считаются измененными при изменении архива
+        try:
+            stat = os.stat(split_archive_path(file)[0])
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns